@@ -0,0 +1,130 @@
+"""
+Script para analisar o log de eventos (EVENT_LOG=true)
+Agrupa os eventos de um dia por operação e mostra os percentis de latência
+Execute: python analisar_eventos.py [--data 2026-10-19] [--tipo ui] [--ordenar p95]
+"""
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from datetime import date, datetime
+from pathlib import Path
+from utils.estatisticas import percentil
+
+COLUNAS_ORDENACAO = ('total', 'p50', 'p95', 'p99', 'max', 'qtd')
+
+def carregar_eventos(arquivo, tipo=None):
+    """
+    Lê os eventos de um arquivo JSON Lines
+
+    Args:
+        arquivo: Caminho do arquivo
+        tipo: Filtra por tipo ('ui' ou 'servico')
+
+    Returns:
+        Tupla (eventos, linhas inválidas)
+    """
+    eventos = []
+    invalidas = 0
+    with open(arquivo, encoding='utf-8') as f:
+        for linha in f:
+            try:
+                evento = json.loads(linha)
+            except json.JSONDecodeError:
+                # Última linha pode estar incompleta se o sistema estiver aberto
+                invalidas += 1
+                continue
+            if tipo and evento.get('tipo') != tipo:
+                continue
+            eventos.append(evento)
+    return eventos, invalidas
+
+def agregar(eventos):
+    """
+    Agrupa os eventos por operação
+
+    Args:
+        eventos: Lista de eventos
+
+    Returns:
+        Lista de dicionários com as estatísticas de cada operação
+    """
+    grupos = defaultdict(list)
+    erros = defaultdict(int)
+    linhas = defaultdict(list)
+    for evento in eventos:
+        operacao = evento['operacao']
+        grupos[operacao].append(evento['duracao_ms'])
+        if evento.get('status') == 'erro':
+            erros[operacao] += 1
+        if evento.get('linhas') is not None:
+            linhas[operacao].append(evento['linhas'])
+
+    resultado = []
+    for operacao, duracoes in grupos.items():
+        duracoes.sort()
+        resultado.append({
+            'operacao': operacao,
+            'qtd': len(duracoes),
+            'erros': erros[operacao],
+            'p50': percentil(duracoes, 50),
+            'p95': percentil(duracoes, 95),
+            'p99': percentil(duracoes, 99),
+            'max': duracoes[-1],
+            'total': sum(duracoes),
+            'linhas': sum(linhas[operacao]) / len(linhas[operacao]) if linhas[operacao] else None,
+        })
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser(description="Percentis de latência por operação")
+    parser.add_argument('--data', type=date.fromisoformat, default=date.today(),
+                        help="Dia analisado (AAAA-MM-DD, padrão: hoje)")
+    parser.add_argument('--arquivo', type=Path, help="Arquivo de eventos (em vez de --data)")
+    parser.add_argument('--tipo', choices=('ui', 'servico'), help="Só ações da interface ou de serviços")
+    parser.add_argument('--ordenar', choices=COLUNAS_ORDENACAO, default='total',
+                        help="Coluna de ordenação (decrescente)")
+    args = parser.parse_args()
+
+    arquivo = args.arquivo or Path('logs') / f"eventos_{args.data.strftime('%Y%m%d')}.jsonl"
+
+    print("=" * 60)
+    print("📊 ANÁLISE DE EVENTOS - GF INFORMÁTICA")
+    print("=" * 60)
+
+    print(f"\n[1/2] Lendo {arquivo}...")
+    if not arquivo.exists():
+        print("❌ Arquivo não encontrado (o log de eventos está ativo? EVENT_LOG=true)")
+        sys.exit(1)
+
+    eventos, invalidas = carregar_eventos(arquivo, args.tipo)
+    print(f"✅ {len(eventos)} eventos lidos")
+    if invalidas:
+        print(f"⚠️  {invalidas} linha(s) inválida(s) ignorada(s)")
+    if not eventos:
+        return
+
+    inicio = min(evento['ts'] for evento in eventos)
+    fim = max(evento['ts'] for evento in eventos)
+    usuarios = {evento.get('usuario_id') for evento in eventos} - {None}
+    acoes = {evento.get('correlacao') for evento in eventos} - {None}
+    print(f"   - Período: {datetime.fromisoformat(inicio):%H:%M:%S} a {datetime.fromisoformat(fim):%H:%M:%S}")
+    print(f"   - Usuários: {len(usuarios)} / Ações correlacionadas: {len(acoes)}")
+
+    print("\n[2/2] Latência por operação (ms)...\n")
+    estatisticas = sorted(agregar(eventos), key=lambda item: item[args.ordenar], reverse=True)
+
+    largura = max(len('Operação'), *(len(item['operacao']) for item in estatisticas))
+    print(f"   {'Operação':<{largura}}  {'Qtd':>6} {'Erros':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'Máx':>9} {'Linhas':>7}")
+    for item in estatisticas:
+        linhas = f"{item['linhas']:.0f}" if item['linhas'] is not None else '-'
+        print(
+            f"   {item['operacao']:<{largura}}  {item['qtd']:>6} {item['erros']:>5} "
+            f"{item['p50']:>9.2f} {item['p95']:>9.2f} {item['p99']:>9.2f} {item['max']:>9.2f} {linhas:>7}"
+        )
+
+    print("\n" + "=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Script que arquiva as OS encerradas antigas
+Move as OS concluídas e canceladas sem alteração há mais de N meses de
+ordens_servico para ordens_servico_arquivo, em lotes (uma transação por lote,
+sem bloquear o uso do sistema). Listagens, estatísticas e o painel passam a
+ler uma tabela menor; buscas por número, cliente e período continuam
+encontrando as OS arquivadas.
+Requer o schema atual ou a migração database/migracoes/003_arquivo_os.sql.
+Execute: python arquivar_os.py [--meses 12] [--lote 5000] [--simular]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+
+def contar_candidatas(conn, meses: int) -> int:
+    """OS que seriam arquivadas agora"""
+    return conn.execute(
+        """
+        SELECT COUNT(*) FROM ordens_servico
+        WHERE status IN ('concluida', 'cancelada')
+          AND atualizado_em < CURRENT_TIMESTAMP - make_interval(months => %s)
+        """,
+        (meses,)
+    ).fetchone()[0]
+
+def tamanhos(conn) -> dict:
+    """Linhas (estimadas) e tamanho em disco das duas tabelas"""
+    linhas = conn.execute(
+        """
+        SELECT c.relname, c.reltuples::BIGINT, pg_size_pretty(pg_total_relation_size(c.oid))
+        FROM pg_class c
+        WHERE c.relname IN ('ordens_servico', 'ordens_servico_arquivo')
+        """
+    ).fetchall()
+    return {nome: (max(quantidade, 0), tamanho) for nome, quantidade, tamanho in linhas}
+
+def main():
+    parser = argparse.ArgumentParser(description="Arquiva as OS concluídas e canceladas antigas")
+    parser.add_argument('--meses', type=int, default=int(os.getenv('OS_ARCHIVE_MONTHS', '12')),
+                        help="Meses sem alteração para arquivar (padrão: OS_ARCHIVE_MONTHS ou 12)")
+    parser.add_argument('--lote', type=int, default=5000, help="OS movidas por transação")
+    parser.add_argument('--simular', action='store_true', help="Só conta as OS que seriam arquivadas")
+    args = parser.parse_args()
+
+    if args.meses < 1 or args.lote < 1:
+        parser.error("--meses e --lote devem ser maiores que zero")
+
+    import psycopg
+    from database.connection import db
+
+    print("=" * 60)
+    print("🗄️  ARQUIVO DE OS - GF INFORMÁTICA")
+    print("=" * 60)
+
+    print("\n[1/3] Conectando ao banco...")
+    try:
+        conn = psycopg.connect(db._connection_string, autocommit=True)
+    except psycopg.Error as e:
+        print(f"❌ Falha na conexão: {e}")
+        print("   Verifique o arquivo .env")
+        sys.exit(1)
+
+    with conn:
+        if conn.execute("SELECT to_regclass('ordens_servico_arquivo')").fetchone()[0] is None:
+            print("❌ Tabela ordens_servico_arquivo não encontrada")
+            print("   Execute database/migracoes/003_arquivo_os.sql")
+            sys.exit(1)
+        print("✅ Conectado")
+
+        print(f"\n[2/3] Procurando OS encerradas sem alteração há mais de {args.meses} meses...")
+        candidatas = contar_candidatas(conn, args.meses)
+        print(f"✅ {candidatas} OS para arquivar")
+
+        if args.simular or candidatas == 0:
+            print("\nNada foi alterado." if args.simular else "\nNada a arquivar.")
+            return
+
+        print(f"\n[3/3] Movendo em lotes de {args.lote}...")
+        inicio = time.perf_counter()
+        total = 0
+        while True:
+            movidas = conn.execute("SELECT arquivar_os(%s, %s)", (args.meses, args.lote)).fetchone()[0]
+            if not movidas:
+                break
+            total += movidas
+            print(f"   {total}/{candidatas} OS arquivadas ({time.perf_counter() - inicio:.1f} s)")
+
+        # Devolve o espaço das linhas movidas e atualiza as estatísticas do planejador
+        conn.execute("VACUUM (ANALYZE) ordens_servico")
+        conn.execute("ANALYZE ordens_servico_arquivo")
+
+        print(f"✅ {total} OS arquivadas em {time.perf_counter() - inicio:.1f} s")
+        for nome, (quantidade, tamanho) in sorted(tamanhos(conn).items()):
+            print(f"   {nome}: ~{quantidade} linhas, {tamanho}")
+
+    print("\n" + "=" * 60)
+    print("✅ ARQUIVAMENTO CONCLUÍDO")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""
+Benchmarks e ferramentas de teste de desempenho
+Execute cada módulo a partir da raiz do projeto: python -m benchmarks.<nome>
+"""
@@ -0,0 +1,390 @@
+"""
+Simulador de carga com várias estações usando o sistema ao mesmo tempo
+Cada usuário virtual (thread ou processo) repete uma mistura ponderada de
+fluxos do balcão e da bancada, com tempo de pensar entre eles:
+    buscar_cliente        busca por nome e abre as OS do cliente
+    criar_os              abre uma OS para um cliente
+    atualizar_status      muda o status de uma OS em atendimento
+    adicionar_observacao  registra uma observação técnica
+    visualizar_pdf        abre a pré-visualização do PDF de uma OS
+
+Ao final mostra vazão, percentis de latência e erros por fluxo, e confere a
+integridade do banco: números de OS repetidos e observações perdidas
+(gravadas com sucesso mas ausentes no texto final da OS).
+
+Execute:
+    python -m benchmarks.carga [--usuarios 8] [--duracao 60] [--modo threads|processos]
+    python -m benchmarks.carga --dsn "host=localhost dbname=gf_teste user=postgres" --pensar-ms 0
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from benchmarks.dados_sinteticos import DEFEITOS, NOMES, carregar
+from benchmarks.estatisticas import resumir
+from benchmarks.postgres_temporario import banco_benchmark
+from benchmarks.servicos import PASTA_RESULTADOS, commit_atual
+
+# Peso de cada fluxo na mistura (proporção das execuções)
+PESOS_PADRAO = {
+    'buscar_cliente': 30,
+    'criar_os': 10,
+    'atualizar_status': 15,
+    'adicionar_observacao': 25,
+    'visualizar_pdf': 20,
+}
+
+# Status que um técnico aplica a uma OS em atendimento
+STATUS_ATENDIMENTO = ('em_andamento', 'em_andamento', 'concluida', 'aberta')
+
+
+def parse_pesos(texto: str) -> dict:
+    """
+    Lê a mistura de fluxos no formato "buscar_cliente=30,criar_os=10"
+
+    Fluxos não informados ficam com peso zero.
+
+    Args:
+        texto: Pesos separados por vírgula
+
+    Returns:
+        Dicionário fluxo -> peso
+    """
+    pesos = {}
+    for item in texto.split(','):
+        nome, _, valor = item.partition('=')
+        nome = nome.strip()
+        if nome not in PESOS_PADRAO:
+            raise argparse.ArgumentTypeError(f"Fluxo desconhecido: {nome}")
+        try:
+            pesos[nome] = float(valor)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Peso inválido para {nome}: {valor!r}")
+
+    if sum(pesos.values()) <= 0:
+        raise argparse.ArgumentTypeError("A soma dos pesos deve ser positiva")
+    return pesos
+
+
+def criar_fluxos(rnd: random.Random, config: dict, usuario: int, registro: dict) -> dict:
+    """
+    Monta os fluxos de um usuário virtual
+
+    Args:
+        rnd: Gerador aleatório do usuário
+        config: Configuração da carga (IDs carregados, OS em atendimento...)
+        usuario: Número do usuário virtual
+        registro: Onde guardar as OS criadas e as observações gravadas
+
+    Returns:
+        Dicionário nome -> função sem argumentos
+    """
+    from services.cliente_service import cliente_service
+    from services.os_service import os_service
+    from utils.pdf_generator import pdf_generator
+
+    primeiro_cliente, ultimo_cliente = config['clientes_ids']
+    em_atendimento = config['em_atendimento']
+    contador = iter(range(1, sys.maxsize))
+
+    def buscar_cliente():
+        clientes = cliente_service.buscar_por_nome(rnd.choice(NOMES))
+        if clientes:
+            os_service.listar_por_cliente(rnd.choice(clientes)['id'])
+
+    def criar_os():
+        os_criada = os_service.criar_os(
+            cliente_id=rnd.randint(primeiro_cliente, ultimo_cliente),
+            usuario_id=config['usuario_id'],
+            defeito_relatado=rnd.choice(DEFEITOS),
+            processador='Intel Core i5-10400',
+            memoria_ram='8 GB DDR4',
+            valor_estimado=round(rnd.uniform(80, 900), 2),
+            prazo_previsto=date.today() + timedelta(days=7)
+        )
+        registro['numeros'].append(os_criada['numero_os'])
+
+    def atualizar_status():
+        os_service.atualizar_status(rnd.choice(em_atendimento), rnd.choice(STATUS_ATENDIMENTO))
+
+    def adicionar_observacao():
+        # Marcador único: permite conferir no final se a observação sobreviveu
+        os_id = rnd.choice(em_atendimento)
+        marcador = f"carga-u{usuario}-{next(contador)}"
+        if os_service.adicionar_observacao(os_id, f"Teste de carga {marcador}"):
+            registro['observacoes'].append((os_id, marcador))
+
+    def visualizar_pdf():
+        # Mesmo caminho da janela de pré-visualização (com cache em disco)
+        os_id = rnd.choice(em_atendimento)
+        ordem_servico = os_service.buscar_por_id(os_id)
+        pdf_generator.gerar_pdf_os_bytes(os_id, ordem_servico)
+
+    return {
+        'buscar_cliente': buscar_cliente,
+        'criar_os': criar_os,
+        'atualizar_status': atualizar_status,
+        'adicionar_observacao': adicionar_observacao,
+        'visualizar_pdf': visualizar_pdf,
+    }
+
+
+def usuario_virtual(usuario: int, config: dict) -> dict:
+    """
+    Executa os fluxos de um usuário até o fim da carga
+
+    Args:
+        usuario: Número do usuário virtual
+        config: Configuração da carga
+
+    Returns:
+        Tempos (ms) e erros por fluxo, OS criadas e observações gravadas
+    """
+    rnd = random.Random(f"{config['seed']}-{usuario}")
+    registro = {'numeros': [], 'observacoes': []}
+    fluxos = criar_fluxos(rnd, config, usuario, registro)
+
+    nomes = [nome for nome, peso in config['pesos'].items() if peso > 0]
+    pesos = [config['pesos'][nome] for nome in nomes]
+    tempos = {nome: [] for nome in nomes}
+    erros = {nome: Counter() for nome in nomes}
+
+    # Estações não começam todas no mesmo instante
+    time.sleep(rnd.uniform(0, config['pensar_ms'] / 1000))
+
+    while time.time() < config['fim_em']:
+        nome = rnd.choices(nomes, pesos)[0]
+        t0 = time.perf_counter()
+        try:
+            fluxos[nome]()
+            tempos[nome].append((time.perf_counter() - t0) * 1000)
+        except Exception as e:
+            erros[nome][f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"] += 1
+
+        # Tempo de pensar com distribuição exponencial (chegadas de Poisson)
+        if config['pensar_ms'] > 0:
+            pausa = min(rnd.expovariate(1000 / config['pensar_ms']), config['fim_em'] - time.time())
+            if pausa > 0:
+                time.sleep(pausa)
+
+    return {
+        'tempos': tempos,
+        'erros': {nome: dict(contagem) for nome, contagem in erros.items()},
+        'numeros': registro['numeros'],
+        'observacoes': registro['observacoes'],
+    }
+
+
+def _processo_usuario(usuario: int, config: dict) -> dict:
+    """Usuário virtual em um processo próprio (conexões próprias)"""
+    from database.connection import db
+
+    db.configurar(config['conninfo'])
+    try:
+        return usuario_virtual(usuario, config)
+    finally:
+        db.fechar_pool()
+
+
+def verificar_integridade(conninfo: str, numeros: list, observacoes: list) -> dict:
+    """
+    Confere o banco depois da carga
+
+    Args:
+        conninfo: String de conexão
+        numeros: numero_os devolvidos pelas OS criadas
+        observacoes: (os_id, marcador) das observações gravadas com sucesso
+
+    Returns:
+        Números de OS repetidos e observações perdidas
+    """
+    import psycopg
+
+    repetidos_retornados = sorted(numero for numero, total in Counter(numeros).items() if total > 1)
+
+    with psycopg.connect(conninfo) as conn:
+        repetidos_banco = [
+            linha[0] for linha in conn.execute(
+                "SELECT numero_os FROM ordens_servico GROUP BY numero_os HAVING COUNT(*) > 1"
+            )
+        ]
+
+        ids = sorted({os_id for os_id, _ in observacoes})
+        textos = dict(conn.execute(
+            "SELECT id, COALESCE(observacoes, '') FROM ordens_servico WHERE id = ANY(%s)", (ids,)
+        ).fetchall()) if ids else {}
+
+    perdidas = [
+        {'os_id': os_id, 'marcador': marcador}
+        for os_id, marcador in observacoes
+        if marcador not in textos.get(os_id, '')
+    ]
+
+    return {
+        'os_criadas': len(numeros),
+        'numeros_repetidos': sorted(set(repetidos_retornados) | set(repetidos_banco)),
+        'observacoes_gravadas': len(observacoes),
+        'observacoes_perdidas': len(perdidas),
+        'exemplos_perdidas': perdidas[:10],
+    }
+
+
+def executar(args) -> dict:
+    """Sobe o banco, popula, roda os usuários virtuais e confere o resultado"""
+    # Uma conexão por usuário virtual no modo threads
+    os.environ['DB_POOL_SIZE'] = str(max(args.usuarios, 1))
+    from database.connection import db
+
+    with banco_benchmark(args.dsn, args.recriar_schema, args.manter_cluster) as conninfo:
+        print(f"\n[1/4] Populando {args.clientes} clientes e {args.os} OS...")
+        inicio = time.perf_counter()
+        carga = carregar(conninfo, args.clientes, args.os, args.seed)
+        print(f"✅ Dados gerados em {time.perf_counter() - inicio:.1f} s")
+
+        primeira_os, ultima_os = carga['os_ids']
+        config = {
+            'conninfo': conninfo,
+            'seed': args.seed,
+            'pesos': args.pesos,
+            'pensar_ms': args.pensar_ms,
+            'clientes_ids': carga['clientes_ids'],
+            # As OS mais recentes concentram o atendimento (e a disputa entre estações)
+            'em_atendimento': list(range(max(primeira_os, ultima_os - args.em_atendimento + 1), ultima_os + 1)),
+            'usuario_id': 1,
+        }
+
+        print(f"\n[2/4] {args.usuarios} usuários virtuais ({args.modo}) por {args.duracao} s...")
+        config['fim_em'] = time.time() + args.duracao
+        inicio = time.perf_counter()
+
+        if args.modo == 'processos':
+            with ProcessPoolExecutor(max_workers=args.usuarios) as executor:
+                futuros = [executor.submit(_processo_usuario, usuario, config) for usuario in range(args.usuarios)]
+                resultados = [futuro.result() for futuro in futuros]
+        else:
+            db.configurar(conninfo)
+            with ThreadPoolExecutor(max_workers=args.usuarios, thread_name_prefix='usuario') as executor:
+                futuros = [executor.submit(usuario_virtual, usuario, config) for usuario in range(args.usuarios)]
+                resultados = [futuro.result() for futuro in futuros]
+            db.fechar_pool()
+
+        duracao = time.perf_counter() - inicio
+
+        print("\n[3/4] Conferindo integridade...")
+        numeros = [numero for resultado in resultados for numero in resultado['numeros']]
+        observacoes = [item for resultado in resultados for item in resultado['observacoes']]
+        integridade = verificar_integridade(conninfo, numeros, observacoes)
+
+    fluxos = {}
+    for nome in args.pesos:
+        tempos = [tempo for resultado in resultados for tempo in resultado['tempos'].get(nome, [])]
+        erros = Counter()
+        for resultado in resultados:
+            erros.update(resultado['erros'].get(nome, {}))
+        fluxos[nome] = resumir(tempos, duracao)
+        fluxos[nome]['erros'] = sum(erros.values())
+        fluxos[nome]['tipos_erro'] = dict(erros.most_common(5))
+
+    return {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit_atual(),
+        'modo': args.modo,
+        'usuarios': args.usuarios,
+        'duracao_s': round(duracao, 1),
+        'pensar_ms': args.pensar_ms,
+        'volumes': {'clientes': args.clientes, 'os': args.os, 'em_atendimento': args.em_atendimento},
+        'seed': args.seed,
+        'pesos': args.pesos,
+        'fluxos': fluxos,
+        'integridade': integridade,
+    }
+
+
+def imprimir(resultado: dict):
+    """Mostra o resumo da carga"""
+    total = sum(fluxo.get('quantidade', 0) for fluxo in resultado['fluxos'].values())
+    erros = sum(fluxo['erros'] for fluxo in resultado['fluxos'].values())
+    print(f"\n   {total} fluxos em {resultado['duracao_s']} s "
+          f"({total / max(resultado['duracao_s'], 0.001):.1f} fluxos/s), {erros} erro(s)\n")
+
+    print(f"   {'Fluxo':<22} {'qtd':>7} {'ops/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'erros':>6}")
+    for nome, fluxo in resultado['fluxos'].items():
+        if not fluxo.get('quantidade'):
+            print(f"   {nome:<22} {0:>7} {'-':>8} {'-':>8} {'-':>8} {'-':>8} {'-':>8} {fluxo['erros']:>6}")
+            continue
+        print(
+            f"   {nome:<22} {fluxo['quantidade']:>7} {fluxo['ops_s']:>8.1f} {fluxo['p50_ms']:>8.1f} "
+            f"{fluxo['p95_ms']:>8.1f} {fluxo['p99_ms']:>8.1f} {fluxo['max_ms']:>8.1f} {fluxo['erros']:>6}"
+        )
+        for mensagem, quantidade in fluxo['tipos_erro'].items():
+            print(f"      ❌ {quantidade}x {mensagem}")
+
+    integridade = resultado['integridade']
+    print()
+    if integridade['numeros_repetidos']:
+        print(f"❌ Números de OS repetidos: {', '.join(integridade['numeros_repetidos'][:10])}")
+    else:
+        print(f"✅ {integridade['os_criadas']} OS criadas, nenhum número repetido")
+
+    if integridade['observacoes_perdidas']:
+        print(f"❌ {integridade['observacoes_perdidas']} de {integridade['observacoes_gravadas']} "
+              f"observações perdidas (gravação concorrente na mesma OS)")
+        for exemplo in integridade['exemplos_perdidas'][:3]:
+            print(f"      OS ID {exemplo['os_id']}: {exemplo['marcador']}")
+    else:
+        print(f"✅ {integridade['observacoes_gravadas']} observações gravadas, nenhuma perdida")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulador de carga com várias estações")
+    parser.add_argument('--dsn', help="Banco de TESTE a usar em vez do cluster temporário")
+    parser.add_argument('--recriar-schema', action='store_true',
+                        help="Aplica schema.sql no banco do --dsn (apaga os dados)")
+    parser.add_argument('--manter-cluster', action='store_true', help="Não apaga o cluster temporário")
+    parser.add_argument('--clientes', type=int, default=5000, help="Clientes gerados")
+    parser.add_argument('--os', type=int, default=20000, help="OS geradas")
+    parser.add_argument('--usuarios', type=int, default=8, help="Usuários virtuais (estações)")
+    parser.add_argument('--duracao', type=float, default=60, help="Duração da carga em segundos")
+    parser.add_argument('--modo', choices=('threads', 'processos'), default='threads',
+                        help="threads: um processo, pool compartilhado; processos: uma estação por processo")
+    parser.add_argument('--pensar-ms', type=float, default=500, help="Tempo médio de pensar entre fluxos (0 = sem pausa)")
+    parser.add_argument('--pesos', type=parse_pesos, default=dict(PESOS_PADRAO),
+                        help="Mistura de fluxos, ex.: buscar_cliente=30,criar_os=10,adicionar_observacao=60")
+    parser.add_argument('--em-atendimento', type=int, default=20,
+                        help="OS em atendimento disputadas pelas estações (menos = mais conflito)")
+    parser.add_argument('--seed', type=int, default=42, help="Semente dos dados e dos usuários")
+    parser.add_argument('--saida', type=Path, help="Arquivo JSON do resultado")
+    args = parser.parse_args()
+
+    if args.usuarios < 1 or args.em_atendimento < 1 or args.clientes < 1 or args.os < 1:
+        parser.error("--usuarios, --em-atendimento, --clientes e --os devem ser positivos")
+
+    print("=" * 60)
+    print("SIMULADOR DE CARGA - VÁRIAS ESTAÇÕES")
+    print("=" * 60)
+
+    if args.dsn and args.recriar_schema:
+        print("\n⚠️  O schema será recriado no banco informado: os dados atuais serão apagados")
+
+    resultado = executar(args)
+    imprimir(resultado)
+
+    destino = args.saida or PASTA_RESULTADOS / f"carga_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    destino.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding='utf-8')
+    print(f"\n[4/4] Resultado gravado em {destino}")
+
+    integridade = resultado['integridade']
+    if integridade['numeros_repetidos'] or integridade['observacoes_perdidas']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,490 @@
+"""
+Gerador de dados sintéticos para testes de escala
+Clientes com CPF válido (mesmo algoritmo de Validators.validar_cpf) e
+telefones no formato brasileiro; OS com hardware, defeitos, mistura de
+status e distribuição de datas realistas. A mesma semente gera sempre os
+mesmos dados.
+
+Carga em massa com COPY (banco de teste via --dsn ou cluster temporário)
+ou geração de CSV (colunas com os mesmos nomes das tabelas).
+
+Execute:
+    python -m benchmarks.dados_sinteticos --dsn "host=localhost dbname=gf_teste user=postgres" --clientes 1000000 --os 3000000
+    python -m benchmarks.dados_sinteticos --csv dados/ --clientes 50000 --os 200000
+"""
+
+import argparse
+import csv
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterator, List
+
+NOMES = (
+    'Ana', 'Antônio', 'Beatriz', 'Bruno', 'Camila', 'Carlos', 'Daniela', 'Diego',
+    'Eduarda', 'Eduardo', 'Fernanda', 'Felipe', 'Gabriela', 'Gustavo', 'Helena', 'Heitor',
+    'Isabela', 'Igor', 'Júlia', 'João', 'Larissa', 'Lucas', 'Mariana', 'Marcos',
+    'Natália', 'Nicolas', 'Olívia', 'Otávio', 'Paula', 'Pedro', 'Rafaela', 'Rafael',
+    'Sofia', 'Sérgio', 'Tatiane', 'Thiago', 'Valentina', 'Vinícius', 'Yasmin', 'Wesley',
+)
+SOBRENOMES = (
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira',
+    'Lima', 'Gomes', 'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Almeida', 'Lopes',
+    'Soares', 'Fernandes', 'Vieira', 'Barbosa', 'Rocha', 'Dias', 'Nascimento', 'Andrade',
+    'Moreira', 'Nunes', 'Marques', 'Machado', 'Mendes', 'Freitas', 'Cardoso', 'Bordin',
+)
+# DDDs mais populosos pesam mais (São Paulo, Rio, BH, Sul, Nordeste)
+DDDS = (11, 11, 11, 12, 13, 15, 19, 21, 21, 27, 31, 31, 41, 43, 47, 48, 51, 54, 61, 62, 71, 81, 85, 92)
+DOMINIOS = ('gmail.com', 'hotmail.com', 'outlook.com', 'yahoo.com.br', 'uol.com.br', 'bol.com.br')
+
+PROCESSADORES = (
+    'Intel Core i3-10100', 'Intel Core i5-10400', 'Intel Core i5-12400F', 'Intel Core i7-9700',
+    'Intel Core i7-12700K', 'Intel Celeron N4020', 'Intel Pentium G5400', 'AMD Ryzen 3 3200G',
+    'AMD Ryzen 5 3600', 'AMD Ryzen 5 5600G', 'AMD Ryzen 7 5700X', 'AMD Athlon 3000G',
+)
+PLACAS_MAE = (
+    'ASUS Prime H410M-E', 'Gigabyte B450M DS3H', 'ASRock B550M Steel Legend', 'MSI A520M-A Pro',
+    'ASUS TUF B660M-Plus', 'Gigabyte H610M S2H', 'Placa integrada (notebook)',
+)
+MEMORIAS = ('4 GB DDR3', '8 GB DDR4', '8 GB DDR4', '16 GB DDR4', '16 GB DDR4', '32 GB DDR4', '16 GB DDR5')
+ARMAZENAMENTOS = (
+    'HD 500 GB', 'HD 1 TB', 'SSD 240 GB SATA', 'SSD 480 GB SATA', 'SSD NVMe 512 GB',
+    'SSD NVMe 1 TB', 'HD 1 TB + SSD 240 GB',
+)
+PLACAS_VIDEO = (None, None, None, 'NVIDIA GTX 1650', 'NVIDIA RTX 3060', 'AMD RX 580', 'Intel UHD (integrada)')
+OUTROS = (None, None, None, 'Fonte 500W', 'Gabinete com 3 fans', 'Carregador original', 'Sem carregador')
+DEFEITOS = (
+    'Não liga', 'Não dá vídeo', 'Tela azul ao iniciar o Windows', 'Reinicia sozinho',
+    'Superaquecendo e desligando', 'Muito lento para abrir programas', 'Formatação com backup',
+    'HD fazendo barulho', 'Teclado com teclas falhando', 'Não carrega a bateria',
+    'Sem acesso à internet', 'Vírus/propagandas no navegador', 'Tela quebrada',
+    'Barulho alto no cooler', 'Upgrade de memória e SSD', 'Limpeza e troca de pasta térmica',
+)
+OBSERVACOES = (
+    None, None, 'Cliente autoriza orçamento até R$ 300,00', 'Equipamento com lacre rompido',
+    'Aguardando peça do fornecedor', 'Cliente pediu retorno por WhatsApp', 'Backup realizado',
+)
+
+# Colunas carregadas (mesma ordem do COPY e do CSV)
+COLUNAS_CLIENTES = ('id', 'nome', 'sobrenome', 'cpf', 'telefone', 'email', 'criado_em')
+COLUNAS_OS = (
+    'id', 'numero_os', 'cliente_id', 'usuario_id', 'processador', 'placa_mae', 'memoria_ram',
+    'armazenamento', 'placa_video', 'outros_componentes', 'defeito_relatado', 'valor_estimado',
+    'prazo_previsto', 'observacoes', 'status', 'criado_em', 'concluido_em',
+)
+
+# Multiplicador da permutação das bases de CPF (coprimo com 10^9)
+_PASSO_CPF = 387_420_489
+
+
+def digitos_cpf(base: int) -> str:
+    """
+    Completa uma base de 9 dígitos com os dígitos verificadores
+
+    Args:
+        base: Número de 0 a 999.999.999
+
+    Returns:
+        CPF com 11 dígitos (sem formatação)
+    """
+    digitos = [int(d) for d in f"{base:09d}"]
+    for tamanho in (9, 10):
+        soma = sum(d * (tamanho + 1 - i) for i, d in enumerate(digitos))
+        resto = soma % 11
+        digitos.append(0 if resto < 2 else 11 - resto)
+    return ''.join(map(str, digitos))
+
+
+def formatar_cpf(cpf: str) -> str:
+    """CPF no formato 000.000.000-00"""
+    return f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+
+
+def gerar_cpf(rnd: random.Random) -> str:
+    """
+    Gera um CPF válido aleatório
+
+    Args:
+        rnd: Gerador aleatório
+
+    Returns:
+        CPF no formato 000.000.000-00
+    """
+    while True:
+        base = rnd.randrange(1_000_000_000)
+        if len(set(f"{base:09d}")) > 1:
+            return formatar_cpf(digitos_cpf(base))
+
+
+def cpfs_unicos(seed: int, inicio: int = 0) -> Iterator[str]:
+    """
+    Sequência de CPFs válidos sem repetição (até 10^9)
+
+    As bases de 9 dígitos são percorridas em uma permutação determinada pela
+    semente, então nenhum CPF se repete e a ordem parece aleatória. A
+    sequência pode começar em qualquer posição: cargas sucessivas com a mesma
+    semente continuam de onde a anterior parou, sem repetir CPFs.
+
+    Args:
+        seed: Semente (desloca a permutação)
+        inicio: Posição do primeiro CPF na sequência (0 = início)
+
+    Yields:
+        CPF no formato 000.000.000-00
+    """
+    deslocamento = (seed * 7_919) % 1_000_000_000
+
+    # Posição -> índice da permutação: soma os índices das bases inválidas
+    # (000000000, 111111111...) que ficam antes, pois elas são puladas
+    inverso = pow(_PASSO_CPF, -1, 1_000_000_000)
+    invalidos = sorted(
+        ((digito * 111_111_111 - deslocamento) * inverso) % 1_000_000_000
+        for digito in range(10)
+    )
+    primeiro = inicio
+    for indice_invalido in invalidos:
+        if indice_invalido <= primeiro:
+            primeiro += 1
+
+    for indice in range(primeiro, 1_000_000_000):
+        base = (indice * _PASSO_CPF + deslocamento) % 1_000_000_000
+        # Bases com todos os dígitos iguais (111111111...) não são CPFs válidos
+        if len(set(f"{base:09d}")) > 1:
+            yield formatar_cpf(digitos_cpf(base))
+
+
+def gerar_telefone(rnd: random.Random) -> str:
+    """Celular (80%) ou fixo no formato de Validators.formatar_telefone"""
+    ddd = rnd.choice(DDDS)
+    if rnd.random() < 0.8:
+        return f"({ddd}) 9{rnd.randint(6000, 9999)}-{rnd.randint(0, 9999):04d}"
+    return f"({ddd}) {rnd.randint(2, 5)}{rnd.randint(0, 999):03d}-{rnd.randint(0, 9999):04d}"
+
+
+def gerar_email(rnd: random.Random, nome: str, sobrenome: str, indice: int) -> str:
+    """E-mail derivado do nome (sem acentos) e do número do cliente"""
+    usuario = f"{nome}.{sobrenome}".lower()
+    usuario = usuario.translate(str.maketrans('áâãàéêíóôõúüç', 'aaaaeeiooouuc'))
+    return f"{usuario}{indice}@{rnd.choice(DOMINIOS)}"
+
+
+def linhas_clientes(quantidade: int, primeiro_id: int, seed: int, inicio: datetime, fim: datetime) -> Iterator[tuple]:
+    """
+    Gera os clientes (na ordem de COLUNAS_CLIENTES)
+
+    Args:
+        quantidade: Número de clientes
+        primeiro_id: ID do primeiro cliente
+        seed: Semente
+        inicio / fim: Período dos cadastros (crescente com o ID)
+
+    Yields:
+        Tupla com os valores de um cliente
+    """
+    rnd = random.Random(f"{seed}-clientes")
+    # Posição pelo ID: uma nova carga no mesmo banco não repete os CPFs
+    cpfs = cpfs_unicos(seed, primeiro_id - 1)
+    periodo = (fim - inicio).total_seconds()
+
+    for indice in range(quantidade):
+        nome = rnd.choice(NOMES)
+        sobrenome = rnd.choice(SOBRENOMES)
+        criado_em = inicio + timedelta(seconds=periodo * indice / max(quantidade, 1))
+        # 30% dos clientes não informam e-mail
+        email = gerar_email(rnd, nome, sobrenome, primeiro_id + indice) if rnd.random() < 0.7 else None
+        yield (
+            primeiro_id + indice,
+            nome,
+            sobrenome,
+            next(cpfs),
+            gerar_telefone(rnd),
+            email,
+            criado_em.replace(microsecond=0),
+        )
+
+
+def _distribuir_por_dia(quantidade: int, dias: int, rnd: random.Random) -> List[int]:
+    """
+    Quantidade de OS em cada dia do período
+
+    Dias úteis pesam mais que sábado e domingo, e o movimento cresce ao
+    longo do período (a loja atende mais hoje que há dois anos).
+    """
+    pesos = []
+    for dia in range(dias):
+        fator_semana = (1.0, 1.0, 1.0, 1.0, 1.1, 0.5, 0.05)[dia % 7]
+        crescimento = 0.6 + 0.8 * dia / max(dias - 1, 1)
+        pesos.append(fator_semana * crescimento * rnd.uniform(0.8, 1.2))
+
+    total = sum(pesos)
+    cotas = [quantidade * peso / total for peso in pesos]
+    contagens = [int(cota) for cota in cotas]
+
+    # Distribui o que sobrou do arredondamento pelos maiores restos
+    restantes = quantidade - sum(contagens)
+    for dia in sorted(range(dias), key=lambda d: cotas[d] - contagens[d], reverse=True)[:restantes]:
+        contagens[dia] += 1
+    return contagens
+
+
+def _status_por_idade(rnd: random.Random, idade_dias: int) -> str:
+    """Status realista: OS recentes ainda abertas, antigas concluídas"""
+    r = rnd.random()
+    if idade_dias < 3:
+        limites = (0.60, 0.95, 1.00)
+    elif idade_dias < 15:
+        limites = (0.20, 0.60, 0.95)
+    else:
+        limites = (0.02, 0.05, 0.90)
+
+    for status, limite in zip(('aberta', 'em_andamento', 'concluida'), limites):
+        if r < limite:
+            return status
+    return 'cancelada'
+
+
+def linhas_os(
+    quantidade: int,
+    primeiro_id: int,
+    primeiro_numero: int,
+    primeiro_cliente: int,
+    clientes: int,
+    usuarios: List[int],
+    seed: int,
+    inicio: datetime,
+    fim: datetime,
+) -> Iterator[tuple]:
+    """
+    Gera as OS em ordem cronológica (na ordem de COLUNAS_OS)
+
+    Args:
+        quantidade: Número de OS
+        primeiro_id: ID da primeira OS
+        primeiro_numero: Número da primeira OS (OS0001...)
+        primeiro_cliente: ID do primeiro cliente
+        clientes: Quantidade de clientes
+        usuarios: IDs dos técnicos/atendentes
+        seed: Semente
+        inicio / fim: Período das OS
+
+    Yields:
+        Tupla com os valores de uma OS
+    """
+    rnd = random.Random(f"{seed}-os")
+    dias = max((fim - inicio).days, 1)
+    contagens = _distribuir_por_dia(quantidade, dias, rnd)
+
+    indice = 0
+    for dia, contagem in enumerate(contagens):
+        data = inicio + timedelta(days=dia)
+
+        # Horário comercial (8h às 18h), em ordem
+        segundos = sorted(rnd.randint(8 * 3600, 18 * 3600) for _ in range(contagem))
+        for segundo in segundos:
+            criado_em = (data.replace(hour=0, minute=0, second=0, microsecond=0)
+                         + timedelta(seconds=segundo))
+            idade = (fim - criado_em).days
+            status = _status_por_idade(rnd, idade)
+
+            concluido_em = None
+            if status == 'concluida':
+                concluido_em = min(criado_em + timedelta(hours=rnd.randint(4, 240)), fim)
+
+            # Só clientes já cadastrados na data; quem é cliente há mais tempo volta mais
+            cadastrados = max(1, int(clientes * (dia + 1) / dias))
+            cliente_id = primeiro_cliente + int(cadastrados * rnd.random() ** 1.3)
+            cliente_id = min(cliente_id, primeiro_cliente + clientes - 1)
+
+            valor = None
+            if rnd.random() < 0.9:
+                valor = Decimal(rnd.randint(8000, 150000)) / 100
+
+            yield (
+                primeiro_id + indice,
+                f"OS{primeiro_numero + indice:04d}",
+                cliente_id,
+                rnd.choice(usuarios),
+                rnd.choice(PROCESSADORES),
+                rnd.choice(PLACAS_MAE),
+                rnd.choice(MEMORIAS),
+                rnd.choice(ARMAZENAMENTOS),
+                rnd.choice(PLACAS_VIDEO),
+                rnd.choice(OUTROS),
+                rnd.choice(DEFEITOS),
+                valor,
+                (criado_em + timedelta(days=rnd.randint(3, 15))).date(),
+                rnd.choice(OBSERVACOES),
+                status,
+                criado_em,
+                concluido_em,
+            )
+            indice += 1
+
+
+def _periodo(dias: int) -> tuple:
+    """Início e fim do período gerado (termina à meia-noite de hoje: o mesmo seed gera os mesmos dados no dia)"""
+    fim = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return fim - timedelta(days=dias), fim
+
+
+def carregar(conninfo: str, clientes: int, ordens: int, seed: int = 42, dias: int = 730) -> dict:
+    """
+    Carrega clientes e OS com COPY em um banco com o schema do sistema
+
+    Os IDs e números de OS continuam a partir dos existentes, e as
+    sequências são ajustadas ao final (o sistema segue criando normalmente).
+    Os CPFs também continuam a sequência da semente a partir do próximo ID
+    de cliente, então cargas repetidas com a mesma semente não colidem.
+
+    Args:
+        conninfo: String de conexão
+        clientes: Quantidade de clientes
+        ordens: Quantidade de OS
+        seed: Semente
+        dias: Período das OS (até hoje)
+
+    Returns:
+        Dicionário com os intervalos de IDs gerados e o tempo de cada etapa
+    """
+    import psycopg
+
+    inicio, fim = _periodo(dias)
+    resultado = {}
+
+    with psycopg.connect(conninfo) as conn:
+        primeiro_cliente = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM clientes").fetchone()[0]
+        # Pela sequência: as OS arquivadas (ordens_servico_arquivo) também usam os IDs
+        primeira_os = conn.execute("SELECT nextval(pg_get_serial_sequence('ordens_servico', 'id'))").fetchone()[0]
+        primeiro_numero = conn.execute("SELECT nextval('os_numero_seq')").fetchone()[0]
+        usuarios = [linha[0] for linha in conn.execute("SELECT id FROM usuarios WHERE ativo ORDER BY id")]
+        if not usuarios:
+            raise RuntimeError("Nenhum usuário ativo no banco (aplique o schema.sql)")
+
+        etapas = (
+            ('clientes', COLUNAS_CLIENTES,
+             linhas_clientes(clientes, primeiro_cliente, seed, inicio, fim), clientes),
+            ('ordens_servico', COLUNAS_OS,
+             linhas_os(ordens, primeira_os, primeiro_numero, primeiro_cliente, clientes, usuarios, seed, inicio, fim),
+             ordens),
+        )
+
+        for tabela, colunas, linhas, quantidade in etapas:
+            if quantidade <= 0:
+                continue
+            t0 = time.perf_counter()
+            with conn.cursor() as cursor:
+                with cursor.copy(f"COPY {tabela} ({', '.join(colunas)}) FROM STDIN") as copy:
+                    for linha in linhas:
+                        copy.write_row(linha)
+            resultado[tabela] = {'quantidade': quantidade, 'segundos': round(time.perf_counter() - t0, 2)}
+
+        # Sequências depois dos IDs e números carregados
+        conn.execute("SELECT setval(pg_get_serial_sequence('clientes', 'id'), (SELECT MAX(id) FROM clientes))")
+        conn.execute("SELECT setval(pg_get_serial_sequence('ordens_servico', 'id'), (SELECT MAX(id) FROM ordens_servico))")
+        conn.execute("SELECT setval('os_numero_seq', %s)", (primeiro_numero + max(ordens, 1) - 1,))
+
+        # Resumo diário dos dias carregados (bancos com os_resumo_dia)
+        if conn.execute("SELECT to_regproc('atualizar_resumo_os') IS NOT NULL").fetchone()[0]:
+            t0 = time.perf_counter()
+            conn.execute("SELECT atualizar_resumo_os()")
+            resultado['resumo'] = {'segundos': round(time.perf_counter() - t0, 2)}
+        conn.commit()
+
+    # Estatísticas do planejador atualizadas, como em produção
+    t0 = time.perf_counter()
+    with psycopg.connect(conninfo, autocommit=True) as conn:
+        conn.execute("VACUUM ANALYZE clientes")
+        conn.execute("VACUUM ANALYZE ordens_servico")
+    resultado['analyze'] = {'segundos': round(time.perf_counter() - t0, 2)}
+
+    resultado['clientes_ids'] = (primeiro_cliente, primeiro_cliente + clientes - 1)
+    resultado['os_ids'] = (primeira_os, primeira_os + ordens - 1)
+    return resultado
+
+
+def escrever_csv(pasta: Path, clientes: int, ordens: int, seed: int = 42, dias: int = 730) -> dict:
+    """
+    Grava clientes.csv e ordens_servico.csv (IDs a partir de 1, usuário 1)
+
+    Carga no psql:
+        \\copy clientes (colunas...) FROM 'clientes.csv' CSV HEADER
+
+    Args:
+        pasta: Pasta de destino
+        clientes: Quantidade de clientes
+        ordens: Quantidade de OS
+        seed: Semente
+        dias: Período das OS (até hoje)
+
+    Returns:
+        Dicionário tabela -> caminho do arquivo
+    """
+    inicio, fim = _periodo(dias)
+    pasta.mkdir(parents=True, exist_ok=True)
+
+    arquivos = {
+        'clientes': (COLUNAS_CLIENTES, linhas_clientes(clientes, 1, seed, inicio, fim)),
+        'ordens_servico': (COLUNAS_OS, linhas_os(ordens, 1, 1, 1, clientes, [1], seed, inicio, fim)),
+    }
+
+    caminhos = {}
+    for tabela, (colunas, linhas) in arquivos.items():
+        caminho = pasta / f"{tabela}.csv"
+        with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(colunas)
+            # None vira campo vazio, que o COPY ... CSV lê como NULL
+            escritor.writerows(linhas)
+        caminhos[tabela] = caminho
+    return caminhos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de dados sintéticos")
+    destino = parser.add_mutually_exclusive_group()
+    destino.add_argument('--dsn', help="Banco de TESTE onde carregar (padrão: cluster temporário)")
+    destino.add_argument('--csv', type=Path, metavar='PASTA', help="Gera arquivos CSV em vez de carregar")
+    parser.add_argument('--recriar-schema', action='store_true',
+                        help="Aplica schema.sql no banco do --dsn antes da carga (apaga os dados)")
+    parser.add_argument('--clientes', type=int, default=100000, help="Clientes gerados")
+    parser.add_argument('--os', type=int, default=300000, help="OS geradas")
+    parser.add_argument('--dias', type=int, default=730, help="Período das OS em dias (até hoje)")
+    parser.add_argument('--seed', type=int, default=42, help="Semente (mesma semente, mesmos dados)")
+    args = parser.parse_args()
+
+    if args.clientes < 1 and args.os > 0:
+        parser.error("--os exige pelo menos um cliente")
+
+    print("=" * 60)
+    print("DADOS SINTÉTICOS - GF INFORMÁTICA")
+    print("=" * 60)
+    print(f"\n{args.clientes} clientes, {args.os} OS em {args.dias} dias (seed {args.seed})")
+
+    inicio = time.perf_counter()
+    if args.csv:
+        print(f"\n[1/1] Gerando CSV em {args.csv}...")
+        for tabela, caminho in escrever_csv(args.csv, args.clientes, args.os, args.seed, args.dias).items():
+            print(f"✅ {tabela}: {caminho}")
+    else:
+        from benchmarks.postgres_temporario import banco_benchmark
+
+        if not args.dsn:
+            print("\n⚠️  Sem --dsn: os dados vão para um cluster temporário, apagado ao final")
+
+        with banco_benchmark(args.dsn, args.recriar_schema) as conninfo:
+            print("\n[1/1] Carregando com COPY...")
+            resultado = carregar(conninfo, args.clientes, args.os, args.seed, args.dias)
+            for tabela in ('clientes', 'ordens_servico'):
+                if tabela in resultado:
+                    etapa = resultado[tabela]
+                    print(f"✅ {tabela}: {etapa['quantidade']} linhas em {etapa['segundos']:.1f} s "
+                          f"({etapa['quantidade'] / max(etapa['segundos'], 0.001):.0f} linhas/s)")
+            print(f"✅ VACUUM ANALYZE em {resultado['analyze']['segundos']:.1f} s")
+
+    print(f"\nTempo total: {time.perf_counter() - inicio:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Estatísticas de latência usadas pelos benchmarks
+"""
+
+from typing import Dict, List
+from utils.estatisticas import percentil
+
+
+def resumir(tempos_ms: List[float], duracao_s: float) -> Dict[str, float]:
+    """
+    Resume as latências de uma operação
+
+    Args:
+        tempos_ms: Latência de cada execução em milissegundos
+        duracao_s: Tempo total das execuções (para a vazão)
+
+    Returns:
+        Dicionário com quantidade, vazão (ops/s), média, p50, p95, p99 e máximo
+    """
+    if not tempos_ms:
+        return {'quantidade': 0}
+
+    ordenados = sorted(tempos_ms)
+    return {
+        'quantidade': len(ordenados),
+        'ops_s': round(len(ordenados) / duracao_s, 2) if duracao_s > 0 else None,
+        'media_ms': round(sum(ordenados) / len(ordenados), 3),
+        'p50_ms': round(percentil(ordenados, 50), 3),
+        'p95_ms': round(percentil(ordenados, 95), 3),
+        'p99_ms': round(percentil(ordenados, 99), 3),
+        'max_ms': round(ordenados[-1], 3),
+    }
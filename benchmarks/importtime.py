@@ -0,0 +1,118 @@
+"""
+Perfil de importação da inicialização do sistema
+Roda "python -X importtime" no módulo de entrada e falha se módulos pesados,
+que só deveriam carregar depois do login, forem importados antes dele
+
+Execute: python -m benchmarks.importtime [--repeticoes 5] [--limite-ms 400]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Módulos que não podem ser carregados antes da tela de login
+PROIBIDOS = (
+    'fpdf',
+    'fontTools',
+    'utils.pdf_generator',
+    'utils.pdf_template',
+    'utils.print_spool',
+    'ui.main_window',
+    'ui.cliente_window',
+    'ui.os_window',
+    'ui.pdf_preview_window',
+    'ui.relatorio_window',
+    'ui.print_queue_window',
+    'services.cliente_service',
+    'services.os_service',
+)
+
+
+def medir(modulo: str) -> dict:
+    """
+    Importa o módulo em um processo novo com -X importtime
+
+    Args:
+        modulo: Módulo de entrada (ex.: main)
+
+    Returns:
+        Dicionário nome -> (tempo próprio µs, tempo acumulado µs)
+    """
+    resultado = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+        env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+    )
+    if resultado.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {modulo}:\n{resultado.stderr}")
+
+    tempos = {}
+    for linha in resultado.stderr.splitlines():
+        # Formato: "import time:   self [us] | cumulative | imported package"
+        if not linha.startswith('import time:') or 'imported package' in linha:
+            continue
+        proprio, acumulado, nome = linha[len('import time:'):].split('|')
+        tempos[nome.strip()] = (int(proprio), int(acumulado))
+    return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil de importação da inicialização")
+    parser.add_argument('--modulo', default='main', help="Módulo de entrada")
+    parser.add_argument('--repeticoes', type=int, default=5, help="Número de execuções")
+    parser.add_argument('--top', type=int, default=15, help="Quantidade de módulos listados")
+    parser.add_argument('--limite-ms', type=float, default=None,
+                        help="Falha se a mediana do tempo total passar deste valor")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"PERFIL DE IMPORTAÇÃO - {args.modulo}")
+    print("=" * 60)
+
+    # A primeira execução aquece o cache do sistema de arquivos
+    medir(args.modulo)
+
+    execucoes = [medir(args.modulo) for _ in range(args.repeticoes)]
+    totais = [tempos[args.modulo][1] / 1000 for tempos in execucoes]
+    total = statistics.median(totais)
+
+    print(f"\nTempo total (mediana de {args.repeticoes}): {total:.1f} ms")
+    print(f"Mínimo: {min(totais):.1f} ms / Máximo: {max(totais):.1f} ms")
+
+    ultima = execucoes[-1]
+    print(f"\nMódulos carregados: {len(ultima)}")
+    print(f"\nMaiores tempos próprios (µs):")
+    maiores = sorted(ultima.items(), key=lambda item: item[1][0], reverse=True)
+    for nome, (proprio, acumulado) in maiores[:args.top]:
+        print(f"   {proprio:>8}  {acumulado:>8}  {nome}")
+
+    carregados = [
+        nome for nome in ultima
+        if any(nome == proibido or nome.startswith(proibido + '.') for proibido in PROIBIDOS)
+    ]
+
+    falhou = False
+    if carregados:
+        falhou = True
+        print("\n❌ Módulos carregados antes do login:")
+        for nome in sorted(carregados):
+            print(f"   - {nome}")
+    else:
+        print("\n✅ Nenhum módulo pesado carregado antes do login")
+
+    if args.limite_ms is not None and total > args.limite_ms:
+        falhou = True
+        print(f"\n❌ Tempo total acima do limite de {args.limite_ms:.0f} ms")
+
+    sys.exit(1 if falhou else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark da geração de PDF de OS
+Compara a geração de um documento por OS com a geração em lote (template compartilhado)
+
+Execute: python -m benchmarks.pdf_template [--quantidade 500]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+from utils.pdf_generator import pdf_generator
+
+DEFEITOS = [
+    "Não liga.",
+    "Computador reinicia sozinho após alguns minutos de uso.",
+    "Tela azul ao abrir jogos. Cliente relata que o problema começou depois "
+    "de uma atualização do Windows e piora quando o equipamento esquenta.",
+    "Lentidão geral, barulho no HD e ventoinha fazendo muito ruído. "
+    "Cliente pede backup dos arquivos da pasta Documentos antes de qualquer "
+    "intervenção e orçamento para troca do HD por SSD.",
+]
+
+
+def gerar_os_exemplo(indice: int, rnd: random.Random) -> dict:
+    """Monta um dicionário no mesmo formato de OSService.buscar_por_id()"""
+    criado_em = datetime(2025, 1, 1) + timedelta(minutes=rnd.randint(0, 500000))
+    return {
+        'id': indice,
+        'numero_os': f"OS{indice:04d}",
+        'cliente_id': indice,
+        'usuario_id': 1,
+        'processador': rnd.choice([None, "Intel Core i5-10400", "AMD Ryzen 5 5600G"]),
+        'placa_mae': rnd.choice([None, "ASUS Prime H410M-E", "Gigabyte B450M"]),
+        'memoria_ram': rnd.choice([None, "8GB DDR4", "16GB DDR4 2666MHz"]),
+        'armazenamento': rnd.choice([None, "SSD 480GB", "HD 1TB"]),
+        'placa_video': rnd.choice([None, "Integrada", "GTX 1650"]),
+        'outros_componentes': rnd.choice([None, "Fonte 500W, Gabinete Genérico"]),
+        'defeito_relatado': rnd.choice(DEFEITOS),
+        'valor_estimado': Decimal(rnd.randint(50, 900)),
+        'prazo_previsto': date(2025, 1, 1) + timedelta(days=rnd.randint(0, 365)),
+        'observacoes': rnd.choice([None, "[01/01/2025 10:00] Diagnóstico iniciado"]),
+        'status': rnd.choice(['aberta', 'em_andamento', 'concluida', 'cancelada']),
+        'criado_em': criado_em,
+        'atualizado_em': criado_em,
+        'concluido_em': None,
+        'cliente_nome': "Cliente",
+        'cliente_sobrenome': f"Teste {indice}",
+        'cliente_cpf': "123.456.789-09",
+        'cliente_telefone': "(11) 99999-8888",
+        'cliente_email': rnd.choice([None, f"cliente{indice}@email.com"]),
+        'usuario_nome': "Administrador",
+    }
+
+
+def medir_individual(ordens: list) -> list:
+    """Gera um documento por OS; retorna o tempo de cada um (ms)"""
+    tempos = []
+    for ordem_servico in ordens:
+        inicio = time.perf_counter()
+        pdf_generator.template.renderizar(ordem_servico).output()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos
+
+
+def medir_lote(ordens: list) -> float:
+    """Gera um documento com todas as OS; retorna o tempo total (ms)"""
+    inicio = time.perf_counter()
+    pdf_generator.template.renderizar_lote(ordens).output()
+    return (time.perf_counter() - inicio) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da geração de PDF de OS")
+    parser.add_argument('--quantidade', type=int, default=500, help="Número de OS")
+    parser.add_argument('--seed', type=int, default=42, help="Semente dos dados")
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    ordens = [gerar_os_exemplo(i + 1, rnd) for i in range(args.quantidade)]
+
+    print("=" * 60)
+    print("BENCHMARK - GERAÇÃO DE PDF DE OS")
+    print("=" * 60)
+
+    # Aquecimento (imports, fontes, caches do fpdf)
+    medir_individual(ordens[:10])
+
+    tempos = medir_individual(ordens)
+    total_individual = sum(tempos)
+    total_lote = medir_lote(ordens)
+
+    por_os_individual = total_individual / len(ordens)
+    por_os_lote = total_lote / len(ordens)
+
+    print(f"\nOS geradas: {len(ordens)}")
+    print("\n[1] Um documento por OS")
+    print(f"   - Média: {por_os_individual:.2f} ms/OS")
+    print(f"   - Mediana: {statistics.median(tempos):.2f} ms")
+    print(f"   - p95: {statistics.quantiles(tempos, n=20)[-1]:.2f} ms")
+    print(f"   - Vazão: {1000 / por_os_individual:.0f} OS/s")
+
+    print("\n[2] Lote (um documento, template compartilhado)")
+    print(f"   - Média: {por_os_lote:.2f} ms/OS")
+    print(f"   - Vazão: {1000 / por_os_lote:.0f} OS/s")
+
+    print(f"\nGanho do lote: {por_os_individual / por_os_lote:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+"""
+Verificação de regressões nos planos de execução (EXPLAIN)
+Executa as operações dos serviços em um banco populado, captura cada SQL
+executado (observador do DatabaseConnection) e roda EXPLAIN (FORMAT JSON)
+para cada um. O snapshot guarda a forma do plano, o acesso a cada tabela
+(índice ou leitura sequencial) e o custo estimado.
+
+Na comparação com um snapshot anterior:
+    ❌ consulta quente que deixou de usar índice em uma tabela (falha)
+    ⚠️  outra consulta que perdeu índice, ou custo acima da tolerância
+    ℹ️  forma do plano diferente
+
+Execute:
+    python -m benchmarks.planos [--clientes 20000] [--os 100000]
+    python -m benchmarks.planos --comparar benchmarks/resultados/planos_base.json
+    python -m benchmarks.planos --comparar base.json atual.json   (sem executar)
+    python -m benchmarks.planos --dsn "host=localhost dbname=gf_copia user=postgres" --sem-carga
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from benchmarks.dados_sinteticos import carregar, gerar_cpf
+from benchmarks.postgres_temporario import RAIZ, banco_benchmark
+from benchmarks.servicos import PASTA_RESULTADOS, commit_atual
+
+PASTA_SERVICOS = str(RAIZ / 'services')
+
+# Consultas do dia a dia (balcão e bancada): perder o índice aqui é falha
+CONSULTAS_QUENTES = (
+    'AuthService.autenticar',
+    'ClienteService.buscar_por_id',
+    'ClienteService.buscar_por_cpf',
+    'ClienteService.buscar_por_nome',
+    'OSService.buscar_por_id',
+    'OSService.buscar_por_numero',
+    'OSService.listar_todas',
+    'OSService.listar_por_cliente',
+    'OSService.listar_atrasadas',
+)
+
+# Só comandos com plano (ignora SHOW, SET...)
+COMANDOS_EXPLICAVEIS = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+
+
+class CapturaSQL:
+    """Observador do DatabaseConnection que guarda cada SQL distinto executado"""
+
+    def __init__(self):
+        """Inicializa a captura vazia"""
+        self.consultas = {}
+
+    def __call__(self, query: str, params, duracao_ms: float):
+        """Recebe uma query executada (assinatura de db.adicionar_observador)"""
+        sql = ' '.join(query.split())
+        if not sql.upper().startswith(COMANDOS_EXPLICAVEIS):
+            return
+
+        chave = hashlib.sha1(sql.encode('utf-8')).hexdigest()[:12]
+        consulta = self.consultas.setdefault(chave, {
+            'sql': sql,
+            'query': query,
+            'params': params,
+            'origens': [],
+            'execucoes': 0,
+        })
+        consulta['execucoes'] += 1
+
+        origem = self._origem()
+        if origem and origem not in consulta['origens']:
+            consulta['origens'].append(origem)
+
+    @staticmethod
+    def _origem():
+        """Método do serviço que executou a query (Classe.metodo)"""
+        frame = sys._getframe(2)
+        while frame:
+            if frame.f_code.co_filename.startswith(PASTA_SERVICOS):
+                return CapturaSQL._nome_qualificado(frame)
+            frame = frame.f_back
+        return None
+
+    @staticmethod
+    def _nome_qualificado(frame) -> str:
+        """
+        Classe.metodo do frame (co_qualname só existe a partir do Python 3.11)
+
+        Antes do 3.11, procura nas classes do módulo o método cujo código é o
+        do frame (os serviços usam @staticmethod, sem self no frame).
+        """
+        codigo = frame.f_code
+        nome = getattr(codigo, 'co_qualname', None)
+        if nome:
+            return nome
+
+        for objeto in frame.f_globals.values():
+            if not isinstance(objeto, type):
+                continue
+            for atributo in vars(objeto).values():
+                funcao = getattr(atributo, '__func__', atributo)
+                funcao = getattr(funcao, '__wrapped__', funcao)
+                if getattr(funcao, '__code__', None) is codigo:
+                    return f"{objeto.__name__}.{codigo.co_name}"
+        return codigo.co_name
+
+
+def exercitar_servicos(clientes: tuple, ordens: tuple):
+    """
+    Chama as operações dos serviços para que todo SQL seja executado
+
+    Args:
+        clientes: Primeiro e último ID de cliente do banco
+        ordens: Primeiro e último ID de OS do banco
+    """
+    from services.auth_service import auth_service
+    from services.cliente_service import cliente_service
+    from services.os_service import os_service
+
+    hoje = date.today()
+    cliente_id = (clientes[0] + clientes[1]) // 2
+    os_id = (ordens[0] + ordens[1]) // 2
+
+    cliente = cliente_service.buscar_por_id(cliente_id)
+    cliente_service.buscar_por_cpf(cliente['cpf'])
+    cliente_service.buscar_por_nome('Silva')
+    cliente_service.listar_todos()
+    os_service.listar_por_cliente(cliente_id)
+
+    ordem = os_service.buscar_por_id(os_id)
+    os_service.buscar_por_numero(ordem['numero_os'])
+    os_service.listar_todas()
+    os_service.listar_todas(status='aberta')
+    os_service.listar_atrasadas()
+    os_service.obter_estatisticas()
+    os_service.totais_por_periodo(hoje - timedelta(days=30), hoje)
+    for _ in os_service.iterar_por_periodo(hoje - timedelta(days=30), hoje):
+        pass
+
+    # Escrita: cria registros próprios e os altera
+    novo_cliente_id = cliente_service.criar_cliente('Plano', 'Explain', gerar_cpf_livre(), '(11) 98888-7777', None)
+    cliente_service.atualizar_cliente(novo_cliente_id, telefone='(11) 97777-6666', email='plano@exemplo.com.br')
+
+    nova_os = os_service.criar_os(
+        cliente_id=cliente_id,
+        usuario_id=1,
+        defeito_relatado='Verificação de plano',
+        prazo_previsto=hoje + timedelta(days=7)
+    )
+    os_service.atualizar_status(nova_os['id'], 'em_andamento', 'Bancada')
+    os_service.adicionar_observacao(nova_os['id'], 'Observação de teste')
+    os_service.atualizar_os(nova_os['id'], valor_estimado=150.0, memoria_ram='16 GB DDR4')
+    cliente_service.deletar_cliente(novo_cliente_id)
+
+    auth_service.autenticar('admin', 'senha-incorreta-do-verificador')
+    auth_service.listar_usuarios()
+
+
+def gerar_cpf_livre() -> str:
+    """CPF válido ainda não cadastrado"""
+    import random
+    from services.cliente_service import cliente_service
+
+    rnd = random.Random()
+    while True:
+        cpf = gerar_cpf(rnd)
+        if not cliente_service.buscar_por_cpf(cpf):
+            return cpf
+
+
+def resumir_plano(plano: dict) -> dict:
+    """
+    Extrai o que importa de um plano do EXPLAIN (FORMAT JSON)
+
+    Args:
+        plano: Nó raiz ("Plan")
+
+    Returns:
+        Forma (árvore de nós em texto), acesso a cada tabela, custo e linhas estimados
+    """
+    acessos = {}
+
+    def visitar(no: dict) -> str:
+        tipo = no['Node Type']
+        tabela = no.get('Relation Name')
+        if tabela:
+            acesso = no.get('Index Name') or ('seq' if tipo == 'Seq Scan' else tipo)
+            if acesso not in acessos.setdefault(tabela, []):
+                acessos[tabela].append(acesso)
+            tipo = f"{tipo}[{tabela}{'.' + no['Index Name'] if no.get('Index Name') else ''}]"
+
+        filhos = [visitar(filho) for filho in no.get('Plans', [])]
+        return f"{tipo}({', '.join(filhos)})" if filhos else tipo
+
+    forma = visitar(plano)
+    return {
+        'forma': forma,
+        'acessos': acessos,
+        'custo': plano['Total Cost'],
+        'linhas': plano['Plan Rows'],
+    }
+
+
+def explicar(conninfo: str, consultas: dict) -> dict:
+    """
+    Roda EXPLAIN (FORMAT JSON) para as consultas capturadas
+
+    Os parâmetros são embutidos no SQL pelo cliente (ClientCursor), como
+    o planejador veria uma execução real. Nada é executado: sem ANALYZE.
+
+    Args:
+        conninfo: String de conexão
+        consultas: Resultado de CapturaSQL.consultas
+
+    Returns:
+        Dicionário chave -> resumo do plano
+    """
+    import psycopg
+
+    planos = {}
+    with psycopg.connect(conninfo) as conn:
+        for chave, consulta in sorted(consultas.items(), key=lambda item: item[1]['origens']):
+            with psycopg.ClientCursor(conn) as cursor:
+                try:
+                    cursor.execute(f"EXPLAIN (FORMAT JSON) {consulta['query']}", consulta['params'])
+                    resultado = cursor.fetchone()[0]
+                except psycopg.Error as e:
+                    conn.rollback()
+                    planos[chave] = {'sql': consulta['sql'], 'origens': consulta['origens'], 'erro': str(e).strip()}
+                    continue
+
+            planos[chave] = {
+                'sql': consulta['sql'],
+                'origens': consulta['origens'],
+                **resumir_plano(resultado[0]['Plan']),
+            }
+        conn.rollback()
+    return planos
+
+
+def _quente(plano: dict) -> bool:
+    """Consulta executada por alguma das CONSULTAS_QUENTES"""
+    return any(origem in CONSULTAS_QUENTES for origem in plano['origens'])
+
+
+def comparar(base: dict, atual: dict, tolerancia: float) -> int:
+    """
+    Compara dois snapshots de planos
+
+    Args:
+        base: Snapshot de referência
+        atual: Snapshot novo
+        tolerancia: Aumento aceito no custo estimado (0.5 = 50%)
+
+    Returns:
+        Quantidade de falhas (consultas quentes que perderam índice)
+    """
+    print(f"\nComparação com {base['data']} (commit {base.get('commit') or '?'})\n")
+
+    falhas = 0
+    for chave, plano in atual['planos'].items():
+        referencia = base['planos'].get(chave)
+        nome = ', '.join(plano['origens']) or plano['sql'][:60]
+        if not referencia:
+            print(f"   ℹ️  {nome}: consulta nova")
+            continue
+        if 'erro' in plano or 'erro' in referencia:
+            print(f"   ⚠️  {nome}: sem plano para comparar ({plano.get('erro') or referencia.get('erro')})")
+            continue
+
+        # Tabela lida por índice na base e só sequencialmente agora
+        perdidos = [
+            tabela for tabela, acessos in referencia['acessos'].items()
+            if any(acesso != 'seq' for acesso in acessos)
+            and plano['acessos'].get(tabela) == ['seq']
+        ]
+        if perdidos:
+            if _quente(plano):
+                falhas += 1
+                print(f"   ❌ {nome}: perdeu o índice em {', '.join(perdidos)}")
+            else:
+                print(f"   ⚠️  {nome}: perdeu o índice em {', '.join(perdidos)}")
+            print(f"        antes: {referencia['forma']}")
+            print(f"        agora: {plano['forma']}")
+            continue
+
+        variacao = plano['custo'] / referencia['custo'] - 1 if referencia['custo'] else 0
+        if variacao > tolerancia:
+            print(f"   ⚠️  {nome}: custo {referencia['custo']:.0f} -> {plano['custo']:.0f} ({variacao:+.0%})")
+        elif plano['forma'] != referencia['forma']:
+            print(f"   ℹ️  {nome}: plano mudou")
+            print(f"        antes: {referencia['forma']}")
+            print(f"        agora: {plano['forma']}")
+
+    for chave in base['planos'].keys() - atual['planos'].keys():
+        print(f"   ℹ️  {', '.join(base['planos'][chave]['origens']) or chave}: consulta não executada mais")
+
+    if base.get('volumes') != atual.get('volumes'):
+        print("\n⚠️  Volumes diferentes entre os snapshots: custos não são comparáveis")
+    return falhas
+
+
+def executar(args) -> dict:
+    """Sobe o banco, popula, captura o SQL dos serviços e gera o snapshot"""
+    import psycopg
+    from database.connection import db
+
+    with banco_benchmark(args.dsn, args.recriar_schema, args.manter_cluster) as conninfo:
+        if args.sem_carga:
+            print("\n[1/3] Usando os dados existentes no banco...")
+            with psycopg.connect(conninfo) as conn:
+                clientes = tuple(conn.execute("SELECT MIN(id), MAX(id) FROM clientes").fetchone())
+                ordens = tuple(conn.execute("SELECT MIN(id), MAX(id) FROM ordens_servico").fetchone())
+            if None in clientes or None in ordens:
+                raise RuntimeError("O banco não tem clientes e OS: rode sem --sem-carga")
+        else:
+            print(f"\n[1/3] Populando {args.clientes} clientes e {args.os} OS...")
+            carga = carregar(conninfo, args.clientes, args.os, args.seed)
+            clientes, ordens = carga['clientes_ids'], carga['os_ids']
+            print("✅ Dados gerados")
+
+        print("\n[2/3] Capturando o SQL dos serviços...")
+        db.configurar(conninfo)
+        captura = CapturaSQL()
+        db.adicionar_observador(captura)
+        try:
+            exercitar_servicos(clientes, ordens)
+        finally:
+            db.remover_observador(captura)
+            db.fechar_pool()
+        print(f"✅ {len(captura.consultas)} consultas distintas")
+
+        planos = explicar(conninfo, captura.consultas)
+        with psycopg.connect(conninfo) as conn:
+            versao = conn.execute("SHOW server_version").fetchone()[0]
+
+    return {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit_atual(),
+        'postgres': versao,
+        'volumes': {'clientes': clientes[1] - clientes[0] + 1, 'os': ordens[1] - ordens[0] + 1},
+        'planos': planos,
+    }
+
+
+def imprimir(snapshot: dict):
+    """Mostra os planos do snapshot"""
+    print(f"\n   {'Origem':<36} {'custo':>10} {'linhas':>8}  acesso")
+    for plano in sorted(snapshot['planos'].values(), key=lambda p: p['origens']):
+        nome = ', '.join(plano['origens'])[:36] or plano['sql'][:36]
+        if 'erro' in plano:
+            print(f"   {nome:<36} {'erro':>10} {'':>8}  {plano['erro'][:60]}")
+            continue
+        acessos = '; '.join(f"{tabela}: {'/'.join(lista)}" for tabela, lista in plano['acessos'].items())
+        marca = ' ⚠️' if _quente(plano) and any(lista == ['seq'] for lista in plano['acessos'].values()) else ''
+        print(f"   {nome:<36} {plano['custo']:>10.1f} {plano['linhas']:>8}  {acessos or '-'}{marca}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verificação de regressões nos planos de execução")
+    parser.add_argument('--dsn', help="Banco de TESTE a usar em vez do cluster temporário")
+    parser.add_argument('--recriar-schema', action='store_true',
+                        help="Aplica schema.sql no banco do --dsn (apaga os dados)")
+    parser.add_argument('--manter-cluster', action='store_true', help="Não apaga o cluster temporário")
+    parser.add_argument('--sem-carga', action='store_true',
+                        help="Não gera dados: usa os que já estão no banco do --dsn")
+    parser.add_argument('--clientes', type=int, default=20000, help="Clientes gerados")
+    parser.add_argument('--os', type=int, default=100000, help="OS geradas")
+    parser.add_argument('--seed', type=int, default=42, help="Semente dos dados")
+    parser.add_argument('--saida', type=Path, help="Arquivo JSON do snapshot")
+    parser.add_argument('--comparar', nargs='+', type=Path, metavar='JSON',
+                        help="Snapshot de referência (e, opcionalmente, o snapshot a comparar)")
+    parser.add_argument('--tolerancia', type=float, default=0.5, help="Aumento aceito no custo (0.5 = 50%%)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("PLANOS DE EXECUÇÃO - SERVIÇOS")
+    print("=" * 60)
+
+    if args.comparar and len(args.comparar) > 2:
+        parser.error("--comparar aceita no máximo dois arquivos")
+    if args.sem_carga and not args.dsn:
+        parser.error("--sem-carga exige --dsn")
+
+    if args.comparar and len(args.comparar) == 2:
+        base, atual = (json.loads(caminho.read_text(encoding='utf-8')) for caminho in args.comparar)
+    else:
+        if args.dsn and args.recriar_schema:
+            print("\n⚠️  O schema será recriado no banco informado: os dados atuais serão apagados")
+        atual = executar(args)
+        imprimir(atual)
+
+        destino = args.saida or PASTA_RESULTADOS / f"planos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        destino.write_text(json.dumps(atual, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"\n[3/3] Snapshot gravado em {destino}")
+
+        base = json.loads(args.comparar[0].read_text(encoding='utf-8')) if args.comparar else None
+
+    if base:
+        falhas = comparar(base, atual, args.tolerancia)
+        if falhas:
+            print(f"\n❌ {falhas} consulta(s) quente(s) perderam o índice")
+            sys.exit(1)
+        print("\n✅ Nenhuma consulta quente perdeu o índice")
+
+
+if __name__ == "__main__":
+    main()
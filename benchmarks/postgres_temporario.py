@@ -0,0 +1,161 @@
+"""
+Cluster PostgreSQL descartável para benchmarks
+Cria um cluster com initdb em uma pasta temporária, sobe o servidor em uma
+porta livre, aplica database/schema.sql e apaga tudo ao final
+
+Os binários (initdb, pg_ctl) são procurados em PG_BIN, no PATH e nas
+pastas de instalação mais comuns.
+"""
+
+import glob
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+import psycopg
+
+RAIZ = Path(__file__).resolve().parent.parent
+SCHEMA = RAIZ / 'database' / 'schema.sql'
+
+NOME_BANCO = 'gf_benchmark'
+
+# Pastas comuns dos binários (Debian/Ubuntu, RHEL, Windows)
+PASTAS_PG = (
+    '/usr/lib/postgresql/*/bin',
+    '/usr/pgsql-*/bin',
+    'C:/Program Files/PostgreSQL/*/bin',
+)
+
+
+def encontrar_binario(nome: str) -> Optional[str]:
+    """
+    Procura um binário do PostgreSQL
+
+    Args:
+        nome: initdb, pg_ctl...
+
+    Returns:
+        Caminho do executável ou None
+    """
+    pasta = os.getenv('PG_BIN')
+    if pasta:
+        return shutil.which(nome, path=pasta)
+
+    caminho = shutil.which(nome)
+    if caminho:
+        return caminho
+
+    # Versão mais nova primeiro
+    for padrao in PASTAS_PG:
+        for pasta in sorted(glob.glob(padrao), reverse=True):
+            caminho = shutil.which(nome, path=pasta)
+            if caminho:
+                return caminho
+    return None
+
+
+def aplicar_schema(conninfo: str):
+    """
+    Cria as tabelas do sistema (database/schema.sql)
+
+    Atenção: o schema apaga as tabelas existentes.
+
+    Args:
+        conninfo: String de conexão do banco
+    """
+    # O schema.sql está em latin-1 (mesma codificação do psql no Windows)
+    sql = SCHEMA.read_text(encoding='latin-1')
+    with psycopg.connect(conninfo, autocommit=True) as conn:
+        conn.execute(sql)
+
+
+@contextmanager
+def cluster_temporario(manter: bool = False):
+    """
+    Sobe um cluster PostgreSQL temporário com o schema do sistema
+
+    Args:
+        manter: Se True, não apaga a pasta do cluster ao final (para inspeção)
+
+    Yields:
+        String de conexão do banco criado
+
+    Raises:
+        RuntimeError: Se os binários do PostgreSQL não forem encontrados
+    """
+    initdb = encontrar_binario('initdb')
+    pg_ctl = encontrar_binario('pg_ctl')
+    if not initdb or not pg_ctl:
+        raise RuntimeError(
+            "Binários do PostgreSQL (initdb/pg_ctl) não encontrados. "
+            "Defina PG_BIN ou use --dsn com um banco de teste."
+        )
+
+    pasta = Path(tempfile.mkdtemp(prefix='gf_pg_'))
+    dados = pasta / 'dados'
+    porta = _porta_livre()
+
+    subprocess.run(
+        [initdb, '-D', str(dados), '-U', 'postgres', '-A', 'trust',
+         '-E', 'UTF8', '--locale=C', '--no-sync'],
+        check=True,
+        capture_output=True
+    )
+
+    opcoes = f"-p {porta} -c listen_addresses=127.0.0.1 -c unix_socket_directories=''"
+    subprocess.run(
+        [pg_ctl, '-D', str(dados), '-l', str(pasta / 'servidor.log'), '-o', opcoes, '-w', 'start'],
+        check=True,
+        capture_output=True
+    )
+
+    try:
+        base = f"host=127.0.0.1 port={porta} user=postgres"
+        with psycopg.connect(f"{base} dbname=postgres", autocommit=True) as conn:
+            conn.execute(f"CREATE DATABASE {NOME_BANCO}")
+
+        conninfo = f"{base} dbname={NOME_BANCO}"
+        aplicar_schema(conninfo)
+        yield conninfo
+
+    finally:
+        subprocess.run(
+            [pg_ctl, '-D', str(dados), '-m', 'fast', '-w', 'stop'],
+            capture_output=True
+        )
+        if not manter:
+            shutil.rmtree(pasta, ignore_errors=True)
+
+
+@contextmanager
+def banco_benchmark(dsn: Optional[str] = None, recriar_schema: bool = False, manter: bool = False):
+    """
+    Banco usado por um benchmark: o informado em --dsn ou um cluster temporário
+
+    Args:
+        dsn: String de conexão de um banco de teste (opcional)
+        recriar_schema: Aplica o schema no banco do --dsn (apaga os dados!)
+        manter: Não apaga o cluster temporário ao final
+
+    Yields:
+        String de conexão
+    """
+    if dsn:
+        if recriar_schema:
+            aplicar_schema(dsn)
+        yield dsn
+        return
+
+    with cluster_temporario(manter) as conninfo:
+        yield conninfo
+
+
+def _porta_livre() -> int:
+    """Porta TCP livre em 127.0.0.1"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
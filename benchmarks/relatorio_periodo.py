@@ -0,0 +1,72 @@
+"""
+Benchmark do relatório de OS por período
+Mede tempo e pico de memória do relatório em streaming para volumes crescentes
+
+Execute: python -m benchmarks.relatorio_periodo [--quantidades 1000 10000 100000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from decimal import Decimal
+from benchmarks.pdf_template import gerar_os_exemplo
+from utils.pdf_generator import pdf_generator
+
+
+def gerar_linhas(quantidade: int, seed: int):
+    """Gera as OS sob demanda, como o cursor no servidor"""
+    rnd = random.Random(seed)
+    for indice in range(1, quantidade + 1):
+        yield gerar_os_exemplo(indice, rnd)
+
+
+def medir(quantidade: int, seed: int, destino: str) -> tuple:
+    """Gera o relatório; retorna (tempo em s, pico de memória em KiB, tamanho em KiB)"""
+    totais = [{'status': None, 'quantidade': quantidade, 'valor_total': Decimal('0')}]
+
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    with open(destino, 'wb') as arquivo:
+        pdf_generator.relatorio.renderizar(
+            arquivo,
+            date(2025, 1, 1),
+            date(2025, 12, 31),
+            gerar_linhas(quantidade, seed),
+            lambda: totais
+        )
+    tempo = time.perf_counter() - inicio
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return tempo, pico / 1024, os.path.getsize(destino) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do relatório de OS por período")
+    parser.add_argument('--quantidades', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="Números de OS a testar")
+    parser.add_argument('--seed', type=int, default=42, help="Semente dos dados")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("BENCHMARK - RELATÓRIO DE OS POR PERÍODO")
+    print("=" * 60)
+    print("\n(tempos medidos com tracemalloc ativo, que deixa o código mais lento)")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        destino = os.path.join(pasta, 'relatorio.pdf')
+
+        for quantidade in args.quantidades:
+            tempo, pico, tamanho = medir(quantidade, args.seed, destino)
+            print(f"\n{quantidade} OS")
+            print(f"   - Tempo: {tempo:.2f} s ({tempo / quantidade * 1e6:.0f} µs/OS)")
+            print(f"   - Pico de memória: {pico:.0f} KiB")
+            print(f"   - Arquivo: {tamanho:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
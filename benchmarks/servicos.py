@@ -0,0 +1,263 @@
+"""
+Benchmark da camada de serviços contra um PostgreSQL local
+Sobe um cluster descartável (ou usa --dsn), popula volumes realistas e mede
+vazão e percentis de latência das operações mais usadas. O resultado é
+gravado em benchmarks/resultados/ para comparar execuções ao longo do tempo.
+
+Execute:
+    python -m benchmarks.servicos [--clientes 20000] [--os 100000] [--iteracoes 200]
+    python -m benchmarks.servicos --dsn "host=localhost dbname=gf_teste user=postgres"
+    python -m benchmarks.servicos --comparar benchmarks/resultados/base.json
+    python -m benchmarks.servicos --comparar base.json atual.json   (sem executar)
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from benchmarks.dados_sinteticos import DEFEITOS, NOMES, SOBRENOMES, carregar, gerar_cpf, gerar_telefone
+from benchmarks.estatisticas import resumir
+from benchmarks.postgres_temporario import RAIZ, banco_benchmark
+
+PASTA_RESULTADOS = Path(__file__).resolve().parent / 'resultados'
+
+# Operações medidas (na ordem de execução)
+OPERACOES = (
+    'criar_cliente',
+    'buscar_por_nome',
+    'criar_os',
+    'listar_todas',
+    'atualizar_status',
+    'adicionar_observacao',
+    'obter_estatisticas',
+    'gerar_pdf',
+)
+
+
+def criar_operacoes(rnd: random.Random, clientes: tuple, ordens: tuple) -> dict:
+    """
+    Monta as operações medidas (cada chamada executa uma vez)
+
+    Args:
+        rnd: Gerador aleatório
+        clientes: Primeiro e último ID de cliente carregados
+        ordens: Primeiro e último ID de OS carregados
+
+    Returns:
+        Dicionário nome -> função sem argumentos
+    """
+    from services.cliente_service import cliente_service
+    from services.os_service import os_service
+    from utils.pdf_generator import pdf_generator
+
+    def criar_cliente():
+        # Com milhões de clientes um CPF sorteado pode já existir: sorteia outro
+        for _ in range(5):
+            try:
+                return cliente_service.criar_cliente(
+                    rnd.choice(NOMES),
+                    rnd.choice(SOBRENOMES),
+                    gerar_cpf(rnd),
+                    gerar_telefone(rnd),
+                    None
+                )
+            except ValueError as e:
+                if 'já cadastrado' not in str(e):
+                    raise
+        raise RuntimeError("CPF repetido em 5 tentativas")
+
+    def criar_os():
+        os_service.criar_os(
+            cliente_id=rnd.randint(*clientes),
+            usuario_id=1,
+            defeito_relatado=rnd.choice(DEFEITOS),
+            processador='Intel Core i5-10400',
+            memoria_ram='8 GB DDR4',
+            valor_estimado=round(rnd.uniform(80, 900), 2),
+            prazo_previsto=date.today() + timedelta(days=7)
+        )
+
+    return {
+        'criar_cliente': criar_cliente,
+        'buscar_por_nome': lambda: cliente_service.buscar_por_nome(rnd.choice(NOMES)),
+        'criar_os': criar_os,
+        'listar_todas': lambda: os_service.listar_todas(limite=200),
+        'atualizar_status': lambda: os_service.atualizar_status(
+            rnd.randint(*ordens), rnd.choice(os_service.STATUS_VALIDOS)
+        ),
+        'adicionar_observacao': lambda: os_service.adicionar_observacao(
+            rnd.randint(*ordens), f"Benchmark {rnd.random():.6f}"
+        ),
+        'obter_estatisticas': os_service.obter_estatisticas,
+        'gerar_pdf': lambda: pdf_generator.gerar_pdf_os_bytes(rnd.randint(*ordens), usar_cache=False),
+    }
+
+
+def medir(funcao, iteracoes: int, aquecimento: int) -> dict:
+    """
+    Executa a operação e resume as latências
+
+    Args:
+        funcao: Operação (sem argumentos)
+        iteracoes: Execuções medidas
+        aquecimento: Execuções descartadas antes da medição
+
+    Returns:
+        Estatísticas (benchmarks.estatisticas.resumir)
+    """
+    for _ in range(aquecimento):
+        funcao()
+
+    tempos = []
+    inicio = time.perf_counter()
+    for _ in range(iteracoes):
+        t0 = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - t0) * 1000)
+    return resumir(tempos, time.perf_counter() - inicio)
+
+
+def comparar(base: dict, atual: dict, tolerancia: float) -> int:
+    """
+    Compara duas execuções e aponta as operações que ficaram mais lentas
+
+    Args:
+        base: Resultado de referência
+        atual: Resultado novo
+        tolerancia: Aumento aceito no p95 (0.2 = 20%)
+
+    Returns:
+        Quantidade de regressões
+    """
+    print(f"\nComparação com {base['data']} (commit {base.get('commit') or '?'})")
+    print(f"\n   {'Operação':<22} {'p50 base':>9} {'p50':>9} {'p95 base':>9} {'p95':>9} {'Δp95':>7}")
+
+    regressoes = 0
+    for nome, estatisticas in atual['operacoes'].items():
+        referencia = base['operacoes'].get(nome)
+        if not referencia or not referencia.get('quantidade') or not estatisticas.get('quantidade'):
+            print(f"   {nome:<22} {'(sem referência)':>46}")
+            continue
+
+        variacao = estatisticas['p95_ms'] / referencia['p95_ms'] - 1 if referencia['p95_ms'] else 0
+        marca = ''
+        if variacao > tolerancia:
+            regressoes += 1
+            marca = '  ❌'
+        print(
+            f"   {nome:<22} {referencia['p50_ms']:>9.2f} {estatisticas['p50_ms']:>9.2f} "
+            f"{referencia['p95_ms']:>9.2f} {estatisticas['p95_ms']:>9.2f} {variacao:>+7.0%}{marca}"
+        )
+
+    if base.get('volumes') != atual.get('volumes'):
+        print("\n⚠️  Volumes diferentes entre as execuções: a comparação é apenas indicativa")
+    return regressoes
+
+
+def commit_atual():
+    """Commit do git em que o benchmark rodou (None fora de um repositório)"""
+    try:
+        resultado = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=RAIZ, capture_output=True, text=True, check=True
+        )
+        return resultado.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executar(args) -> dict:
+    """Sobe o banco, popula, mede as operações e devolve o resultado"""
+    from database.connection import db
+
+    with banco_benchmark(args.dsn, args.recriar_schema, args.manter_cluster) as conninfo:
+        print(f"\n[1/3] Populando {args.clientes} clientes e {args.os} OS...")
+        inicio = time.perf_counter()
+        carga = carregar(conninfo, args.clientes, args.os, args.seed)
+        print(f"✅ Dados gerados em {time.perf_counter() - inicio:.1f} s")
+
+        db.configurar(conninfo)
+        versao = db.execute_query("SHOW server_version")[0]['server_version']
+
+        print(f"\n[2/3] Medindo ({args.iteracoes} execuções por operação)...\n")
+        rnd = random.Random(args.seed)
+        operacoes = criar_operacoes(rnd, carga['clientes_ids'], carga['os_ids'])
+
+        resultados = {}
+        for nome in args.operacoes:
+            resultados[nome] = medir(operacoes[nome], args.iteracoes, args.aquecimento)
+            r = resultados[nome]
+            print(
+                f"   {nome:<22} {r['ops_s']:>8.1f} ops/s   p50 {r['p50_ms']:>8.2f}   "
+                f"p95 {r['p95_ms']:>8.2f}   p99 {r['p99_ms']:>8.2f} ms"
+            )
+
+        db.fechar_pool()
+
+    return {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit_atual(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'postgres': versao,
+        'volumes': {'clientes': args.clientes, 'os': args.os},
+        'seed': args.seed,
+        'iteracoes': args.iteracoes,
+        'operacoes': resultados,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da camada de serviços")
+    parser.add_argument('--dsn', help="Banco de TESTE a usar em vez do cluster temporário")
+    parser.add_argument('--recriar-schema', action='store_true',
+                        help="Aplica schema.sql no banco do --dsn (apaga os dados)")
+    parser.add_argument('--manter-cluster', action='store_true', help="Não apaga o cluster temporário")
+    parser.add_argument('--clientes', type=int, default=20000, help="Clientes gerados")
+    parser.add_argument('--os', type=int, default=100000, help="OS geradas")
+    parser.add_argument('--iteracoes', type=int, default=200, help="Execuções medidas por operação")
+    parser.add_argument('--aquecimento', type=int, default=10, help="Execuções descartadas por operação")
+    parser.add_argument('--operacoes', nargs='+', choices=OPERACOES, default=list(OPERACOES))
+    parser.add_argument('--seed', type=int, default=42, help="Semente dos dados")
+    parser.add_argument('--saida', type=Path, help="Arquivo JSON do resultado")
+    parser.add_argument('--comparar', nargs='+', type=Path, metavar='JSON',
+                        help="Resultado de referência (e, opcionalmente, o resultado a comparar)")
+    parser.add_argument('--tolerancia', type=float, default=0.2, help="Aumento aceito no p95 (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("BENCHMARK - CAMADA DE SERVIÇOS")
+    print("=" * 60)
+
+    if args.comparar and len(args.comparar) > 2:
+        parser.error("--comparar aceita no máximo dois arquivos")
+
+    if args.comparar and len(args.comparar) == 2:
+        base, atual = (json.loads(caminho.read_text(encoding='utf-8')) for caminho in args.comparar)
+    else:
+        if args.dsn and args.recriar_schema:
+            print("\n⚠️  O schema será recriado no banco informado: os dados atuais serão apagados")
+        atual = executar(args)
+
+        destino = args.saida or PASTA_RESULTADOS / f"servicos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        destino.write_text(json.dumps(atual, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"\n[3/3] Resultado gravado em {destino}")
+
+        base = json.loads(args.comparar[0].read_text(encoding='utf-8')) if args.comparar else None
+
+    if base:
+        regressoes = comparar(base, atual, args.tolerancia)
+        if regressoes:
+            print(f"\n❌ {regressoes} operação(ões) acima da tolerância de {args.tolerancia:.0%}")
+            sys.exit(1)
+        print("\n✅ Nenhuma regressão acima da tolerância")
+
+
+if __name__ == "__main__":
+    main()
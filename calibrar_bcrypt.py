@@ -0,0 +1,82 @@
+"""
+Script para calibrar o custo do bcrypt nesta máquina
+Mede o tempo de hash em cada custo e sugere o maior custo que fica dentro
+da latência desejada para o login
+Execute: python calibrar_bcrypt.py [--alvo-ms 250] [--amostras 3]
+"""
+
+import argparse
+import statistics
+import time
+import bcrypt
+
+# Faixa aceita pelo bcrypt; abaixo de 10 a senha fica fácil de atacar
+CUSTO_MINIMO = 4
+CUSTO_MAXIMO = 31
+CUSTO_RECOMENDADO_MINIMO = 10
+
+def medir_custo(custo, amostras):
+    """
+    Mede o tempo de um hash bcrypt com o custo informado
+
+    Args:
+        custo: Custo do bcrypt (log2 das iterações)
+        amostras: Quantidade de medições
+
+    Returns:
+        Mediana do tempo em milissegundos
+    """
+    senha = b'calibracao-bcrypt'
+    tempos = []
+    for _ in range(amostras):
+        salt = bcrypt.gensalt(rounds=custo)
+        inicio = time.perf_counter()
+        bcrypt.hashpw(senha, salt)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibra o custo do bcrypt")
+    parser.add_argument('--alvo-ms', type=float, default=250,
+                        help="Latência desejada para verificar uma senha (ms)")
+    parser.add_argument('--amostras', type=int, default=3, help="Medições por custo")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🔐 CALIBRAÇÃO DO BCRYPT")
+    print("=" * 60)
+
+    print(f"\n[1/2] Medindo custos (alvo: {args.alvo_ms:.0f} ms)...")
+    print(f"\n   {'Custo':>5}  {'Tempo (ms)':>10}")
+
+    escolhido = None
+    custo = CUSTO_MINIMO
+    while custo <= CUSTO_MAXIMO:
+        tempo = medir_custo(custo, args.amostras)
+        print(f"   {custo:>5}  {tempo:>10.1f}")
+
+        # Cada custo dobra o tempo: o primeiro acima do alvo encerra a busca
+        if tempo > args.alvo_ms:
+            break
+        escolhido = custo
+        custo += 1
+
+    print("\n[2/2] Resultado...")
+    if escolhido is None:
+        print(f"❌ Nem o custo {CUSTO_MINIMO} fica abaixo de {args.alvo_ms:.0f} ms")
+        return
+
+    if escolhido < CUSTO_RECOMENDADO_MINIMO:
+        print(f"⚠️  Custo {escolhido} é baixo demais; usando {CUSTO_RECOMENDADO_MINIMO} (acima do alvo)")
+        escolhido = CUSTO_RECOMENDADO_MINIMO
+
+    print(f"✅ Custo sugerido: {escolhido}")
+
+    print("\n" + "=" * 60)
+    print("Adicione ao arquivo .env:")
+    print(f"\n   BCRYPT_ROUNDS={escolhido}")
+    print("\nSenhas com outro custo são atualizadas no próximo login de cada usuário.")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
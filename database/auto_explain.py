@@ -0,0 +1,202 @@
+"""
+Captura automática de planos das queries lentas
+Queries acima de DB_AUTO_EXPLAIN_MS são explicadas de novo, por uma thread
+própria e em conexão própria, com EXPLAIN (ANALYZE, BUFFERS). O resultado
+vai para logs/explain_AAAAMMDD.jsonl (relatorio_indices.py lê esses arquivos).
+
+Desligado por padrão (DB_AUTO_EXPLAIN_MS=0).
+
+O ANALYZE executa a query de novo, então só é usado em consultas de
+leitura: INSERT, UPDATE, DELETE, SELECT ... FOR UPDATE e CTEs que alteram
+dados são apenas estimados (EXPLAIN sem ANALYZE), para não prender as linhas
+que outra estação está editando. A conexão do EXPLAIN é somente leitura e
+com lock_timeout curto: uma consulta que chama função que grava (ex.:
+atualizar_resumo_os) ou espera um lock também cai para a estimativa. Os
+parâmetros não são gravados (podem conter CPF e dados de clientes).
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Consultas que alteram dados ou prendem linhas (não passam pelo ANALYZE)
+RE_ESCRITA = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE)\b|\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE)\b", re.IGNORECASE)
+
+
+class AutoExplain:
+    """
+    Observador do DatabaseConnection que registra o plano das queries lentas
+    """
+
+    # Queries aguardando o EXPLAIN (as excedentes são descartadas)
+    TAMANHO_FILA = 50
+
+    # Intervalo mínimo (segundos) entre dois EXPLAIN da mesma query
+    INTERVALO_REPETICAO = 600
+
+    # Tempo máximo de cada EXPLAIN ANALYZE no servidor
+    TIMEOUT_MS = 30000
+
+    # Espera máxima por um lock: o EXPLAIN desiste antes de atrasar alguém
+    LOCK_TIMEOUT_MS = 200
+
+    def __init__(self):
+        """Inicializa a captura (desligada até iniciar)"""
+        self.limite_ms = float(os.getenv('DB_AUTO_EXPLAIN_MS', '0'))
+        self.pasta = Path(os.getenv('DB_AUTO_EXPLAIN_DIR', 'logs'))
+        self.ativo = False
+        self._db = None
+        self._fila = queue.Queue(maxsize=self.TAMANHO_FILA)
+        self._ultimos = {}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def iniciar(self, db) -> bool:
+        """
+        Passa a observar as queries do banco
+
+        Args:
+            db: DatabaseConnection
+
+        Returns:
+            True se a captura foi ligada (DB_AUTO_EXPLAIN_MS > 0)
+        """
+        if self.limite_ms <= 0:
+            return False
+
+        with self._lock:
+            if self.ativo:
+                return True
+            self.ativo = True
+            self._db = db
+            self._thread = threading.Thread(target=self._trabalhar, name='auto-explain', daemon=True)
+            self._thread.start()
+
+        db.adicionar_observador(self.observar)
+        atexit.register(self.parar)
+        logger.info(f"EXPLAIN automático ligado para queries acima de {self.limite_ms:.0f} ms")
+        return True
+
+    def parar(self):
+        """Encerra a thread de captura (as queries pendentes são descartadas)"""
+        with self._lock:
+            if not self.ativo:
+                return
+            self.ativo = False
+
+        try:
+            self._fila.put_nowait(None)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=5)
+
+    def observar(self, query: str, params, duracao_ms: float):
+        """Recebe cada query executada (assinatura de db.adicionar_observador)"""
+        if not self.ativo or duracao_ms < self.limite_ms:
+            return
+
+        sql = ' '.join(query.split())
+        comando = sql.split(' ', 1)[0].upper()
+        if comando not in ('SELECT', 'WITH', 'UPDATE', 'DELETE', 'INSERT'):
+            return
+
+        chave = hashlib.sha1(sql.encode('utf-8')).hexdigest()[:12]
+        agora = time.monotonic()
+        with self._lock:
+            if agora - self._ultimos.get(chave, -self.INTERVALO_REPETICAO) < self.INTERVALO_REPETICAO:
+                return
+            self._ultimos[chave] = agora
+
+        try:
+            self._fila.put_nowait((chave, comando, query, params, duracao_ms))
+        except queue.Full:
+            logger.debug("EXPLAIN automático: fila cheia, query descartada")
+
+    def _trabalhar(self):
+        """Thread que roda os EXPLAIN e grava os planos"""
+        import psycopg
+
+        conn = None
+        while True:
+            item = self._fila.get()
+            if item is None:
+                break
+
+            chave, comando, query, params, duracao_ms = item
+            try:
+                if conn is None or conn.closed or conn.broken:
+                    conn = psycopg.connect(self._db._connection_string)
+                    conn.execute(f"SET statement_timeout = {self.TIMEOUT_MS}")
+                    conn.execute(f"SET lock_timeout = {self.LOCK_TIMEOUT_MS}")
+                    conn.execute("SET default_transaction_read_only = on")
+                    conn.commit()
+
+                plano, analisado = self._explicar(conn, comando, query, params)
+                self._gravar({
+                    'ts': datetime.now().isoformat(timespec='milliseconds'),
+                    'consulta': chave,
+                    'duracao_ms': round(duracao_ms, 3),
+                    'analyze': analisado,
+                    'sql': ' '.join(query.split()),
+                    'plano': plano,
+                })
+            except Exception as e:
+                # Nunca afeta o sistema: apenas registra e segue
+                logger.warning(f"EXPLAIN automático falhou ({chave}): {e}")
+
+        if conn is not None:
+            conn.close()
+
+    @staticmethod
+    def _explicar(conn, comando: str, query: str, params) -> tuple:
+        """
+        Roda o EXPLAIN com os parâmetros embutidos pelo cliente
+
+        Consultas de leitura vão com ANALYZE; escritas, ou leituras que
+        tentam gravar ou esperam um lock, só com a estimativa do planejador.
+
+        Returns:
+            Tupla (plano em JSON, se foi com ANALYZE)
+        """
+        import psycopg
+
+        if comando in ('SELECT', 'WITH') and not RE_ESCRITA.search(query):
+            try:
+                return AutoExplain._executar_explain(conn, 'ANALYZE, BUFFERS, FORMAT JSON', query, params), True
+            except (psycopg.errors.ReadOnlySqlTransaction, psycopg.errors.LockNotAvailable) as e:
+                logger.debug(f"EXPLAIN automático sem ANALYZE: {e}")
+
+        return AutoExplain._executar_explain(conn, 'FORMAT JSON', query, params), False
+
+    @staticmethod
+    def _executar_explain(conn, opcoes: str, query: str, params):
+        """Executa um EXPLAIN e desfaz a transação (nada fica gravado ou preso)"""
+        import psycopg
+
+        try:
+            with psycopg.ClientCursor(conn) as cursor:
+                cursor.execute(f"EXPLAIN ({opcoes}) {query}", params)
+                return cursor.fetchone()[0]
+        finally:
+            conn.rollback()
+
+    def _gravar(self, registro: dict):
+        """Acrescenta um plano ao arquivo do dia"""
+        self.pasta.mkdir(exist_ok=True)
+        arquivo = self.pasta / f"explain_{datetime.now().strftime('%Y%m%d')}.jsonl"
+        with open(arquivo, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(registro, ensure_ascii=False, default=str) + '\n')
+
+
+# Instância global
+auto_explain = AutoExplain()
@@ -4,12 +4,16 @@ Gerencia a conexão com o banco de dados usando psycopg3
 """
 
 import os
+import time
+import queue
 import logging
-from typing import Optional, List, Dict, Any
+import threading
+from typing import Optional, List, Dict, Any, Iterator, Callable
 from contextlib import contextmanager
 import psycopg
 from psycopg.rows import dict_row
 from dotenv import load_dotenv
+from utils.tracing import tracer
 
 # Carrega variáveis de ambiente
 load_dotenv()
@@ -57,12 +61,28 @@ class DatabaseConnection:
         )
         
         logger.info(f"Conexão configurada para {db_name}@{db_host}:{db_port}")
+        
+        # Pool de conexões ociosas (LIFO: reaproveita a mais recente, que
+        # tem menos chance de ter sido derrubada pelo servidor ou pela rede)
+        self._pool_tamanho = int(os.getenv('DB_POOL_SIZE', '4'))
+        self._pool_max_ocioso = float(os.getenv('DB_POOL_MAX_IDLE', '300'))
+        self._pool = queue.LifoQueue(maxsize=max(self._pool_tamanho, 1))
+        
+        # Observadores das queries executadas (ferramentas de diagnóstico)
+        self._observadores: List[Callable] = []
+        self._notificando = threading.local()
+        
+        # Plano das queries lentas em logs/explain_*.jsonl (DB_AUTO_EXPLAIN_MS)
+        if float(os.getenv('DB_AUTO_EXPLAIN_MS', '0')) > 0:
+            from database.auto_explain import auto_explain
+            auto_explain.iniciar(self)
     
     @contextmanager
     def get_connection(self):
         """
         Context manager para obter conexão com o banco
-        Garante que a conexão será fechada automaticamente
+        Reaproveita uma conexão ociosa do pool quando houver; ao sair, a
+        conexão volta para o pool (ou é fechada, se o pool estiver cheio)
         
         Uso:
             with db.get_connection() as conn:
@@ -73,16 +93,113 @@ class DatabaseConnection:
         """
         conn = None
         try:
-            conn = psycopg.connect(self._connection_string)
-            logger.debug("Conexão com banco estabelecida")
+            conn = self._obter_conexao()
             yield conn
         except psycopg.Error as e:
             logger.error(f"Erro ao conectar ao banco: {e}")
             raise
         finally:
             if conn:
+                self._devolver_conexao(conn)
+    
+    def aquecer(self, quantidade: int = None) -> int:
+        """
+        Abre conexões antecipadamente e deixa no pool
+        (ex.: enquanto a tela de login está aberta)
+        
+        Args:
+            quantidade: Conexões desejadas no pool (padrão: DB_POOL_SIZE)
+        
+        Returns:
+            Quantidade de conexões abertas agora
+        """
+        if quantidade is None:
+            quantidade = self._pool_tamanho
+        
+        abertas = 0
+        while self._pool.qsize() < min(quantidade, self._pool_tamanho):
+            conn = self._conectar()
+            if not self._guardar_no_pool(conn):
                 conn.close()
-                logger.debug("Conexão com banco fechada")
+                break
+            abertas += 1
+        
+        if abertas:
+            logger.info(f"Pool de conexões aquecido: {abertas} conexões abertas")
+        return abertas
+    
+    def configurar(self, conninfo: str):
+        """
+        Aponta a conexão para outro banco (ex.: cluster temporário dos
+        benchmarks), no lugar do configurado no .env
+        
+        Args:
+            conninfo: String de conexão do psycopg ("host=... dbname=...")
+        """
+        # As conexões ociosas pertencem ao banco anterior
+        self.fechar_pool()
+        self._connection_string = conninfo
+        logger.info("Conexão reconfigurada para outro banco")
+    
+    def fechar_pool(self):
+        """Fecha todas as conexões ociosas do pool"""
+        while True:
+            try:
+                conn, _ = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+        logger.debug("Pool de conexões fechado")
+    
+    def _conectar(self):
+        """Abre uma conexão nova com o banco"""
+        conn = psycopg.connect(self._connection_string)
+        logger.debug("Conexão com banco estabelecida")
+        return conn
+    
+    def _obter_conexao(self):
+        """Retira uma conexão válida do pool ou abre uma nova"""
+        while True:
+            try:
+                conn, devolvida_em = self._pool.get_nowait()
+            except queue.Empty:
+                with tracer.span('db.conectar', 'db'):
+                    return self._conectar()
+            
+            # Descarta conexões fechadas ou ociosas há muito tempo
+            if conn.closed or conn.broken or time.monotonic() - devolvida_em > self._pool_max_ocioso:
+                conn.close()
+                continue
+            
+            return conn
+    
+    def _devolver_conexao(self, conn):
+        """Devolve a conexão ao pool, limpa, ou fecha se não puder ser reaproveitada"""
+        if conn.closed or conn.broken:
+            conn.close()
+            return
+        
+        try:
+            # Transação deixada aberta (erro ou iteração interrompida)
+            if conn.info.transaction_status != psycopg.pq.TransactionStatus.IDLE:
+                conn.rollback()
+        except psycopg.Error:
+            conn.close()
+            return
+        
+        if not self._guardar_no_pool(conn):
+            conn.close()
+            logger.debug("Conexão com banco fechada")
+    
+    def _guardar_no_pool(self, conn) -> bool:
+        """Coloca a conexão no pool; False se o pool estiver cheio"""
+        if self._pool_tamanho <= 0:
+            return False
+        try:
+            self._pool.put_nowait((conn, time.monotonic()))
+            return True
+        except queue.Full:
+            return False
     
     @contextmanager
     def get_cursor(self, row_factory=dict_row):
@@ -131,22 +248,81 @@ class DatabaseConnection:
                 ("123.456.789-00",)
             )
         """
+        inicio_ns = time.perf_counter_ns()
         try:
-            with self.get_cursor() as cursor:
+            with tracer.span('db.execute_query', 'db', sql=self._resumo_sql(query)) as span, \
+                    self.get_cursor() as cursor:
                 cursor.execute(query, params)
                 
                 if fetch:
                     results = cursor.fetchall()
+                    if span:
+                        span.atributos['linhas'] = len(results)
                     logger.info(f"Query executada: {len(results)} registros retornados")
-                    return results
                 else:
+                    results = None
                     logger.info("Query executada com sucesso (sem fetch)")
-                    return None
+            
+            self._notificar(query, params, inicio_ns)
+            return results
                     
         except psycopg.Error as e:
             logger.error(f"Erro ao executar query: {e}")
             raise
     
+    def stream_query(
+        self,
+        query: str,
+        params: Optional[tuple] = None,
+        itersize: int = 2000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Executa uma query SELECT com cursor no servidor, entregando as linhas
+        conforme chegam (para relatórios e exportações grandes)
+        
+        Apenas itersize linhas ficam em memória de cada vez. A conexão fica
+        aberta até o fim da iteração (ou até o gerador ser fechado).
+        
+        Args:
+            query: Query SQL a ser executada
+            params: Parâmetros para a query (usar %s para placeholders)
+            itersize: Quantidade de linhas buscadas por ida ao servidor
+        
+        Yields:
+            Dicionário com cada linha do resultado
+        
+        Exemplo:
+            for os in db.stream_query("SELECT * FROM ordens_servico"):
+                ...
+        """
+        total = 0
+        inicio_ns = time.perf_counter_ns()
+        try:
+            with self.get_connection() as conn:
+                # Cursor nomeado = cursor no servidor (DECLARE ... CURSOR)
+                with conn.cursor(name='stream_query', row_factory=dict_row) as cursor:
+                    cursor.itersize = itersize
+                    cursor.execute(query, params)
+                    
+                    for row in cursor:
+                        total += 1
+                        yield row
+                
+                conn.commit()
+                logger.info(f"Query em streaming executada: {total} registros retornados")
+            
+            self._notificar(query, params, inicio_ns)
+                    
+        except psycopg.Error as e:
+            logger.error(f"Erro ao executar query em streaming: {e}")
+            raise
+        finally:
+            # Gerador: o span é registrado ao final, cobrindo toda a iteração
+            tracer.registrar(
+                'db.stream_query', 'db', inicio_ns, time.perf_counter_ns(),
+                sql=self._resumo_sql(query), linhas=total
+            )
+    
     def execute_insert(
         self, 
         query: str, 
@@ -170,18 +346,22 @@ class DatabaseConnection:
                 ("João Silva", "123.456.789-00")
             )
         """
+        inicio_ns = time.perf_counter_ns()
         try:
-            with self.get_cursor() as cursor:
+            with tracer.span('db.execute_insert', 'db', sql=self._resumo_sql(query)), \
+                    self.get_cursor() as cursor:
                 cursor.execute(query, params)
                 
                 if return_id:
                     result = cursor.fetchone()
                     inserted_id = result['id'] if result else None
                     logger.info(f"Registro inserido com ID: {inserted_id}")
-                    return inserted_id
                 else:
+                    inserted_id = None
                     logger.info("Insert executado com sucesso")
-                    return None
+            
+            self._notificar(query, params, inicio_ns)
+            return inserted_id
                     
         except psycopg.Error as e:
             logger.error(f"Erro ao executar insert: {e}")
@@ -208,17 +388,68 @@ class DatabaseConnection:
                 ("11999999999", 1)
             )
         """
+        inicio_ns = time.perf_counter_ns()
         try:
-            with self.get_cursor() as cursor:
+            with tracer.span('db.execute_update', 'db', sql=self._resumo_sql(query)) as span, \
+                    self.get_cursor() as cursor:
                 cursor.execute(query, params)
                 rows_affected = cursor.rowcount
+                if span:
+                    span.atributos['linhas'] = rows_affected
                 logger.info(f"Update/Delete executado: {rows_affected} linhas afetadas")
-                return rows_affected
+            
+            self._notificar(query, params, inicio_ns)
+            return rows_affected
                 
         except psycopg.Error as e:
             logger.error(f"Erro ao executar update/delete: {e}")
             raise
     
+    def adicionar_observador(self, observador: Callable):
+        """
+        Registra uma função chamada após cada query executada com sucesso
+        
+        O observador recebe (query, params, duracao_ms). Queries executadas
+        pelo próprio observador não são notificadas de novo.
+        
+        Args:
+            observador: Função a chamar
+        """
+        if observador not in self._observadores:
+            self._observadores.append(observador)
+    
+    def remover_observador(self, observador: Callable):
+        """
+        Remove um observador registrado
+        
+        Args:
+            observador: Função registrada em adicionar_observador
+        """
+        if observador in self._observadores:
+            self._observadores.remove(observador)
+    
+    def _notificar(self, query: str, params: Optional[tuple], inicio_ns: int):
+        """Avisa os observadores de uma query executada"""
+        if not self._observadores or getattr(self._notificando, 'ativo', False):
+            return
+        
+        duracao_ms = (time.perf_counter_ns() - inicio_ns) / 1_000_000
+        self._notificando.ativo = True
+        try:
+            for observador in list(self._observadores):
+                try:
+                    observador(query, params, duracao_ms)
+                except Exception as e:
+                    # Diagnóstico nunca interrompe a operação
+                    logger.warning(f"Erro no observador de queries: {e}")
+        finally:
+            self._notificando.ativo = False
+    
+    @staticmethod
+    def _resumo_sql(query: str) -> str:
+        """SQL em uma linha (e limitado) para identificar a consulta no rastreamento"""
+        return ' '.join(query.split())[:200]
+    
     def test_connection(self) -> bool:
         """
         Testa se a conexão com o banco está funcionando
@@ -0,0 +1,160 @@
+-- ============================================================================
+-- MIGRAO 001: Resumo dirio das OS
+-- Para bancos criados antes desta verso do schema.sql (pode ser executada
+-- mais de uma vez). Execute: psql -d gf_informatica -f 001_resumo_diario_os.sql
+-- ============================================================================
+
+BEGIN;
+
+-- ============================================================================
+-- RESUMO DIRIO DAS OS (relatrios gerenciais e painel)
+-- Uma linha por dia e usurio: OS abertas, OS concludas, receita e tempos de
+-- concluso. Os relatrios leem s o resumo, nunca a tabela inteira de OS.
+--
+-- As alteraes em ordens_servico marcam os dias afetados em
+-- os_resumo_pendente; atualizar_resumo_os() recalcula apenas esses dias.
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS os_resumo_dia (
+    dia DATE NOT NULL,
+    usuario_id INTEGER NOT NULL,
+    criadas INTEGER NOT NULL DEFAULT 0,  -- OS abertas no dia
+    valor_criadas DECIMAL(12, 2) NOT NULL DEFAULT 0,  -- Soma do valor estimado das OS abertas
+    concluidas INTEGER NOT NULL DEFAULT 0,  -- OS concludas no dia
+    receita DECIMAL(12, 2) NOT NULL DEFAULT 0,  -- Soma do valor estimado das OS concludas
+    minutos_conclusao INTEGER[] NOT NULL DEFAULT '{}',  -- Abertura at concluso, por OS concluda
+    PRIMARY KEY (dia, usuario_id)
+);
+
+CREATE TABLE IF NOT EXISTS os_resumo_pendente (
+    dia DATE PRIMARY KEY
+);
+
+-- Busca das OS concludas em um dia (reclculo do resumo)
+CREATE INDEX IF NOT EXISTS idx_os_concluido ON ordens_servico(concluido_em);
+
+-- Marca os dias afetados por um comando (trigger por comando, com as
+-- tabelas de transio: um COPY de milhes de linhas marca cada dia uma vez)
+CREATE OR REPLACE FUNCTION marcar_resumo_os_pendente()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- DO UPDATE (e no DO NOTHING) trava o dia j pendente at o commit:
+    -- atualizar_resumo_os() espera esta transao antes de retir-lo e
+    -- recalcula o dia j enxergando estas alteraes
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO os_resumo_pendente (dia)
+        SELECT criado_em::date FROM novas
+        UNION
+        SELECT concluido_em::date FROM novas WHERE concluido_em IS NOT NULL
+        ON CONFLICT (dia) DO UPDATE SET dia = EXCLUDED.dia;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO os_resumo_pendente (dia)
+        SELECT criado_em::date FROM antigas
+        UNION
+        SELECT concluido_em::date FROM antigas WHERE concluido_em IS NOT NULL
+        ON CONFLICT (dia) DO UPDATE SET dia = EXCLUDED.dia;
+    ELSE
+        -- S interessa o que muda o resumo (observaes, por exemplo, no)
+        INSERT INTO os_resumo_pendente (dia)
+        SELECT DISTINCT dias.dia
+        FROM antigas a
+        INNER JOIN novas n ON n.id = a.id
+        CROSS JOIN LATERAL (VALUES
+            (a.criado_em::date), (n.criado_em::date),
+            (a.concluido_em::date), (n.concluido_em::date)
+        ) AS dias(dia)
+        WHERE dias.dia IS NOT NULL
+          AND (a.criado_em, a.concluido_em, a.valor_estimado, a.usuario_id, a.status)
+              IS DISTINCT FROM (n.criado_em, n.concluido_em, n.valor_estimado, n.usuario_id, n.status)
+        ON CONFLICT (dia) DO UPDATE SET dia = EXCLUDED.dia;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_resumo_os_insert ON ordens_servico;
+CREATE TRIGGER trigger_resumo_os_insert
+    AFTER INSERT ON ordens_servico
+    REFERENCING NEW TABLE AS novas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION marcar_resumo_os_pendente();
+
+DROP TRIGGER IF EXISTS trigger_resumo_os_update ON ordens_servico;
+CREATE TRIGGER trigger_resumo_os_update
+    AFTER UPDATE ON ordens_servico
+    REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION marcar_resumo_os_pendente();
+
+DROP TRIGGER IF EXISTS trigger_resumo_os_delete ON ordens_servico;
+CREATE TRIGGER trigger_resumo_os_delete
+    AFTER DELETE ON ordens_servico
+    REFERENCING OLD TABLE AS antigas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION marcar_resumo_os_pendente();
+
+-- Recalcula os dias pendentes; retorna quantos dias foram recalculados
+CREATE OR REPLACE FUNCTION atualizar_resumo_os()
+RETURNS INTEGER AS $$
+DECLARE
+    dias_pendentes DATE[];
+BEGIN
+    -- Uma atualizao por vez (duas poderiam recalcular o mesmo dia)
+    PERFORM pg_advisory_xact_lock(hashtext('atualizar_resumo_os'));
+
+    WITH retirados AS (
+        DELETE FROM os_resumo_pendente RETURNING dia
+    )
+    SELECT array_agg(dia) INTO dias_pendentes FROM retirados;
+
+    IF dias_pendentes IS NULL THEN
+        RETURN 0;
+    END IF;
+
+    DELETE FROM os_resumo_dia WHERE dia = ANY(dias_pendentes);
+
+    INSERT INTO os_resumo_dia (
+        dia, usuario_id, criadas, valor_criadas, concluidas, receita, minutos_conclusao
+    )
+    SELECT
+        movimentos.dia,
+        movimentos.usuario_id,
+        SUM(movimentos.criadas),
+        SUM(movimentos.valor_criadas),
+        SUM(movimentos.concluidas),
+        SUM(movimentos.receita),
+        COALESCE(array_agg(movimentos.minutos) FILTER (WHERE movimentos.minutos IS NOT NULL), '{}')
+    FROM (
+        -- OS abertas nos dias (ndice idx_os_data)
+        SELECT
+            d.dia, os.usuario_id,
+            1 AS criadas, COALESCE(os.valor_estimado, 0) AS valor_criadas,
+            0 AS concluidas, 0 AS receita, NULL::INTEGER AS minutos
+        FROM unnest(dias_pendentes) AS d(dia)
+        INNER JOIN ordens_servico os ON os.criado_em >= d.dia AND os.criado_em < d.dia + 1
+        UNION ALL
+        -- OS concludas nos dias (ndice idx_os_concluido)
+        SELECT
+            d.dia, os.usuario_id,
+            0, 0,
+            1, COALESCE(os.valor_estimado, 0),
+            (EXTRACT(EPOCH FROM os.concluido_em - os.criado_em) / 60)::INTEGER
+        FROM unnest(dias_pendentes) AS d(dia)
+        INNER JOIN ordens_servico os ON os.concluido_em >= d.dia AND os.concluido_em < d.dia + 1
+        WHERE os.status = 'concluida'
+    ) AS movimentos
+    GROUP BY movimentos.dia, movimentos.usuario_id;
+
+    RETURN array_length(dias_pendentes, 1);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Carga inicial: todos os dias com movimento
+INSERT INTO os_resumo_pendente (dia)
+SELECT criado_em::date FROM ordens_servico
+UNION
+SELECT concluido_em::date FROM ordens_servico WHERE concluido_em IS NOT NULL
+ON CONFLICT DO NOTHING;
+
+SELECT atualizar_resumo_os() AS dias_calculados;
+
+COMMIT;
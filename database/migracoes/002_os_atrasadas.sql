@@ -0,0 +1,15 @@
+-- ============================================================================
+-- MIGRAO 002: ndice das OS atrasadas
+-- Para bancos criados antes desta verso do schema.sql (pode ser executada
+-- mais de uma vez). Execute: psql -d gf_informatica -f 002_os_atrasadas.sql
+--
+-- CONCURRENTLY no bloqueia a gravao de OS durante a criao do ndice
+-- (por isso no roda dentro de BEGIN/COMMIT).
+-- ============================================================================
+
+-- OS em aberto por prazo (verificao de atrasadas): ndice parcial, s com
+-- as OS abertas e em andamento, pequeno qualquer que seja o histrico
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_os_prazo_em_aberto ON ordens_servico(prazo_previsto)
+    WHERE status IN ('aberta', 'em_andamento');
+
+ANALYZE ordens_servico;
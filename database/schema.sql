@@ -7,6 +7,10 @@
 -- ============================================================================
 
 -- Remover tabelas existentes (cuidado em produo!)
+DROP TABLE IF EXISTS os_resumo_dia;
+DROP TABLE IF EXISTS os_resumo_pendente;
+DROP VIEW IF EXISTS ordens_servico_todas;
+DROP TABLE IF EXISTS ordens_servico_arquivo;
 DROP TABLE IF EXISTS ordens_servico CASCADE;
 DROP TABLE IF EXISTS clientes CASCADE;
 DROP TABLE IF EXISTS usuarios CASCADE;
@@ -98,6 +102,11 @@ CREATE INDEX idx_os_cliente ON ordens_servico(cliente_id);
 CREATE INDEX idx_os_status ON ordens_servico(status);
 CREATE INDEX idx_os_data ON ordens_servico(criado_em);
 
+-- OS em aberto por prazo (verificao de atrasadas): ndice parcial, s com
+-- as OS abertas e em andamento, pequeno qualquer que seja o histrico
+CREATE INDEX idx_os_prazo_em_aberto ON ordens_servico(prazo_previsto)
+    WHERE status IN ('aberta', 'em_andamento');
+
 -- ============================================================================
 -- FUNO: Gerar nmero da OS automaticamente
 -- Gera o prximo nmero sequencial no formato OS0001, OS0002, etc.
@@ -146,6 +155,225 @@ CREATE TRIGGER trigger_atualizar_os
     FOR EACH ROW
     EXECUTE FUNCTION atualizar_timestamp();
 
+-- ============================================================================
+-- RESUMO DIRIO DAS OS (relatrios gerenciais e painel)
+-- Uma linha por dia e usurio: OS abertas, OS concludas, receita e tempos de
+-- concluso. Os relatrios leem s o resumo, nunca a tabela inteira de OS.
+--
+-- As alteraes em ordens_servico marcam os dias afetados em
+-- os_resumo_pendente; atualizar_resumo_os() recalcula apenas esses dias.
+-- ============================================================================
+CREATE TABLE os_resumo_dia (
+    dia DATE NOT NULL,
+    usuario_id INTEGER NOT NULL,
+    criadas INTEGER NOT NULL DEFAULT 0,  -- OS abertas no dia
+    valor_criadas DECIMAL(12, 2) NOT NULL DEFAULT 0,  -- Soma do valor estimado das OS abertas
+    concluidas INTEGER NOT NULL DEFAULT 0,  -- OS concludas no dia
+    receita DECIMAL(12, 2) NOT NULL DEFAULT 0,  -- Soma do valor estimado das OS concludas
+    minutos_conclusao INTEGER[] NOT NULL DEFAULT '{}',  -- Abertura at concluso, por OS concluda
+    PRIMARY KEY (dia, usuario_id)
+);
+
+CREATE TABLE os_resumo_pendente (
+    dia DATE PRIMARY KEY
+);
+
+-- Busca das OS concludas em um dia (reclculo do resumo)
+CREATE INDEX idx_os_concluido ON ordens_servico(concluido_em);
+
+-- Marca os dias afetados por um comando (trigger por comando, com as
+-- tabelas de transio: um COPY de milhes de linhas marca cada dia uma vez)
+CREATE OR REPLACE FUNCTION marcar_resumo_os_pendente()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- OS movidas para o arquivo (arquivar_os): o resumo no muda
+    IF current_setting('gf.arquivando', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+
+    -- DO UPDATE (e no DO NOTHING) trava o dia j pendente at o commit:
+    -- atualizar_resumo_os() espera esta transao antes de retir-lo e
+    -- recalcula o dia j enxergando estas alteraes
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO os_resumo_pendente (dia)
+        SELECT criado_em::date FROM novas
+        UNION
+        SELECT concluido_em::date FROM novas WHERE concluido_em IS NOT NULL
+        ON CONFLICT (dia) DO UPDATE SET dia = EXCLUDED.dia;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO os_resumo_pendente (dia)
+        SELECT criado_em::date FROM antigas
+        UNION
+        SELECT concluido_em::date FROM antigas WHERE concluido_em IS NOT NULL
+        ON CONFLICT (dia) DO UPDATE SET dia = EXCLUDED.dia;
+    ELSE
+        -- S interessa o que muda o resumo (observaes, por exemplo, no)
+        INSERT INTO os_resumo_pendente (dia)
+        SELECT DISTINCT dias.dia
+        FROM antigas a
+        INNER JOIN novas n ON n.id = a.id
+        CROSS JOIN LATERAL (VALUES
+            (a.criado_em::date), (n.criado_em::date),
+            (a.concluido_em::date), (n.concluido_em::date)
+        ) AS dias(dia)
+        WHERE dias.dia IS NOT NULL
+          AND (a.criado_em, a.concluido_em, a.valor_estimado, a.usuario_id, a.status)
+              IS DISTINCT FROM (n.criado_em, n.concluido_em, n.valor_estimado, n.usuario_id, n.status)
+        ON CONFLICT (dia) DO UPDATE SET dia = EXCLUDED.dia;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trigger_resumo_os_insert
+    AFTER INSERT ON ordens_servico
+    REFERENCING NEW TABLE AS novas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION marcar_resumo_os_pendente();
+
+CREATE TRIGGER trigger_resumo_os_update
+    AFTER UPDATE ON ordens_servico
+    REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION marcar_resumo_os_pendente();
+
+CREATE TRIGGER trigger_resumo_os_delete
+    AFTER DELETE ON ordens_servico
+    REFERENCING OLD TABLE AS antigas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION marcar_resumo_os_pendente();
+
+-- Recalcula os dias pendentes; retorna quantos dias foram recalculados
+CREATE OR REPLACE FUNCTION atualizar_resumo_os()
+RETURNS INTEGER AS $$
+DECLARE
+    dias_pendentes DATE[];
+BEGIN
+    -- Uma atualizao por vez (duas poderiam recalcular o mesmo dia)
+    PERFORM pg_advisory_xact_lock(hashtext('atualizar_resumo_os'));
+
+    WITH retirados AS (
+        DELETE FROM os_resumo_pendente RETURNING dia
+    )
+    SELECT array_agg(dia) INTO dias_pendentes FROM retirados;
+
+    IF dias_pendentes IS NULL THEN
+        RETURN 0;
+    END IF;
+
+    DELETE FROM os_resumo_dia WHERE dia = ANY(dias_pendentes);
+
+    INSERT INTO os_resumo_dia (
+        dia, usuario_id, criadas, valor_criadas, concluidas, receita, minutos_conclusao
+    )
+    SELECT
+        movimentos.dia,
+        movimentos.usuario_id,
+        SUM(movimentos.criadas),
+        SUM(movimentos.valor_criadas),
+        SUM(movimentos.concluidas),
+        SUM(movimentos.receita),
+        COALESCE(array_agg(movimentos.minutos) FILTER (WHERE movimentos.minutos IS NOT NULL), '{}')
+    FROM (
+        -- OS abertas nos dias, ativas e arquivadas (ndices idx_os_data e
+        -- idx_os_arquivo_data)
+        SELECT
+            d.dia, os.usuario_id,
+            1 AS criadas, COALESCE(os.valor_estimado, 0) AS valor_criadas,
+            0 AS concluidas, 0 AS receita, NULL::INTEGER AS minutos
+        FROM unnest(dias_pendentes) AS d(dia)
+        INNER JOIN ordens_servico_todas os ON os.criado_em >= d.dia AND os.criado_em < d.dia + 1
+        UNION ALL
+        -- OS concludas nos dias (ndices idx_os_concluido e idx_os_arquivo_concluido)
+        SELECT
+            d.dia, os.usuario_id,
+            0, 0,
+            1, COALESCE(os.valor_estimado, 0),
+            (EXTRACT(EPOCH FROM os.concluido_em - os.criado_em) / 60)::INTEGER
+        FROM unnest(dias_pendentes) AS d(dia)
+        INNER JOIN ordens_servico_todas os ON os.concluido_em >= d.dia AND os.concluido_em < d.dia + 1
+        WHERE os.status = 'concluida'
+    ) AS movimentos
+    GROUP BY movimentos.dia, movimentos.usuario_id;
+
+    RETURN array_length(dias_pendentes, 1);
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- ARQUIVO DAS OS ENCERRADAS
+-- OS concludas e canceladas sem alterao h N meses saem de ordens_servico
+-- para ordens_servico_arquivo (arquivar_os.py): listagens, estatsticas e o
+-- painel leem s as OS ativas. Buscas por nmero, por cliente e por perodo
+-- usam ordens_servico_todas, que junta as duas tabelas.
+-- ============================================================================
+CREATE TABLE ordens_servico_arquivo (
+    LIKE ordens_servico INCLUDING CONSTRAINTS,
+    PRIMARY KEY (id),
+    UNIQUE (numero_os),
+    FOREIGN KEY (cliente_id) REFERENCES clientes(id) ON DELETE RESTRICT,
+    FOREIGN KEY (usuario_id) REFERENCES usuarios(id) ON DELETE RESTRICT
+);
+
+-- Buscas que chegam ao arquivo (cliente, perodo e reclculo do resumo)
+CREATE INDEX idx_os_arquivo_cliente ON ordens_servico_arquivo(cliente_id);
+CREATE INDEX idx_os_arquivo_data ON ordens_servico_arquivo(criado_em);
+CREATE INDEX idx_os_arquivo_concluido ON ordens_servico_arquivo(concluido_em);
+
+-- OS ativas e arquivadas
+CREATE VIEW ordens_servico_todas AS
+    SELECT os.*, FALSE AS arquivada FROM ordens_servico os
+    UNION ALL
+    SELECT a.*, TRUE AS arquivada FROM ordens_servico_arquivo a;
+
+-- Move para o arquivo um lote de OS encerradas; retorna quantas foram movidas
+-- (arquivar_os.py chama em lotes, um por transao, at retornar 0)
+CREATE OR REPLACE FUNCTION arquivar_os(meses INTEGER, lote INTEGER DEFAULT 5000)
+RETURNS INTEGER AS $$
+DECLARE
+    movidas INTEGER;
+BEGIN
+    -- Mover no altera o resumo dirio: os triggers no marcam os dias
+    PERFORM set_config('gf.arquivando', 'on', true);
+
+    WITH retiradas AS (
+        DELETE FROM ordens_servico
+        WHERE id IN (
+            SELECT id FROM ordens_servico
+            WHERE status IN ('concluida', 'cancelada')
+              AND atualizado_em < CURRENT_TIMESTAMP - make_interval(months => meses)
+            ORDER BY id
+            LIMIT lote
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING *
+    )
+    INSERT INTO ordens_servico_arquivo SELECT * FROM retiradas;
+    GET DIAGNOSTICS movidas = ROW_COUNT;
+
+    PERFORM set_config('gf.arquivando', 'off', true);
+    RETURN movidas;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Correes em OS arquivadas tambm atualizam o timestamp e o resumo
+CREATE TRIGGER trigger_atualizar_os_arquivo
+    BEFORE UPDATE ON ordens_servico_arquivo
+    FOR EACH ROW
+    EXECUTE FUNCTION atualizar_timestamp();
+
+CREATE TRIGGER trigger_resumo_os_arquivo_update
+    AFTER UPDATE ON ordens_servico_arquivo
+    REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION marcar_resumo_os_pendente();
+
+CREATE TRIGGER trigger_resumo_os_arquivo_delete
+    AFTER DELETE ON ordens_servico_arquivo
+    REFERENCING OLD TABLE AS antigas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION marcar_resumo_os_pendente();
+
 -- ============================================================================
 -- INSERO DO USURIO ADMINISTRADOR INICIAL
 -- Usurio: admin / Senha: admin (hash bcrypt)
@@ -175,6 +403,8 @@ COMMENT ON COLUMN ordens_servico.numero_os IS 'N
 COMMENT ON COLUMN ordens_servico.status IS 'Status: aberta, em_andamento, concluida, cancelada';
 COMMENT ON COLUMN ordens_servico.valor_estimado IS 'Valor estimado do servio em reais';
 COMMENT ON COLUMN ordens_servico.prazo_previsto IS 'Data prevista para concluso do servio';
+COMMENT ON TABLE os_resumo_dia IS 'Resumo dirio das OS por usurio (atualizar_resumo_os)';
+COMMENT ON TABLE ordens_servico_arquivo IS 'OS concludas e canceladas arquivadas (arquivar_os)';
 
 -- ============================================================================
 -- FIM DO SCHEMA
@@ -15,9 +15,9 @@ import os
 # Carrega variáveis de ambiente
 load_dotenv()
 
-# Importações locais
+# Importações locais (só o necessário para a tela de login; o restante
+# do sistema é importado depois da autenticação)
 from ui.login_window import LoginWindow
-from ui.main_window import MainWindow
 from utils.logger import setup_logger
 
 def main():
@@ -44,6 +44,11 @@ def main():
     root = tk.Tk()
     root.withdraw()  # Esconde a janela principal inicialmente
     
+    # Registra no log os travamentos da interface e o handler responsável
+    from utils.watchdog import TkStallDetector
+    watchdog = TkStallDetector(root)
+    watchdog.iniciar()
+    
     # Exibe janela de login
     login_window = LoginWindow(root, on_login_success=lambda usuario: abrir_sistema(root, usuario))
     usuario = login_window.show()
@@ -53,6 +58,12 @@ def main():
         root.mainloop()
     else:
         logger.info("Login cancelado pelo usuário")
+    
+    watchdog.parar()
+    
+    # Fecha as conexões mantidas abertas pelo pool
+    from database.connection import db
+    db.fechar_pool()
 
 def abrir_sistema(root, usuario):
     """
@@ -62,6 +73,8 @@ def abrir_sistema(root, usuario):
         root: Janela root do tkinter
         usuario: Dados do usuário autenticado
     """
+    from ui.main_window import MainWindow
+    
     # Mostra a janela principal
     root.deiconify()
     
@@ -0,0 +1,347 @@
+"""
+Script que sugere índices para a carga real do sistema
+Lê as queries mais custosas do pg_stat_statements (quando a extensão está
+disponível) e os planos das queries lentas (logs/explain_*.jsonl, gerados com
+DB_AUTO_EXPLAIN_MS), extrai os filtros e o ORDER BY usados em ordens_servico,
+clientes e usuarios e compara com os índices existentes.
+Execute: python relatorio_indices.py [--dias 7] [--top 15]
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+
+TABELAS = ('ordens_servico', 'clientes', 'usuarios')
+
+# Palavras que podem aparecer logo após o nome da tabela (não são apelidos)
+PALAVRAS_RESERVADAS = {
+    'where', 'inner', 'left', 'right', 'join', 'on', 'order', 'group', 'limit',
+    'set', 'returning', 'values', 'using', 'as', 'for', 'offset',
+}
+
+OPERADORES_IGUALDADE = ('=', 'IN')
+
+RE_TABELA = re.compile(
+    r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(" + '|'.join(TABELAS) + r")\b(?:\s+(?:AS\s+)?(\w+))?",
+    re.IGNORECASE
+)
+RE_LIKE = re.compile(
+    r"(?:LOWER\(\s*)?(?:(\w+)\.)?(\w+)\s*\)?\s+(?:NOT\s+)?(I?LIKE)\b",
+    re.IGNORECASE
+)
+RE_COMPARACAO = re.compile(
+    r"(?<![\w.])(?:(\w+)\.)?(\w+)\s*(>=|<=|=|>|<|\bIN\b|\bBETWEEN\b)",
+    re.IGNORECASE
+)
+RE_ORDEM = re.compile(r"^(?:(\w+)\.)?(\w+)(?:\s+(ASC|DESC))?$", re.IGNORECASE)
+
+def carregar_stat_statements(db, limite=200):
+    """
+    Queries mais custosas do banco atual no pg_stat_statements
+
+    Args:
+        db: DatabaseConnection
+        limite: Quantidade de queries lidas
+
+    Returns:
+        Lista de dicionários (query, calls, total_ms, media_ms) ou None se
+        a extensão não estiver disponível
+    """
+    import psycopg
+
+    existe = db.execute_query("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'")
+    if not existe:
+        return None
+
+    # total_exec_time no PostgreSQL 13+, total_time nas versões anteriores
+    for total, media in (('total_exec_time', 'mean_exec_time'), ('total_time', 'mean_time')):
+        try:
+            return db.execute_query(f"""
+                SELECT query, calls, {total} AS total_ms, {media} AS media_ms
+                FROM pg_stat_statements
+                WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+                ORDER BY {total} DESC
+                LIMIT %s
+            """, (limite,))
+        except psycopg.errors.UndefinedColumn:
+            continue
+        except psycopg.Error as e:
+            # Extensão criada mas fora do shared_preload_libraries
+            print(f"⚠️  pg_stat_statements indisponível: {str(e).strip()}")
+            return None
+    return None
+
+def carregar_planos(pasta, dias):
+    """
+    Planos gravados pelo EXPLAIN automático nos últimos dias
+
+    Args:
+        pasta: Pasta dos arquivos explain_AAAAMMDD.jsonl
+        dias: Quantidade de dias lidos (incluindo hoje)
+
+    Returns:
+        Lista de registros
+    """
+    registros = []
+    for deslocamento in range(dias):
+        dia = date.today() - timedelta(days=deslocamento)
+        arquivo = pasta / f"explain_{dia.strftime('%Y%m%d')}.jsonl"
+        if not arquivo.exists():
+            continue
+        with open(arquivo, encoding='utf-8') as f:
+            for linha in f:
+                try:
+                    registros.append(json.loads(linha))
+                except json.JSONDecodeError:
+                    continue
+    return registros
+
+def indices_existentes(db):
+    """
+    Índices das tabelas do sistema
+
+    Returns:
+        Dicionário tabela -> lista de (nome, método, colunas, definição)
+    """
+    linhas = db.execute_query("""
+        SELECT
+            t.relname AS tabela,
+            i.relname AS indice,
+            am.amname AS metodo,
+            pg_get_indexdef(ix.indexrelid) AS definicao,
+            ARRAY(
+                SELECT pg_get_indexdef(ix.indexrelid, k + 1, true)
+                FROM generate_subscripts(ix.indkey, 1) AS k
+                ORDER BY k
+            ) AS colunas
+        FROM pg_index ix
+        INNER JOIN pg_class t ON t.oid = ix.indrelid
+        INNER JOIN pg_class i ON i.oid = ix.indexrelid
+        INNER JOIN pg_am am ON am.oid = i.relam
+        INNER JOIN pg_namespace n ON n.oid = t.relnamespace
+        WHERE n.nspname = 'public' AND t.relname = ANY(%s) AND ix.indpred IS NULL
+    """, (list(TABELAS),))
+
+    indices = defaultdict(list)
+    for linha in linhas:
+        colunas = [coluna.strip('"').lower() for coluna in linha['colunas']]
+        indices[linha['tabela']].append((linha['indice'], linha['metodo'], colunas, linha['definicao']))
+    return indices
+
+def _trecho(sql, inicio, fins):
+    """Trecho do SQL entre a palavra inicio e a primeira das palavras fins"""
+    achado = re.search(rf"\b{inicio}\b", sql, re.IGNORECASE)
+    if not achado:
+        return ''
+    resto = sql[achado.end():]
+    corte = re.search(r"\b(?:" + '|'.join(fins) + r")\b", resto, re.IGNORECASE)
+    return resto[:corte.start()] if corte else resto
+
+def analisar_sql(sql):
+    """
+    Extrai filtros e ordenação por tabela de uma query
+
+    Args:
+        sql: Texto da query (com %s ou $1 nos parâmetros)
+
+    Returns:
+        Dicionário tabela -> {'igualdade': [...], 'faixa': [...], 'like': [...], 'ordem': [...]}
+    """
+    apelidos = {}
+    for tabela, apelido in RE_TABELA.findall(sql):
+        tabela = tabela.lower()
+        apelidos[tabela] = tabela
+        if apelido and apelido.lower() not in PALAVRAS_RESERVADAS:
+            apelidos[apelido.lower()] = tabela
+
+    tabelas = set(apelidos.values())
+    if not tabelas:
+        return {}
+
+    def resolver(apelido):
+        if apelido:
+            return apelidos.get(apelido.lower())
+        # Coluna sem apelido: só dá para saber a tabela se houver uma só
+        return next(iter(tabelas)) if len(tabelas) == 1 else None
+
+    uso = defaultdict(lambda: {'igualdade': [], 'faixa': [], 'like': [], 'ordem': []})
+
+    def anotar(tabela, tipo, coluna):
+        if tabela and coluna not in uso[tabela][tipo]:
+            uso[tabela][tipo].append(coluna)
+
+    where = _trecho(sql, 'WHERE', ('ORDER', 'GROUP', 'LIMIT', 'RETURNING', 'OFFSET'))
+    for apelido, coluna, _ in RE_LIKE.findall(where):
+        anotar(resolver(apelido), 'like', coluna.lower())
+    for apelido, coluna, operador in RE_COMPARACAO.findall(where):
+        if coluna.lower() in ('lower', 'upper', 'and', 'or', 'not'):
+            continue
+        operador = operador.upper()
+        tipo = 'igualdade' if operador in OPERADORES_IGUALDADE else 'faixa'
+        anotar(resolver(apelido), tipo, coluna.lower())
+
+    ordem = _trecho(sql, 'ORDER BY', ('LIMIT', 'OFFSET', 'FOR', 'RETURNING'))
+    for item in ordem.split(','):
+        achado = RE_ORDEM.match(item.strip())
+        if achado:
+            apelido, coluna, direcao = achado.groups()
+            tabela = resolver(apelido)
+            if tabela:
+                sufixo = ' DESC' if direcao and direcao.upper() == 'DESC' else ''
+                anotar(tabela, 'ordem', coluna.lower() + sufixo)
+
+    return dict(uso)
+
+def candidatos(uso):
+    """
+    Índices que atenderiam os filtros de uma tabela
+
+    Igualdade primeiro, depois a ordenação (ou a faixa); LIKE com curinga
+    no início só é atendido por índice de trigramas (pg_trgm).
+
+    Returns:
+        Lista de (método, colunas)
+    """
+    resultado = []
+    igualdade = [coluna for coluna in uso['igualdade'] if coluna != 'id']
+    if igualdade or uso['faixa'] or uso['ordem']:
+        colunas = list(igualdade)
+        if uso['ordem']:
+            colunas += [coluna for coluna in uso['ordem'] if coluna.split()[0] not in colunas]
+        elif uso['faixa']:
+            colunas.append(uso['faixa'][0])
+        # O id no fim só desempata a ordenação (a chave primária já o cobre)
+        while len(colunas) > 1 and colunas[-1].split()[0] == 'id':
+            colunas.pop()
+        if colunas and colunas != ['id'] and colunas[0].split()[0] != 'id':
+            resultado.append(('btree', colunas))
+
+    for coluna in uso['like']:
+        resultado.append(('gin', [f"lower({coluna}) gin_trgm_ops"]))
+    return resultado
+
+def coberto(metodo, colunas, existentes):
+    """Verifica se algum índice existente começa pelas mesmas colunas"""
+    for _, metodo_existente, colunas_existentes, definicao in existentes:
+        if metodo == 'gin':
+            coluna = re.search(r"lower\((\w+)\)", colunas[0]).group(1)
+            if metodo_existente == 'gin' and 'gin_trgm_ops' in definicao and coluna in definicao:
+                return True
+            continue
+        if metodo_existente != 'btree':
+            continue
+        # A direção não importa: o btree pode ser lido de trás para frente
+        nomes = [coluna.split()[0] for coluna in colunas]
+        if [coluna.split()[0] for coluna in colunas_existentes[:len(nomes)]] == nomes:
+            return True
+    return False
+
+def evidencias_do_plano(plano, evidencias):
+    """Leituras sequenciais com filtro e ordenações encontradas no plano"""
+    tipo = plano.get('Node Type')
+    tabela = plano.get('Relation Name')
+    if tipo == 'Seq Scan' and tabela in TABELAS and plano.get('Filter'):
+        removidas = plano.get('Rows Removed by Filter')
+        detalhe = f", {removidas} linhas descartadas" if removidas is not None else ''
+        evidencias[tabela].add(f"Seq Scan com filtro {plano['Filter']}{detalhe}")
+    if tipo == 'Sort' and plano.get('Sort Method', '').startswith('external'):
+        evidencias['ordenacao'].add(f"Ordenação em disco: {', '.join(plano.get('Sort Key', []))}")
+    for filho in plano.get('Plans', []):
+        evidencias_do_plano(filho, evidencias)
+
+def main():
+    parser = argparse.ArgumentParser(description="Sugestão de índices para a carga real")
+    parser.add_argument('--dias', type=int, default=7, help="Dias de logs/explain_*.jsonl lidos")
+    parser.add_argument('--pasta', type=Path, default=Path('logs'), help="Pasta dos planos capturados")
+    parser.add_argument('--top', type=int, default=15, help="Sugestões exibidas")
+    args = parser.parse_args()
+
+    from database.connection import db
+
+    print("=" * 60)
+    print("📇 RELATÓRIO DE ÍNDICES - GF INFORMÁTICA")
+    print("=" * 60)
+
+    # Carga: (sql, execuções, tempo total em ms, origem)
+    carga = []
+
+    print("\n[1/3] Lendo a carga de trabalho...")
+    if not db.test_connection():
+        print("❌ Falha na conexão! Verifique o arquivo .env")
+        sys.exit(1)
+
+    estatisticas = carregar_stat_statements(db)
+    if estatisticas is None:
+        print("⚠️  pg_stat_statements não disponível "
+              "(shared_preload_libraries = 'pg_stat_statements' e CREATE EXTENSION pg_stat_statements)")
+    else:
+        for linha in estatisticas:
+            carga.append((linha['query'], linha['calls'], float(linha['total_ms']), 'pg_stat_statements'))
+        print(f"✅ {len(estatisticas)} queries do pg_stat_statements")
+
+    planos = carregar_planos(args.pasta, args.dias)
+    evidencias = defaultdict(set)
+    for registro in planos:
+        carga.append((registro['sql'], 1, registro['duracao_ms'], 'explain'))
+        plano = registro.get('plano')
+        if plano:
+            evidencias_do_plano(plano[0]['Plan'], evidencias)
+    print(f"✅ {len(planos)} planos de queries lentas ({args.pasta}/explain_*.jsonl, {args.dias} dias)")
+
+    if not carga:
+        print("\n❌ Sem dados de carga. Ative o pg_stat_statements ou DB_AUTO_EXPLAIN_MS no .env")
+        sys.exit(1)
+
+    print("\n[2/3] Comparando com os índices existentes...")
+    existentes = indices_existentes(db)
+    print(f"✅ {sum(len(lista) for lista in existentes.values())} índices em {', '.join(TABELAS)}")
+
+    sugestoes = {}
+    for sql, execucoes, total_ms, origem in carga:
+        for tabela, uso in analisar_sql(sql).items():
+            for metodo, colunas in candidatos(uso):
+                if coberto(metodo, colunas, existentes.get(tabela, [])):
+                    continue
+                chave = (tabela, metodo, tuple(colunas))
+                sugestao = sugestoes.setdefault(chave, {'execucoes': 0, 'total_ms': 0.0, 'queries': []})
+                sugestao['execucoes'] += execucoes
+                sugestao['total_ms'] += total_ms
+                resumo = ' '.join(sql.split())[:110]
+                if resumo not in sugestao['queries']:
+                    sugestao['queries'].append(resumo)
+
+    print("\n[3/3] Sugestões (maior tempo acumulado primeiro)...\n")
+    if not sugestoes:
+        print("✅ Os filtros e ordenações da carga já são atendidos por índices")
+
+    ordenadas = sorted(sugestoes.items(), key=lambda item: item[1]['total_ms'], reverse=True)
+    precisa_trgm = False
+    for (tabela, metodo, colunas), sugestao in ordenadas[:args.top]:
+        nome = 'idx_' + tabela.replace('ordens_servico', 'os') + '_' + '_'.join(
+            re.sub(r"\W+", '_', coluna.replace(' gin_trgm_ops', '').replace(' DESC', '')).strip('_')
+            for coluna in colunas
+        ) + ('_trgm' if metodo == 'gin' else '')
+        metodo_sql = ' USING gin' if metodo == 'gin' else ''
+        precisa_trgm = precisa_trgm or metodo == 'gin'
+
+        print(f"   CREATE INDEX CONCURRENTLY {nome} ON {tabela}{metodo_sql} ({', '.join(colunas)});")
+        print(f"      {sugestao['execucoes']} execuções, {sugestao['total_ms'] / 1000:.1f} s no total")
+        for query in sugestao['queries'][:2]:
+            print(f"      - {query}")
+        for evidencia in sorted(evidencias.get(tabela, ()))[:2]:
+            print(f"      ⚠️  {evidencia}")
+        print()
+
+    if precisa_trgm:
+        print("   Índices gin_trgm_ops (LIKE '%termo%') exigem: CREATE EXTENSION IF NOT EXISTS pg_trgm;\n")
+    for evidencia in sorted(evidencias.get('ordenacao', ()))[:3]:
+        print(f"   ⚠️  {evidencia} (considere work_mem maior ou índice na ordenação)")
+
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
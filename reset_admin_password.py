@@ -3,14 +3,12 @@ Script para resetar a senha do usuário admin
 Execute: python reset_admin_password.py
 """
 
-import bcrypt
 from database.connection import db
+from services.auth_service import AuthService
 
 def gerar_hash(senha):
-    """Gera hash bcrypt da senha"""
-    salt = bcrypt.gensalt()
-    password_hash = bcrypt.hashpw(senha.encode('utf-8'), salt)
-    return password_hash.decode('utf-8')
+    """Gera hash bcrypt da senha (com o custo de BCRYPT_ROUNDS)"""
+    return AuthService._gerar_hash_senha(senha)
 
 def main():
     print("=" * 60)
@@ -19,7 +17,7 @@ def main():
     
     nova_senha = "admin"
     
-    print(f"\n[1/3] Gerando hash bcrypt para senha: '{nova_senha}'...")
+    print(f"\n[1/3] Gerando hash bcrypt (custo {AuthService.CUSTO_BCRYPT}) para senha: '{nova_senha}'...")
     hash_senha = gerar_hash(nova_senha)
     print(f"✅ Hash gerado: {hash_senha[:50]}...")
     
@@ -3,12 +3,30 @@ Módulo de serviços
 Contém toda a lógica de negócio da aplicação
 """
 
-from .cliente_service import ClienteService, cliente_service
-from .os_service import OSService, os_service
-from .auth_service import AuthService, auth_service
+from utils.importacao import exportar_sob_demanda
+
+# Os submódulos só são importados quando o nome é usado: importar o pacote
+# não carrega todas as janelas/serviços (e suas dependências)
+exportar_sob_demanda(__name__, {
+    'ClienteService': '.cliente_service',
+    'cliente_service': '.cliente_service',
+    'OSService': '.os_service',
+    'os_service': '.os_service',
+    'AuthService': '.auth_service',
+    'auth_service': '.auth_service',
+    'PreloadService': '.preload_service',
+    'preload_service': '.preload_service',
+    'AnalyticsService': '.analytics_service',
+    'analytics_service': '.analytics_service',
+    'PrazoService': '.prazo_service',
+    'prazo_service': '.prazo_service',
+})
 
 __all__ = [
     'ClienteService', 'cliente_service',
     'OSService', 'os_service',
-    'AuthService', 'auth_service'
+    'AuthService', 'auth_service',
+    'PreloadService', 'preload_service',
+    'AnalyticsService', 'analytics_service',
+    'PrazoService', 'prazo_service'
 ]
\ No newline at end of file
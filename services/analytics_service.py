@@ -0,0 +1,245 @@
+"""
+Serviço de indicadores gerenciais
+Receita, tempo de conclusão e produtividade por usuário, lidos do resumo
+diário (os_resumo_dia) em vez da tabela de OS
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, List
+from database.connection import db
+from utils.event_log import medir_operacao
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsService:
+    """
+    Indicadores a partir do resumo diário das OS
+
+    Cada consulta recalcula antes os dias marcados como pendentes pelas
+    alterações em ordens_servico (atualizar_resumo_os no banco).
+    """
+
+    @staticmethod
+    def atualizar_resumo(esperar: bool = True) -> int:
+        """
+        Recalcula os dias do resumo alterados desde a última atualização
+
+        Sem dias pendentes nada é gravado nem travado: atualizar_resumo_os()
+        só é chamada quando os_resumo_pendente tem alguma linha.
+
+        Args:
+            esperar: Se False e outra estação já estiver atualizando o resumo,
+                não espera por ela (o painel mostra os números da última
+                atualização e tenta de novo no próximo ciclo)
+
+        Returns:
+            Quantidade de dias recalculados
+        """
+        try:
+            trava = "" if esperar else "AND pg_try_advisory_xact_lock(hashtext('atualizar_resumo_os'))"
+            results = db.execute_query(f"""
+                SELECT CASE
+                    WHEN EXISTS (SELECT 1 FROM os_resumo_pendente) {trava}
+                    THEN atualizar_resumo_os()
+                    ELSE 0
+                END AS dias
+            """)
+            dias = results[0]['dias'] if results else 0
+            if dias:
+                logger.info(f"Resumo diário das OS atualizado: {dias} dia(s)")
+            return dias
+
+        except Exception as e:
+            logger.error(f"Erro ao atualizar resumo diário das OS: {e}")
+            raise
+
+    @staticmethod
+    @medir_operacao()
+    def receita_diaria(inicio: date, fim: date, esperar: bool = True) -> List[Dict[str, Any]]:
+        """
+        Movimento de cada dia do período (dias sem movimento com zero)
+
+        Args:
+            inicio: Primeiro dia
+            fim: Último dia (inclusive)
+            esperar: Repassado a atualizar_resumo
+
+        Returns:
+            Uma linha por dia: dia, criadas, valor_criadas, concluidas, receita
+        """
+        try:
+            AnalyticsService.atualizar_resumo(esperar)
+            query = """
+                SELECT
+                    dias.dia::date AS dia,
+                    COALESCE(SUM(r.criadas), 0) AS criadas,
+                    COALESCE(SUM(r.valor_criadas), 0) AS valor_criadas,
+                    COALESCE(SUM(r.concluidas), 0) AS concluidas,
+                    COALESCE(SUM(r.receita), 0) AS receita
+                FROM generate_series(%s::date, %s::date, interval '1 day') AS dias(dia)
+                LEFT JOIN os_resumo_dia r ON r.dia = dias.dia::date
+                GROUP BY dias.dia
+                ORDER BY dias.dia
+            """
+            return db.execute_query(query, (inicio, fim)) or []
+
+        except Exception as e:
+            logger.error(f"Erro ao calcular receita diária: {e}")
+            raise
+
+    @staticmethod
+    @medir_operacao()
+    def receita_mensal(inicio: date, fim: date) -> List[Dict[str, Any]]:
+        """
+        Movimento de cada mês do período
+
+        Args:
+            inicio: Primeiro dia
+            fim: Último dia (inclusive)
+
+        Returns:
+            Uma linha por mês com movimento: mes (primeiro dia), criadas,
+            valor_criadas, concluidas, receita
+        """
+        try:
+            AnalyticsService.atualizar_resumo()
+            query = """
+                SELECT
+                    date_trunc('month', dia)::date AS mes,
+                    SUM(criadas) AS criadas,
+                    SUM(valor_criadas) AS valor_criadas,
+                    SUM(concluidas) AS concluidas,
+                    SUM(receita) AS receita
+                FROM os_resumo_dia
+                WHERE dia BETWEEN %s AND %s
+                GROUP BY 1
+                ORDER BY 1
+            """
+            return db.execute_query(query, (inicio, fim)) or []
+
+        except Exception as e:
+            logger.error(f"Erro ao calcular receita mensal: {e}")
+            raise
+
+    @staticmethod
+    @medir_operacao()
+    def tempo_conclusao(inicio: date, fim: date) -> Dict[str, Any]:
+        """
+        Tempo entre abertura e conclusão das OS concluídas no período
+
+        Args:
+            inicio: Primeiro dia
+            fim: Último dia (inclusive)
+
+        Returns:
+            Dicionário com quantidade, media_horas, p50_horas, p90_horas e
+            p95_horas (None sem OS concluídas)
+        """
+        try:
+            AnalyticsService.atualizar_resumo()
+            query = """
+                SELECT
+                    COUNT(*) AS quantidade,
+                    AVG(minutos) / 60.0 AS media_horas,
+                    percentile_cont(0.50) WITHIN GROUP (ORDER BY minutos) / 60.0 AS p50_horas,
+                    percentile_cont(0.90) WITHIN GROUP (ORDER BY minutos) / 60.0 AS p90_horas,
+                    percentile_cont(0.95) WITHIN GROUP (ORDER BY minutos) / 60.0 AS p95_horas
+                FROM os_resumo_dia r, unnest(r.minutos_conclusao) AS minutos
+                WHERE r.dia BETWEEN %s AND %s
+            """
+            results = db.execute_query(query, (inicio, fim))
+            return results[0] if results else {}
+
+        except Exception as e:
+            logger.error(f"Erro ao calcular tempo de conclusão: {e}")
+            raise
+
+    @staticmethod
+    @medir_operacao()
+    def produtividade_usuarios(inicio: date, fim: date) -> List[Dict[str, Any]]:
+        """
+        OS abertas e concluídas, receita e tempo de conclusão por usuário
+
+        Args:
+            inicio: Primeiro dia
+            fim: Último dia (inclusive)
+
+        Returns:
+            Uma linha por usuário com movimento, maior receita primeiro
+        """
+        try:
+            AnalyticsService.atualizar_resumo()
+            query = """
+                SELECT
+                    u.id AS usuario_id,
+                    u.nome_completo AS usuario_nome,
+                    SUM(r.criadas) AS criadas,
+                    SUM(r.concluidas) AS concluidas,
+                    SUM(r.receita) AS receita,
+                    (
+                        SELECT percentile_cont(0.5) WITHIN GROUP (ORDER BY minutos) / 60.0
+                        FROM os_resumo_dia r2, unnest(r2.minutos_conclusao) AS minutos
+                        WHERE r2.usuario_id = u.id AND r2.dia BETWEEN %s AND %s
+                    ) AS p50_horas
+                FROM os_resumo_dia r
+                INNER JOIN usuarios u ON u.id = r.usuario_id
+                WHERE r.dia BETWEEN %s AND %s
+                GROUP BY u.id, u.nome_completo
+                ORDER BY receita DESC, concluidas DESC
+            """
+            return db.execute_query(query, (inicio, fim, inicio, fim)) or []
+
+        except Exception as e:
+            logger.error(f"Erro ao calcular produtividade por usuário: {e}")
+            raise
+
+    @staticmethod
+    @medir_operacao()
+    def painel(dias: int = 30) -> Dict[str, Any]:
+        """
+        Números do painel da tela inicial
+
+        As contagens leem apenas as OS em aberto (índice idx_os_status) e a
+        série de entradas vem do resumo diário: nada percorre a tabela inteira.
+
+        Args:
+            dias: Tamanho da série de entradas (terminando hoje)
+
+        Returns:
+            Dicionário com abertas, em_andamento, atrasadas, entradas_hoje e
+            serie (OS criadas por dia, do mais antigo para hoje)
+        """
+        try:
+            query = """
+                SELECT
+                    COUNT(*) FILTER (WHERE status = 'aberta') AS abertas,
+                    COUNT(*) FILTER (WHERE status = 'em_andamento') AS em_andamento,
+                    COUNT(*) FILTER (WHERE prazo_previsto < CURRENT_DATE) AS atrasadas
+                FROM ordens_servico
+                WHERE status IN ('aberta', 'em_andamento')
+            """
+            results = db.execute_query(query)
+            contagens = results[0] if results else {}
+
+            hoje = date.today()
+            # Atualizado a cada minuto em todas as estações: não fila atrás de
+            # outra estação que já está recalculando o resumo
+            serie = AnalyticsService.receita_diaria(hoje - timedelta(days=dias - 1), hoje, esperar=False)
+
+            return {
+                'abertas': contagens.get('abertas', 0),
+                'em_andamento': contagens.get('em_andamento', 0),
+                'atrasadas': contagens.get('atrasadas', 0),
+                'entradas_hoje': serie[-1]['criadas'] if serie else 0,
+                'serie': [linha['criadas'] for linha in serie],
+            }
+
+        except Exception as e:
+            logger.error(f"Erro ao montar painel: {e}")
+            raise
+
+
+# Instância global
+analytics_service = AnalyticsService()
@@ -3,10 +3,16 @@ Serviço de Autenticação
 Gerencia login e autenticação de usuários
 """
 
+import os
+import time
+import secrets
 import logging
+import threading
 import bcrypt
+from concurrent.futures import ThreadPoolExecutor, Future
 from typing import Optional, Dict, Any
 from database.connection import db
+from utils.event_log import medir_operacao
 
 logger = logging.getLogger(__name__)
 
@@ -14,9 +20,28 @@ logger = logging.getLogger(__name__)
 class AuthService:
     """
     Serviço de autenticação de usuários
+    
+    A verificação bcrypt é cara de propósito: ela roda em um pool de threads
+    (autenticar_async) e acontece uma vez por sessão. Depois do login, o
+    usuário é identificado por um token de sessão validado em O(1).
+    
+    O custo do bcrypt vem de BCRYPT_ROUNDS (calibrado com calibrar_bcrypt.py).
+    Hashes com outro custo são refeitos no próximo login bem-sucedido.
     """
     
+    # Sessões ativas: token -> (usuário, expira_em em time.monotonic())
+    _sessoes: Dict[str, tuple] = {}
+    _sessoes_lock = threading.Lock()
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+    
+    TTL_SESSAO = int(os.getenv('SESSION_TTL_MINUTES', '480')) * 60
+    
+    # Custo (log2 das iterações) dos hashes novos; 12 é o padrão do bcrypt
+    CUSTO_BCRYPT = int(os.getenv('BCRYPT_ROUNDS', '12'))
+    
     @staticmethod
+    @medir_operacao()
     def autenticar(username: str, password: str) -> Optional[Dict[str, Any]]:
         """
         Autentica um usuário com username e senha
@@ -59,6 +84,11 @@ class AuthService:
             if AuthService._verificar_senha(password, password_hash):
                 logger.info(f"Login bem-sucedido: {username}")
                 
+                # Hash com custo diferente do configurado: refaz com a senha
+                # que acabou de ser confirmada
+                if AuthService._custo_hash(password_hash) != AuthService.CUSTO_BCRYPT:
+                    AuthService._atualizar_hash(usuario['id'], password, password_hash)
+                
                 # Remove o hash da senha antes de retornar
                 del usuario['password_hash']
                 return usuario
@@ -71,6 +101,91 @@ class AuthService:
             return None
     
     @staticmethod
+    def autenticar_async(username: str, password: str) -> Future:
+        """
+        Autentica em segundo plano e abre uma sessão (não bloqueia a interface)
+        
+        Args:
+            username: Nome de usuário
+            password: Senha em texto plano
+        
+        Returns:
+            Future com o dicionário do usuário (incluindo o token em 'sessao')
+            ou None se as credenciais forem inválidas
+        """
+        return AuthService._obter_executor().submit(AuthService._autenticar_e_criar_sessao, username, password)
+    
+    @staticmethod
+    def criar_sessao(usuario: Dict[str, Any]) -> str:
+        """
+        Abre uma sessão para um usuário já autenticado
+        
+        Args:
+            usuario: Dicionário do usuário (sem o hash da senha)
+        
+        Returns:
+            Token da sessão
+        """
+        token = secrets.token_urlsafe(32)
+        expira_em = time.monotonic() + AuthService.TTL_SESSAO
+        
+        with AuthService._sessoes_lock:
+            AuthService._limpar_sessoes_expiradas()
+            AuthService._sessoes[token] = (usuario, expira_em)
+        
+        logger.info(f"Sessão aberta para usuário: {usuario['username']}")
+        return token
+    
+    @staticmethod
+    def validar_sessao(token: str) -> Optional[Dict[str, Any]]:
+        """
+        Valida um token de sessão e renova sua validade
+        
+        Args:
+            token: Token retornado por criar_sessao()
+        
+        Returns:
+            Dicionário do usuário ou None se a sessão não existir ou tiver expirado
+        """
+        if not token:
+            return None
+        
+        agora = time.monotonic()
+        with AuthService._sessoes_lock:
+            sessao = AuthService._sessoes.get(token)
+            if sessao is None:
+                return None
+            
+            usuario, expira_em = sessao
+            if agora > expira_em:
+                del AuthService._sessoes[token]
+                logger.info(f"Sessão expirada para usuário: {usuario['username']}")
+                return None
+            
+            # Validade renovada a cada uso (expira por inatividade)
+            AuthService._sessoes[token] = (usuario, agora + AuthService.TTL_SESSAO)
+            return usuario
+    
+    @staticmethod
+    def encerrar_sessao(token: str) -> bool:
+        """
+        Encerra uma sessão (logout)
+        
+        Args:
+            token: Token da sessão
+        
+        Returns:
+            True se a sessão existia
+        """
+        with AuthService._sessoes_lock:
+            sessao = AuthService._sessoes.pop(token, None)
+        
+        if sessao:
+            logger.info(f"Sessão encerrada para usuário: {sessao[0]['username']}")
+        return sessao is not None
+    
+    @staticmethod
+    @medir_operacao()
     def alterar_senha(
         usuario_id: int,
         senha_atual: str,
@@ -122,6 +237,7 @@ class AuthService:
             raise
     
     @staticmethod
+    @medir_operacao()
     def criar_usuario(
         username: str,
         password: str,
@@ -231,6 +347,10 @@ class AuthService:
             if rows > 0:
                 status = "ativado" if ativo else "desativado"
                 logger.info(f"Usuário ID {usuario_id} {status}")
+                
+                # Usuário desativado perde as sessões abertas
+                if not ativo:
+                    AuthService._encerrar_sessoes_usuario(usuario_id)
                 return True
             return False
             
@@ -239,21 +359,106 @@ class AuthService:
             raise
     
     @staticmethod
-    def _gerar_hash_senha(password: str) -> str:
+    def _autenticar_e_criar_sessao(username: str, password: str) -> Optional[Dict[str, Any]]:
+        """Autentica e, se der certo, inclui o token de sessão no usuário"""
+        usuario = AuthService.autenticar(username, password)
+        if usuario:
+            usuario['sessao'] = AuthService.criar_sessao(usuario)
+        return usuario
+    
+    @staticmethod
+    def _obter_executor() -> ThreadPoolExecutor:
+        """Cria o pool de verificação de senhas no primeiro uso"""
+        with AuthService._executor_lock:
+            if AuthService._executor is None:
+                AuthService._executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv('AUTH_WORKERS', '2')),
+                    thread_name_prefix='Auth'
+                )
+            return AuthService._executor
+    
+    @staticmethod
+    def _encerrar_sessoes_usuario(usuario_id: int):
+        """Encerra todas as sessões de um usuário"""
+        with AuthService._sessoes_lock:
+            tokens = [t for t, (usuario, _) in AuthService._sessoes.items() if usuario['id'] == usuario_id]
+            for token in tokens:
+                del AuthService._sessoes[token]
+        
+        if tokens:
+            logger.info(f"{len(tokens)} sessão(ões) encerrada(s) do usuário ID {usuario_id}")
+    
+    @staticmethod
+    def _limpar_sessoes_expiradas():
+        """Remove as sessões vencidas (deve ser chamado com o lock)"""
+        agora = time.monotonic()
+        expiradas = [t for t, (_, expira_em) in AuthService._sessoes.items() if agora > expira_em]
+        for token in expiradas:
+            del AuthService._sessoes[token]
+    
+    @staticmethod
+    def _gerar_hash_senha(password: str, custo: Optional[int] = None) -> str:
         """
         Gera hash bcrypt da senha
         
         Args:
             password: Senha em texto plano
+            custo: Custo do bcrypt (padrão: BCRYPT_ROUNDS)
         
         Returns:
             Hash bcrypt da senha
         """
         # Gera salt e hash
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=custo or AuthService.CUSTO_BCRYPT)
         password_hash = bcrypt.hashpw(password.encode('utf-8'), salt)
         return password_hash.decode('utf-8')
     
+    @staticmethod
+    def _custo_hash(password_hash: str) -> Optional[int]:
+        """
+        Lê o custo gravado em um hash bcrypt ($2b$12$...)
+        
+        Args:
+            password_hash: Hash bcrypt armazenado
+        
+        Returns:
+            Custo do hash ou None se o formato não for reconhecido
+        """
+        partes = password_hash.split('$')
+        if len(partes) < 4 or not partes[2].isdigit():
+            return None
+        return int(partes[2])
+    
+    @staticmethod
+    def _atualizar_hash(usuario_id: int, password: str, password_hash_atual: str):
+        """
+        Regrava o hash da senha com o custo configurado
+        
+        A falha não impede o login: o hash antigo continua válido e a
+        atualização é tentada de novo no próximo login.
+        
+        Args:
+            usuario_id: ID do usuário
+            password: Senha em texto plano (já verificada)
+            password_hash_atual: Hash lido no login
+        """
+        try:
+            novo_hash = AuthService._gerar_hash_senha(password)
+            
+            # Só grava se o hash não mudou desde a leitura (ex.: troca de senha
+            # em outra estação durante o login)
+            query = "UPDATE usuarios SET password_hash = %s WHERE id = %s AND password_hash = %s"
+            rows = db.execute_update(query, (novo_hash, usuario_id, password_hash_atual))
+            
+            if rows > 0:
+                logger.info(
+                    f"Hash da senha do usuário ID {usuario_id} atualizado "
+                    f"(custo {AuthService._custo_hash(password_hash_atual)} -> {AuthService.CUSTO_BCRYPT})"
+                )
+                
+        except Exception as e:
+            logger.warning(f"Erro ao atualizar hash da senha do usuário ID {usuario_id}: {e}")
+    
     @staticmethod
     def _verificar_senha(password: str, password_hash: str) -> bool:
         """
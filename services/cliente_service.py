@@ -7,6 +7,7 @@ import logging
 import re
 from typing import Optional, List, Dict, Any
 from database.connection import db
+from utils.event_log import medir_operacao
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,7 @@ class ClienteService:
     """
     
     @staticmethod
+    @medir_operacao()
     def criar_cliente(
         nome: str,
         sobrenome: str,
@@ -82,6 +84,7 @@ class ClienteService:
             raise
     
     @staticmethod
+    @medir_operacao()
     def buscar_por_id(cliente_id: int) -> Optional[Dict[str, Any]]:
         """
         Busca um cliente por ID
@@ -105,6 +108,7 @@ class ClienteService:
             raise
     
     @staticmethod
+    @medir_operacao()
     def buscar_por_cpf(cpf: str) -> Optional[Dict[str, Any]]:
         """
         Busca um cliente por CPF
@@ -129,6 +133,7 @@ class ClienteService:
             raise
     
     @staticmethod
+    @medir_operacao()
     def listar_todos() -> List[Dict[str, Any]]:
         """
         Lista todos os clientes ordenados por nome
@@ -149,6 +154,7 @@ class ClienteService:
             raise
     
     @staticmethod
+    @medir_operacao()
     def buscar_por_nome(termo: str) -> List[Dict[str, Any]]:
         """
         Busca clientes por nome ou sobrenome (case-insensitive)
@@ -175,6 +181,7 @@ class ClienteService:
             raise
     
     @staticmethod
+    @medir_operacao()
     def atualizar_cliente(
         cliente_id: int,
         nome: Optional[str] = None,
@@ -262,6 +269,7 @@ class ClienteService:
             raise
     
     @staticmethod
+    @medir_operacao()
     def deletar_cliente(cliente_id: int) -> bool:
         """
         Deleta um cliente do banco de dados
@@ -281,9 +289,9 @@ class ClienteService:
         if not cliente:
             raise ValueError(f"Cliente ID {cliente_id} não encontrado")
         
-        # Verifica se tem OS vinculadas
+        # Verifica se tem OS vinculadas (inclusive arquivadas)
         try:
-            query_os = "SELECT COUNT(*) as total FROM ordens_servico WHERE cliente_id = %s"
+            query_os = "SELECT COUNT(*) as total FROM ordens_servico_todas WHERE cliente_id = %s"
             result = db.execute_query(query_os, (cliente_id,))
             
             if result and result[0]['total'] > 0:
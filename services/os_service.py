@@ -4,10 +4,11 @@ CRUD completo para gerenciamento de OS
 """
 
 import logging
-from typing import Optional, List, Dict, Any
-from datetime import datetime, date
+from typing import Optional, List, Dict, Any, Iterator
+from datetime import datetime, date, timedelta
 from decimal import Decimal
 from database.connection import db
+from utils.event_log import medir_operacao
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +17,11 @@ class OSService:
     """
     Serviço para gerenciar Ordens de Serviço
     Métodos: criar, buscar, listar, atualizar status, etc.
+    
+    As OS encerradas há muito tempo ficam em ordens_servico_arquivo
+    (arquivar_os.py). Listagens e estatísticas leem só as OS ativas; buscas
+    por ID, número, cliente e período também chegam ao arquivo
+    (ordens_servico_todas). OS arquivadas não são alteradas.
     """
     
     # Status válidos
@@ -27,6 +33,7 @@ class OSService:
     STATUS_VALIDOS = [STATUS_ABERTA, STATUS_EM_ANDAMENTO, STATUS_CONCLUIDA, STATUS_CANCELADA]
     
     @staticmethod
+    @medir_operacao()
     def criar_os(
         cliente_id: int,
         usuario_id: int,
@@ -105,6 +112,7 @@ class OSService:
                     f"OS criada: {os_criada['numero_os']} "
                     f"(ID={os_criada['id']}, Cliente={cliente_id})"
                 )
+                OSService._dados_alterados()
                 
                 # Busca a OS completa para retornar
                 return OSService.buscar_por_id(os_criada['id'])
@@ -116,9 +124,11 @@ class OSService:
             raise
     
     @staticmethod
+    @medir_operacao()
     def buscar_por_id(os_id: int) -> Optional[Dict[str, Any]]:
         """
         Busca uma OS por ID com informações completas do cliente
+        (ativa ou arquivada)
         
         Args:
             os_id: ID da OS
@@ -136,7 +146,7 @@ class OSService:
                     c.telefone as cliente_telefone,
                     c.email as cliente_email,
                     u.nome_completo as usuario_nome
-                FROM ordens_servico os
+                FROM ordens_servico_todas os
                 INNER JOIN clientes c ON os.cliente_id = c.id
                 INNER JOIN usuarios u ON os.usuario_id = u.id
                 WHERE os.id = %s
@@ -153,9 +163,10 @@ class OSService:
             raise
     
     @staticmethod
+    @medir_operacao()
     def buscar_por_numero(numero_os: str) -> Optional[Dict[str, Any]]:
         """
-        Busca uma OS pelo número (ex: OS0001)
+        Busca uma OS pelo número (ex: OS0001), ativa ou arquivada
         
         Args:
             numero_os: Número da OS
@@ -173,7 +184,7 @@ class OSService:
                     c.telefone as cliente_telefone,
                     c.email as cliente_email,
                     u.nome_completo as usuario_nome
-                FROM ordens_servico os
+                FROM ordens_servico_todas os
                 INNER JOIN clientes c ON os.cliente_id = c.id
                 INNER JOIN usuarios u ON os.usuario_id = u.id
                 WHERE os.numero_os = %s
@@ -190,12 +201,13 @@ class OSService:
             raise
     
     @staticmethod
+    @medir_operacao()
     def listar_todas(
         status: Optional[str] = None,
         limite: int = 100
     ) -> List[Dict[str, Any]]:
         """
-        Lista todas as OS com opção de filtrar por status
+        Lista as OS ativas com opção de filtrar por status
         
         Args:
             status: Filtrar por status (opcional)
@@ -247,9 +259,10 @@ class OSService:
             raise
     
     @staticmethod
+    @medir_operacao()
     def listar_por_cliente(cliente_id: int) -> List[Dict[str, Any]]:
         """
-        Lista todas as OS de um cliente específico
+        Lista todas as OS de um cliente específico (ativas e arquivadas)
         
         Args:
             cliente_id: ID do cliente
@@ -262,7 +275,7 @@ class OSService:
                 SELECT 
                     os.*,
                     u.nome_completo as usuario_nome
-                FROM ordens_servico os
+                FROM ordens_servico_todas os
                 INNER JOIN usuarios u ON os.usuario_id = u.id
                 WHERE os.cliente_id = %s
                 ORDER BY os.criado_em DESC
@@ -276,6 +289,46 @@ class OSService:
             raise
     
     @staticmethod
+    @medir_operacao()
+    def listar_atrasadas(limite: int = 100) -> List[Dict[str, Any]]:
+        """
+        Lista as OS abertas ou em andamento com o prazo previsto vencido
+        
+        Usa o índice parcial idx_os_prazo_em_aberto (os status ficam escritos
+        na query para o planejador reconhecer o índice).
+        
+        Args:
+            limite: Número máximo de resultados
+        
+        Returns:
+            Lista de OS, prazo mais antigo primeiro
+        """
+        try:
+            query = """
+                SELECT
+                    os.*,
+                    c.nome as cliente_nome,
+                    c.sobrenome as cliente_sobrenome,
+                    c.telefone as cliente_telefone,
+                    u.nome_completo as usuario_nome
+                FROM ordens_servico os
+                INNER JOIN clientes c ON os.cliente_id = c.id
+                INNER JOIN usuarios u ON os.usuario_id = u.id
+                WHERE os.status IN ('aberta', 'em_andamento')
+                AND os.prazo_previsto < CURRENT_DATE
+                ORDER BY os.prazo_previsto, os.id
+                LIMIT %s
+            """
+            
+            results = db.execute_query(query, (limite,))
+            return results or []
+            
+        except Exception as e:
+            logger.error(f"Erro ao listar OS atrasadas: {e}")
+            raise
+    
+    @staticmethod
+    @medir_operacao()
     def atualizar_status(
         os_id: int,
         novo_status: str,
@@ -318,6 +371,7 @@ class OSService:
             
             if rows > 0:
                 logger.info(f"OS ID {os_id} status atualizado para: {novo_status}")
+                OSService._dados_alterados(os_id)
                 return True
             return False
             
@@ -326,6 +380,7 @@ class OSService:
             raise
     
     @staticmethod
+    @medir_operacao()
     def adicionar_observacao(os_id: int, nova_observacao: str) -> bool:
         """
         Adiciona uma nova observação à OS (append)
@@ -358,13 +413,17 @@ class OSService:
             query = "UPDATE ordens_servico SET observacoes = %s WHERE id = %s"
             rows = db.execute_update(query, (observacoes_novas, os_id))
             
-            return rows > 0
+            if rows > 0:
+                OSService._dados_alterados(os_id)
+                return True
+            return False
             
         except Exception as e:
             logger.error(f"Erro ao adicionar observação: {e}")
             raise
     
     @staticmethod
+    @medir_operacao()
     def atualizar_os(
         os_id: int,
         defeito_relatado: Optional[str] = None,
@@ -455,6 +514,7 @@ class OSService:
             
             if rows > 0:
                 logger.info(f"OS ID {os_id} atualizada com sucesso")
+                OSService._dados_alterados(os_id)
                 return True
             return False
             
@@ -463,9 +523,10 @@ class OSService:
             raise
     
     @staticmethod
+    @medir_operacao()
     def obter_estatisticas() -> Dict[str, Any]:
         """
-        Retorna estatísticas gerais das OS
+        Retorna estatísticas gerais das OS ativas (sem o arquivo)
         
         Returns:
             Dicionário com estatísticas
@@ -488,6 +549,115 @@ class OSService:
             logger.error(f"Erro ao obter estatísticas: {e}")
             raise
 
+    
+    @staticmethod
+    def iterar_por_periodo(inicio: date, fim: date) -> Iterator[Dict[str, Any]]:
+        """
+        Percorre as OS abertas em um período (ativas e arquivadas), em ordem
+        de abertura, sem carregar o resultado inteiro em memória (cursor no
+        servidor)
+        
+        Args:
+            inicio: Primeiro dia do período
+            fim: Último dia do período (inclusive)
+        
+        Yields:
+            OS com nome do cliente e do técnico responsável
+        """
+        query = """
+            SELECT 
+                os.id,
+                os.numero_os,
+                os.status,
+                os.valor_estimado,
+                os.prazo_previsto,
+                os.criado_em,
+                os.concluido_em,
+                c.nome as cliente_nome,
+                c.sobrenome as cliente_sobrenome,
+                u.nome_completo as usuario_nome
+            FROM ordens_servico_todas os
+            INNER JOIN clientes c ON os.cliente_id = c.id
+            INNER JOIN usuarios u ON os.usuario_id = u.id
+            WHERE os.criado_em >= %s AND os.criado_em < %s
+            ORDER BY os.criado_em, os.id
+        """
+        
+        try:
+            yield from db.stream_query(query, (inicio, fim + timedelta(days=1)))
+        except Exception as e:
+            logger.error(f"Erro ao percorrer OS do período: {e}")
+            raise
+    
+    @staticmethod
+    @medir_operacao()
+    def totais_por_periodo(inicio: date, fim: date) -> List[Dict[str, Any]]:
+        """
+        Calcula no banco os totais das OS abertas em um período (ativas e
+        arquivadas), por status
+        
+        Args:
+            inicio: Primeiro dia do período
+            fim: Último dia do período (inclusive)
+        
+        Returns:
+            Uma linha por status (quantidade e soma do valor estimado), na
+            ordem de STATUS_VALIDOS, seguida da linha de total geral (status None)
+        """
+        try:
+            query = """
+                SELECT 
+                    status,
+                    COUNT(*) as quantidade,
+                    COALESCE(SUM(valor_estimado), 0) as valor_total
+                FROM ordens_servico_todas
+                WHERE criado_em >= %s AND criado_em < %s
+                GROUP BY ROLLUP (status)
+            """
+            
+            results = db.execute_query(query, (inicio, fim + timedelta(days=1))) or []
+            
+            # ROLLUP devolve o total geral com status NULL (mesmo sem nenhuma OS)
+            ordem = {status: i for i, status in enumerate(OSService.STATUS_VALIDOS)}
+            results.sort(key=lambda linha: ordem.get(linha['status'], len(ordem)))
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Erro ao calcular totais do período: {e}")
+            raise
+    
+    @staticmethod
+    def _dados_alterados(os_id: int = None):
+        """
+        Descarta os dados derivados de uma OS alterada: PDFs em cache e
+        a lista pré-carregada durante o login (e antecipa a verificação
+        das OS atrasadas)
+        
+        Args:
+            os_id: ID da OS alterada (None para uma OS nova)
+        """
+        # PDF primeiro: uma falha nas etapas seguintes não deixa a prévia desatualizada
+        if os_id is not None:
+            try:
+                from utils.pdf_cache import pdf_cache
+                pdf_cache.invalidar(os_id)
+            except Exception as e:
+                # O cache é endereçado pelo conteúdo: uma falha aqui não gera PDF errado
+                logger.warning(f"Erro ao invalidar cache de PDF da OS ID {os_id}: {e}")
+        
+        try:
+            from services.preload_service import preload_service
+            preload_service.descartar()
+        except Exception as e:
+            logger.warning(f"Erro ao descartar dados pré-carregados: {e}")
+        
+        try:
+            from services.prazo_service import prazo_service
+            prazo_service.solicitar_verificacao()
+        except Exception as e:
+            logger.warning(f"Erro ao antecipar a verificação de prazos: {e}")
+
 
 # Instância global
 os_service = OSService()
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Serviço de Prazos
+Verifica periodicamente, em segundo plano, as OS com prazo previsto vencido
+"""
+
+import os
+import threading
+import logging
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+class PrazoService:
+    """
+    Verificação periódica das OS atrasadas (abertas ou em andamento com o
+    prazo previsto vencido)
+
+    Uma thread consulta OSService.listar_atrasadas a cada
+    OVERDUE_CHECK_INTERVAL segundos (índice parcial: custa o mesmo com
+    qualquer tamanho de histórico) e guarda o resultado para o painel da
+    tela inicial. Alterações em OS antecipam a próxima verificação.
+    """
+
+    # OS atrasadas guardadas por verificação (as de prazo mais antigo)
+    LIMITE = 50
+
+    def __init__(self):
+        """Inicializa o serviço (nada é verificado até iniciar())"""
+        self.intervalo = float(os.getenv('OVERDUE_CHECK_INTERVAL', '300'))
+        self.verificado_em: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._parar = threading.Event()
+        self._acordar = threading.Event()
+        self._atrasadas: Optional[List[Dict[str, Any]]] = None
+
+    def iniciar(self) -> bool:
+        """
+        Inicia a verificação periódica (uma vez por sessão)
+
+        Returns:
+            True se a thread foi iniciada agora (False se já estava rodando
+            ou se desligada com OVERDUE_CHECK_INTERVAL=0)
+        """
+        if self.intervalo <= 0:
+            return False
+
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._parar.clear()
+            self._thread = threading.Thread(
+                target=self._executar,
+                name='Prazos',
+                daemon=True
+            )
+            self._thread.start()
+
+        logger.debug(f"Verificação de prazos iniciada (a cada {self.intervalo:.0f} s)")
+        return True
+
+    def parar(self):
+        """Encerra a verificação periódica"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+
+        if thread is None:
+            return
+
+        self._parar.set()
+        self._acordar.set()
+        thread.join(timeout=5)
+
+    def solicitar_verificacao(self):
+        """Antecipa a próxima verificação (ex.: após alterar uma OS)"""
+        self._acordar.set()
+
+    def obter_atrasadas(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Retorna o resultado da última verificação
+
+        Returns:
+            Lista de OS atrasadas (como OSService.listar_atrasadas), prazo mais
+            antigo primeiro, ou None se nenhuma verificação terminou ainda
+        """
+        with self._lock:
+            return self._atrasadas
+
+    def verificar(self) -> List[Dict[str, Any]]:
+        """
+        Consulta as OS atrasadas e guarda o resultado
+
+        Returns:
+            Lista de OS atrasadas
+        """
+        from services.os_service import os_service
+
+        atrasadas = os_service.listar_atrasadas(limite=self.LIMITE)
+
+        with self._lock:
+            anteriores = {os['id'] for os in self._atrasadas or []}
+            self._atrasadas = atrasadas
+            self.verificado_em = datetime.now()
+
+        novas = [os['numero_os'] for os in atrasadas if os['id'] not in anteriores]
+        if novas:
+            logger.info(f"OS com prazo vencido: {', '.join(novas)}")
+
+        return atrasadas
+
+    def _executar(self):
+        """Laço da thread: verifica, espera o intervalo (ou um pedido) e repete"""
+        while not self._parar.is_set():
+            self._acordar.clear()
+            try:
+                self.verificar()
+            except Exception as e:
+                # Sem banco agora: tenta de novo no próximo intervalo
+                logger.warning(f"Erro ao verificar prazos das OS: {e}")
+
+            self._acordar.wait(self.intervalo)
+
+
+# Instância global
+prazo_service = PrazoService()
@@ -0,0 +1,154 @@
+"""
+Serviço de Pré-carregamento
+Prepara conexões, dados e módulos em segundo plano enquanto o login é exibido
+"""
+
+import os
+import time
+import threading
+import importlib
+import logging
+from typing import Optional, List, Dict, Any
+from database.connection import db
+
+logger = logging.getLogger(__name__)
+
+
+class PreloadService:
+    """
+    Pré-carrega em uma thread o que o sistema usa logo após o login
+
+    Enquanto o usuário digita a senha: abre as conexões do pool, busca a
+    primeira página de OS e os números do painel e importa as janelas principais.
+    As janelas consomem os dados pré-carregados se ainda estiverem recentes;
+    caso contrário, consultam o banco normalmente.
+    """
+
+    # Módulos importados antecipadamente (janela principal e as mais usadas)
+    MODULOS = (
+        'ui.main_window',
+        'ui.os_window',
+        'ui.cliente_window',
+    )
+
+    # Mesma quantidade carregada pela consulta de OS
+    LIMITE_OS = 200
+
+    def __init__(self):
+        """Inicializa o serviço (nada é carregado até iniciar())"""
+        self.idade_maxima = float(os.getenv('PRELOAD_MAX_AGE', '60'))
+        self._lock = threading.Lock()
+        self._thread = None
+        self._dados: Dict[str, tuple] = {}
+
+    def iniciar(self) -> bool:
+        """
+        Inicia o pré-carregamento em segundo plano (uma vez por sessão)
+
+        Returns:
+            True se a thread foi iniciada agora
+        """
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._thread = threading.Thread(
+                target=self._executar,
+                name='Preload',
+                daemon=True
+            )
+            self._thread.start()
+        return True
+
+    def aguardar(self, timeout: float = None) -> bool:
+        """
+        Espera o pré-carregamento terminar
+
+        Args:
+            timeout: Tempo máximo em segundos (None: sem limite)
+
+        Returns:
+            True se terminou
+        """
+        thread = self._thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def obter_os_recentes(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Retorna a primeira página de OS pré-carregada (uma única vez)
+
+        Returns:
+            Lista de OS (como OSService.listar_todas) ou None se não houver
+            dados recentes
+        """
+        return self._consumir('os_recentes')
+
+    def obter_painel(self) -> Optional[Dict[str, Any]]:
+        """
+        Retorna os números do painel pré-carregados (uma única vez)
+
+        Returns:
+            Painel (como AnalyticsService.painel) ou None
+        """
+        return self._consumir('painel')
+
+    def descartar(self):
+        """Descarta os dados pré-carregados (ex.: após alterar uma OS)"""
+        with self._lock:
+            self._dados.clear()
+
+    def _consumir(self, chave):
+        """Retira um dado pré-carregado, se ainda estiver dentro da idade máxima"""
+        with self._lock:
+            item = self._dados.pop(chave, None)
+
+        if item is None:
+            return None
+
+        valor, carregado_em = item
+        if time.monotonic() - carregado_em > self.idade_maxima:
+            logger.debug(f"Dado pré-carregado descartado (antigo): {chave}")
+            return None
+        return valor
+
+    def _guardar(self, chave, valor):
+        """Guarda um dado pré-carregado com o horário da carga"""
+        with self._lock:
+            self._dados[chave] = (valor, time.monotonic())
+
+    def _executar(self):
+        """Etapas do pré-carregamento; uma falha não impede as seguintes"""
+        inicio = time.perf_counter()
+
+        try:
+            db.aquecer()
+        except Exception as e:
+            # Sem banco, o próprio login vai mostrar o erro ao usuário
+            logger.warning(f"Pré-carregamento: falha ao abrir conexões: {e}")
+            return
+
+        try:
+            from services.os_service import os_service
+            self._guardar('os_recentes', os_service.listar_todas(limite=self.LIMITE_OS))
+        except Exception as e:
+            logger.warning(f"Pré-carregamento: falha ao carregar dados: {e}")
+
+        try:
+            from services.analytics_service import analytics_service
+            self._guardar('painel', analytics_service.painel())
+        except Exception as e:
+            logger.warning(f"Pré-carregamento: falha ao carregar o painel: {e}")
+
+        for modulo in self.MODULOS:
+            try:
+                importlib.import_module(modulo)
+            except Exception as e:
+                logger.warning(f"Pré-carregamento: falha ao importar {modulo}: {e}")
+
+        logger.info(f"Pré-carregamento concluído em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+
+# Instância global
+preload_service = PreloadService()
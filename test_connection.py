@@ -1,15 +1,285 @@
 """
 Script de teste para verificar a conexão com o banco de dados
 Execute: python test_connection.py
+         python test_connection.py --diagnostico [--iteracoes 200]
+
+O diagnóstico mede conexão, latência e vazão e mostra o estado das tabelas,
+para separar lentidão da rede, do servidor ou das consultas.
 """
 
+import argparse
+import socket
 import sys
+import time
 from database.connection import db
+from utils.estatisticas import percentil
+
+# Faixas do histograma de latência (ms)
+FAIXAS_LATENCIA = (0.5, 1, 2, 5, 10, 20, 50, 100)
+
+# Linhas lidas em cada medição de vazão
+LINHAS_VAZAO = 50000
+
+def _resumo_ms(tempos):
+    """Texto com mínimo, p50, p95 e máximo de uma lista de tempos (ms)"""
+    ordenados = sorted(tempos)
+    return (
+        f"mín {ordenados[0]:.2f} / p50 {percentil(ordenados, 50):.2f} / "
+        f"p95 {percentil(ordenados, 95):.2f} / máx {ordenados[-1]:.2f} ms"
+    )
+
+def _histograma(tempos):
+    """Imprime o histograma de latência em faixas fixas"""
+    contagens = [0] * (len(FAIXAS_LATENCIA) + 1)
+    for tempo in tempos:
+        faixa = next((i for i, limite in enumerate(FAIXAS_LATENCIA) if tempo < limite), len(FAIXAS_LATENCIA))
+        contagens[faixa] += 1
+
+    maior = max(contagens)
+    for i, contagem in enumerate(contagens):
+        rotulo = f"< {FAIXAS_LATENCIA[i]:g} ms" if i < len(FAIXAS_LATENCIA) else f">= {FAIXAS_LATENCIA[-1]:g} ms"
+        barra = '█' * round(40 * contagem / maior) if maior else ''
+        print(f"   {rotulo:>10} {contagem:>6}  {barra}")
+
+def medir_conexao(iteracoes):
+    """
+    Tempo de abrir uma conexão: TCP puro (rede) e conexão completa (rede +
+    autenticação + início da sessão no servidor)
+
+    Returns:
+        Tupla (tempos TCP em ms ou None, tempos de conexão em ms)
+    """
+    import psycopg
+    from psycopg.conninfo import conninfo_to_dict
+
+    parametros = conninfo_to_dict(db._connection_string)
+    host = parametros.get('host') or 'localhost'
+    porta = int(parametros.get('port') or 5432)
+
+    tempos_tcp = []
+    if not host.startswith('/'):
+        for _ in range(iteracoes):
+            inicio = time.perf_counter()
+            with socket.create_connection((host, porta), timeout=10):
+                tempos_tcp.append((time.perf_counter() - inicio) * 1000)
+
+    tempos = []
+    for _ in range(iteracoes):
+        inicio = time.perf_counter()
+        conn = psycopg.connect(db._connection_string)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        conn.close()
+
+    return tempos_tcp or None, tempos
+
+def medir_latencia(conn, iteracoes):
+    """Tempo de ida e volta de SELECT 1 (ms) em uma conexão aberta"""
+    tempos = []
+    with conn.cursor() as cursor:
+        for _ in range(iteracoes):
+            inicio = time.perf_counter()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            tempos.append((time.perf_counter() - inicio) * 1000)
+    conn.rollback()
+    return tempos
+
+def medir_vazao(conn, repeticoes):
+    """
+    Leitura de muitas linhas: vazão total e tempo só de execução no servidor
+
+    Returns:
+        Dicionário com linhas/s, MB/s, tempo total e tempo no servidor (ms)
+    """
+    query = "SELECT g AS id, md5(g::text) AS texto, now() AS criado_em FROM generate_series(1, %s) AS g"
+
+    totais = []
+    tamanho = 0
+    with conn.cursor() as cursor:
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            cursor.execute(query, (LINHAS_VAZAO,))
+            linhas = cursor.fetchall()
+            totais.append((time.perf_counter() - inicio) * 1000)
+        # Tamanho aproximado no protocolo: id + texto + timestamp
+        tamanho = sum(len(str(linha[0])) + len(linha[1]) + 8 for linha in linhas)
+
+        cursor.execute(f"EXPLAIN (ANALYZE, TIMING OFF, FORMAT JSON) {query}", (LINHAS_VAZAO,))
+        servidor = cursor.fetchone()[0][0]['Execution Time']
+    conn.rollback()
+
+    melhor = min(totais)
+    return {
+        'linhas_s': LINHAS_VAZAO / (melhor / 1000),
+        'mb_s': tamanho / 1024 / 1024 / (melhor / 1000),
+        'total_ms': melhor,
+        'servidor_ms': servidor,
+    }
+
+def estado_tabelas():
+    """Tamanho, tuplas mortas, varreduras e cache de cada tabela"""
+    return db.execute_query("""
+        SELECT
+            t.relname AS tabela,
+            pg_total_relation_size(t.relid) AS tamanho,
+            t.n_live_tup AS vivas,
+            t.n_dead_tup AS mortas,
+            t.seq_scan,
+            COALESCE(t.idx_scan, 0) AS idx_scan,
+            GREATEST(t.last_autovacuum, t.last_vacuum) AS ultimo_vacuum,
+            io.heap_blks_hit + COALESCE(io.idx_blks_hit, 0) AS blocos_cache,
+            io.heap_blks_read + COALESCE(io.idx_blks_read, 0) AS blocos_disco
+        FROM pg_stat_user_tables t
+        INNER JOIN pg_statio_user_tables io ON io.relid = t.relid
+        ORDER BY pg_total_relation_size(t.relid) DESC
+    """)
+
+def uso_indices():
+    """Varreduras e tamanho de cada índice"""
+    return db.execute_query("""
+        SELECT
+            s.relname AS tabela,
+            s.indexrelname AS indice,
+            s.idx_scan,
+            pg_relation_size(s.indexrelid) AS tamanho,
+            i.indisunique AS unico
+        FROM pg_stat_user_indexes s
+        INNER JOIN pg_index i ON i.indexrelid = s.indexrelid
+        ORDER BY s.relname, s.idx_scan
+    """)
+
+def cache_banco():
+    """Proporção de blocos lidos da memória no banco atual"""
+    resultado = db.execute_query("""
+        SELECT blks_hit, blks_read
+        FROM pg_stat_database
+        WHERE datname = current_database()
+    """)
+    acertos, leituras = resultado[0]['blks_hit'], resultado[0]['blks_read']
+    return acertos / (acertos + leituras) if acertos + leituras else None
+
+def _tamanho(valor):
+    """Bytes em texto legível"""
+    for unidade in ('B', 'KB', 'MB', 'GB'):
+        if valor < 1024 or unidade == 'GB':
+            return f"{valor:.0f} {unidade}" if unidade == 'B' else f"{valor:.1f} {unidade}"
+        valor /= 1024
+
+def diagnosticar(iteracoes):
+    """
+    Diagnóstico de desempenho: rede, servidor e banco
+    """
+    import psycopg
+
+    print("=" * 60)
+    print("🩺 DIAGNÓSTICO DO BANCO - GF INFORMÁTICA")
+    print("=" * 60)
+
+    conclusoes = []
+
+    print(f"\n[1/5] Abrindo conexões ({min(iteracoes, 20)}x)...")
+    try:
+        tempos_tcp, tempos_conexao = medir_conexao(min(iteracoes, 20))
+    except (OSError, psycopg.Error) as e:
+        print(f"❌ Falha na conexão: {e}")
+        sys.exit(1)
+    if tempos_tcp:
+        print(f"   TCP (rede):         {_resumo_ms(tempos_tcp)}")
+    print(f"   Conexão completa:   {_resumo_ms(tempos_conexao)}")
+    p50_tcp = percentil(sorted(tempos_tcp), 50) if tempos_tcp else 0
+    p50_conexao = percentil(sorted(tempos_conexao), 50)
+    if p50_tcp > 20:
+        conclusoes.append(f"Rede lenta até o servidor (TCP p50 {p50_tcp:.0f} ms)")
+    if p50_conexao - p50_tcp > 100:
+        conclusoes.append(
+            f"Servidor demora para aceitar conexões ({p50_conexao - p50_tcp:.0f} ms além da rede): "
+            "autenticação, DNS reverso ou servidor sobrecarregado"
+        )
+
+    with psycopg.connect(db._connection_string) as conn:
+        print(f"\n[2/5] Latência de ida e volta (SELECT 1, {iteracoes}x)...")
+        tempos = medir_latencia(conn, iteracoes)
+        print(f"   {_resumo_ms(tempos)}\n")
+        _histograma(tempos)
+        p50 = percentil(sorted(tempos), 50)
+        p99 = percentil(sorted(tempos), 99)
+        if p50 > 5:
+            conclusoes.append(f"Latência alta por consulta (p50 {p50:.1f} ms): cada tela faz várias idas ao banco")
+        elif p99 > 10 * max(p50, 0.1):
+            conclusoes.append(f"Latência instável (p99 {p99:.1f} ms contra p50 {p50:.1f} ms): rede com perda ou Wi-Fi")
+
+        repeticoes = max(3, iteracoes // 20)
+        print(f"\n[3/5] Vazão de leitura ({LINHAS_VAZAO} linhas, {repeticoes}x)...")
+        vazao = medir_vazao(conn, repeticoes)
+        transferencia = max(vazao['total_ms'] - vazao['servidor_ms'], 0)
+        print(f"   {vazao['linhas_s']:,.0f} linhas/s, {vazao['mb_s']:.1f} MB/s")
+        print(f"   Servidor {vazao['servidor_ms']:.0f} ms + transferência/cliente {transferencia:.0f} ms")
+        if vazao['mb_s'] < 5:
+            conclusoes.append(f"Pouca banda até o servidor ({vazao['mb_s']:.1f} MB/s): listagens grandes ficam lentas")
+
+    print("\n[4/5] Tabelas e índices...")
+    print(f"\n   {'Tabela':<24} {'Tamanho':>9} {'Linhas':>9} {'Mortas':>7} {'Seq':>8} {'Índice':>9} {'Cache':>6}")
+    for tabela in estado_tabelas():
+        vivas, mortas = tabela['vivas'], tabela['mortas']
+        proporcao_mortas = mortas / (vivas + mortas) if vivas + mortas else 0
+        blocos = tabela['blocos_cache'] + tabela['blocos_disco']
+        cache = f"{tabela['blocos_cache'] / blocos:.0%}" if blocos else '-'
+        print(
+            f"   {tabela['tabela']:<24} {_tamanho(tabela['tamanho']):>9} {vivas:>9} {proporcao_mortas:>7.0%} "
+            f"{tabela['seq_scan']:>8} {tabela['idx_scan']:>9} {cache:>6}"
+        )
+        if mortas > 1000 and proporcao_mortas > 0.2:
+            conclusoes.append(
+                f"{tabela['tabela']}: {proporcao_mortas:.0%} de linhas mortas (inchaço), "
+                f"último vacuum {tabela['ultimo_vacuum'] or 'nunca'}: rode VACUUM ANALYZE"
+            )
+        if vivas > 10000 and tabela['seq_scan'] > tabela['idx_scan']:
+            conclusoes.append(
+                f"{tabela['tabela']}: mais leituras sequenciais que por índice em {vivas} linhas "
+                "(veja relatorio_indices.py)"
+            )
+
+    sem_uso = [indice for indice in uso_indices() if indice['idx_scan'] == 0 and not indice['unico']]
+    if sem_uso:
+        print("\n   Índices nunca usados desde o último reset das estatísticas:")
+        for indice in sem_uso:
+            print(f"   - {indice['tabela']}.{indice['indice']} ({_tamanho(indice['tamanho'])})")
+
+    print("\n[5/5] Cache do banco...")
+    proporcao = cache_banco()
+    if proporcao is None:
+        print("   Sem leituras registradas ainda")
+    else:
+        print(f"   {proporcao:.2%} dos blocos lidos da memória")
+        if proporcao < 0.95:
+            conclusoes.append(
+                f"Cache do servidor baixo ({proporcao:.1%}): pouca memória ou shared_buffers pequeno"
+            )
+
+    print("\n" + "=" * 60)
+    if conclusoes:
+        print("⚠️  PONTOS DE ATENÇÃO")
+        print("=" * 60)
+        for conclusao in conclusoes:
+            print(f"   - {conclusao}")
+    else:
+        print("✅ REDE, SERVIDOR E BANCO DENTRO DO ESPERADO")
+        print("=" * 60)
 
 def main():
     """
     Testa a conexão e exibe informações do banco
     """
+    parser = argparse.ArgumentParser(description="Teste de conexão com o banco")
+    parser.add_argument('--diagnostico', '--diagnose', action='store_true',
+                        help="Mede conexão, latência e vazão e mostra o estado das tabelas")
+    parser.add_argument('--iteracoes', type=int, default=200, help="Medições de latência no diagnóstico")
+    args = parser.parse_args()
+
+    if args.diagnostico:
+        diagnosticar(max(args.iteracoes, 1))
+        return
+
     print("=" * 60)
     print("?? TESTE DE CONEXÃO - GF INFORMÁTICA")
     print("=" * 60)
@@ -66,4 +336,4 @@ def main():
     print("\n?? Sistema pronto para uso!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
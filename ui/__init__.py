@@ -3,16 +3,26 @@ Módulo de interface gráfica (UI)
 Contém todas as janelas e componentes visuais em tkinter
 """
 
-from .login_window import LoginWindow
-from .main_window import MainWindow
-from .cliente_window import ClienteWindow
-from .os_window import OSWindow
-from .pdf_preview_window import PDFPreviewWindow
+from utils.importacao import exportar_sob_demanda
+
+# Os submódulos só são importados quando o nome é usado: importar o pacote
+# não carrega todas as janelas/serviços (e suas dependências)
+exportar_sob_demanda(__name__, {
+    'LoginWindow': '.login_window',
+    'MainWindow': '.main_window',
+    'ClienteWindow': '.cliente_window',
+    'OSWindow': '.os_window',
+    'PDFPreviewWindow': '.pdf_preview_window',
+    'RelatorioWindow': '.relatorio_window',
+    'PrintQueueWindow': '.print_queue_window',
+})
 
 __all__ = [
     'LoginWindow',
     'MainWindow',
     'ClienteWindow',
     'OSWindow',
-    'PDFPreviewWindow'
+    'PDFPreviewWindow',
+    'RelatorioWindow',
+    'PrintQueueWindow'
 ]
\ No newline at end of file
@@ -8,6 +8,7 @@ from tkinter import ttk, messagebox
 import logging
 from services.cliente_service import cliente_service
 from utils.validators import validators
+from utils.event_log import acao_ui
 
 logger = logging.getLogger(__name__)
 
@@ -219,6 +220,7 @@ class ClienteWindow:
             self.telefone_entry.delete(0, tk.END)
             self.telefone_entry.insert(0, telefone_formatado)
     
+    @acao_ui()
     def _carregar_clientes(self):
         """Carrega todos os clientes na tabela"""
         try:
@@ -254,6 +256,7 @@ class ClienteWindow:
                 parent=self.window
             )
     
+    @acao_ui()
     def _buscar_clientes(self, event=None):
         """Busca clientes por nome"""
         termo = self.search_entry.get().strip()
@@ -290,6 +293,7 @@ class ClienteWindow:
         except Exception as e:
             logger.error(f"Erro ao buscar clientes: {e}")
     
+    @acao_ui()
     def _salvar_cliente(self):
         """Salva ou atualiza cliente"""
         # Validações
@@ -385,6 +389,7 @@ class ClienteWindow:
                 parent=self.window
             )
     
+    @acao_ui()
     def _editar_cliente(self, event=None):
         """Carrega dados do cliente selecionado para edição"""
         selection = self.tree.selection()
@@ -442,6 +447,7 @@ class ClienteWindow:
                 parent=self.window
             )
     
+    @acao_ui()
     def _deletar_cliente(self):
         """Deleta o cliente selecionado"""
         selection = self.tree.selection()
@@ -499,6 +505,7 @@ class ClienteWindow:
                 parent=self.window
             )
     
+    @acao_ui()
     def _ver_os_cliente(self):
         """Abre lista de OS do cliente selecionado"""
         selection = self.tree.selection()
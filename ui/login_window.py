@@ -7,6 +7,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import logging
 from services.auth_service import auth_service
+from services.preload_service import preload_service
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +17,9 @@ class LoginWindow:
     Janela de login do sistema
     """
     
+    # Intervalo de verificação da autenticação em segundo plano (ms)
+    INTERVALO_VERIFICACAO = 30
+    
     def __init__(self, master, on_login_success):
         """
         Inicializa a janela de login
@@ -28,8 +32,13 @@ class LoginWindow:
         self.on_login_success = on_login_success
         self.window = None
         self.usuario_autenticado = None
+        self.autenticacao = None
         
         self._criar_janela()
+        
+        # Enquanto o usuário digita, abre as conexões e carrega o que a
+        # janela principal vai usar (não bloqueia a interface)
+        preload_service.iniciar()
     
     def _criar_janela(self):
         """Cria a janela de login"""
@@ -82,13 +91,13 @@ class LoginWindow:
         self.password_entry.pack(pady=(0, 20))
         
         # Botão de login
-        login_button = ttk.Button(
+        self.login_button = ttk.Button(
             form_frame,
             text="Entrar",
             command=self._fazer_login,
             width=20
         )
-        login_button.pack(pady=(0, 10))
+        self.login_button.pack(pady=(0, 10))
         
         # Versão
         version_label = ttk.Label(
@@ -113,7 +122,10 @@ class LoginWindow:
         self.window.geometry(f'{width}x{height}+{x}+{y}')
     
     def _fazer_login(self):
-        """Processa o login"""
+        """Inicia o login (a verificação da senha roda fora da thread da interface)"""
+        if self.autenticacao is not None:
+            return  # Já existe uma verificação em andamento
+        
         username = self.username_entry.get().strip()
         password = self.password_entry.get()
         
@@ -126,8 +138,34 @@ class LoginWindow:
             return
         
         try:
-            # Tenta autenticar
-            usuario = auth_service.autenticar(username, password)
+            # Tenta autenticar (bcrypt em segundo plano)
+            self.autenticacao = auth_service.autenticar_async(username, password)
+            self.login_button.config(state=tk.DISABLED, text="Verificando...")
+            self.window.config(cursor="watch")
+            self.window.after(self.INTERVALO_VERIFICACAO, self._verificar_login, username)
+                
+        except Exception as e:
+            self.autenticacao = None
+            logger.error(f"Erro ao fazer login: {e}")
+            messagebox.showerror(
+                "Erro",
+                f"Erro ao processar login:\n{str(e)}",
+                parent=self.window
+            )
+    
+    def _verificar_login(self, username):
+        """Acompanha a autenticação em segundo plano e trata o resultado"""
+        if not self.autenticacao.done():
+            self.window.after(self.INTERVALO_VERIFICACAO, self._verificar_login, username)
+            return
+        
+        autenticacao = self.autenticacao
+        self.autenticacao = None
+        self.login_button.config(state=tk.NORMAL, text="Entrar")
+        self.window.config(cursor="")
+        
+        try:
+            usuario = autenticacao.result()
             
             if usuario:
                 self.usuario_autenticado = usuario
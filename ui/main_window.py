@@ -1,13 +1,20 @@
 """
 Janela Principal
 Menu e navegação do sistema
+
+As janelas são importadas quando abertas pela primeira vez (a geração de
+PDF, por exemplo, só é carregada se o usuário usar alguma janela que a usa).
 """
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+import os
+import threading
 import logging
-from ui.cliente_window import ClienteWindow
-from ui.os_window import OSWindow
+from datetime import date
+from services.auth_service import auth_service
+from utils.event_log import event_log
+from utils.profiler import profiler
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +24,19 @@ class MainWindow:
     Janela principal do sistema com menu e área de trabalho
     """
     
+    # Intervalo de atualização do painel da tela inicial (ms)
+    INTERVALO_PAINEL = 60000
+    
+    # Intervalo de verificação da carga do painel em segundo plano (ms)
+    INTERVALO_VERIFICACAO = 200
+    
+    # OS atrasadas listadas no painel (as de prazo mais antigo)
+    ATRASADAS_PAINEL = 3
+    
+    # Tamanho do gráfico de entradas dos últimos dias
+    LARGURA_SERIE = 300
+    ALTURA_SERIE = 50
+    
     def __init__(self, master, usuario):
         """
         Inicializa a janela principal
@@ -27,6 +47,9 @@ class MainWindow:
         """
         self.master = master
         self.usuario = usuario
+        self.painel_thread = None
+        self.painel_resultado = None
+        event_log.definir_usuario(usuario['id'])
         
         # Configura a janela principal
         self.master.title(f"GF Informática - {usuario['nome_completo']}")
@@ -42,6 +65,14 @@ class MainWindow:
         # Exibe tela de boas-vindas
         self._mostrar_boas_vindas()
         
+        # Verificação periódica das OS atrasadas (em segundo plano)
+        from services.prazo_service import prazo_service
+        prazo_service.iniciar()
+        
+        # Perfil das primeiras ações (diagnóstico de estação lenta)
+        if int(os.getenv('PROFILE_ACTIONS', '0')) > 0:
+            self._alternar_perfil()
+        
         logger.info(f"Janela principal aberta para usuário: {usuario['username']}")
     
     def _centralizar_janela(self):
@@ -86,6 +117,19 @@ class MainWindow:
             command=self._consultar_os,
             accelerator="Ctrl+F"
         )
+        os_menu.add_separator()
+        os_menu.add_command(
+            label="Fila de Impressão",
+            command=self._fila_impressao
+        )
+        
+        # Menu Relatórios
+        relatorios_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Relatórios", menu=relatorios_menu)
+        relatorios_menu.add_command(
+            label="OS por Período",
+            command=self._relatorio_periodo
+        )
         
         # Menu Ajuda
         ajuda_menu = tk.Menu(menubar, tearoff=0)
@@ -97,6 +141,9 @@ class MainWindow:
         self.master.bind('<Control-n>', lambda e: self._nova_os())
         self.master.bind('<Control-f>', lambda e: self._consultar_os())
         self.master.bind('<Control-q>', lambda e: self._sair())
+        
+        # Atalho oculto (suporte): perfil das próximas ações
+        self.master.bind('<Control-P>', lambda e: self._alternar_perfil())
     
     def _criar_interface(self):
         """Cria a interface principal"""
@@ -130,11 +177,12 @@ class MainWindow:
         user_frame = ttk.Frame(toolbar)
         user_frame.pack(side=tk.RIGHT)
         
-        ttk.Label(
+        self.usuario_label = ttk.Label(
             user_frame,
             text=f"👤 {self.usuario['nome_completo']}",
             font=("Arial", 9)
-        ).pack(side=tk.RIGHT, padx=10)
+        )
+        self.usuario_label.pack(side=tk.RIGHT, padx=10)
         
         # Separador
         ttk.Separator(self.master, orient=tk.HORIZONTAL).pack(fill=tk.X, padx=10)
@@ -181,6 +229,9 @@ class MainWindow:
             font=("Arial", 14)
         ).pack(pady=20)
         
+        # Painel com os números do dia
+        self._criar_painel(welcome_frame)
+        
         # Botões de ação rápida
         button_frame = ttk.Frame(welcome_frame)
         button_frame.pack(pady=30)
@@ -206,21 +257,239 @@ class MainWindow:
             width=25
         ).pack(pady=5)
     
+    def _criar_painel(self, parent):
+        """
+        Cria o painel da tela inicial
+        
+        Mostra primeiro os números pré-carregados durante o login (se houver)
+        e depois os atualiza em segundo plano: a tela nunca espera o banco.
+        
+        Args:
+            parent: Frame onde o painel é colocado
+        """
+        from services.preload_service import preload_service
+        
+        painel_frame = ttk.LabelFrame(parent, text="Painel", padding=10)
+        painel_frame.pack(pady=10)
+        
+        numeros_frame = ttk.Frame(painel_frame)
+        numeros_frame.pack()
+        
+        self.painel_labels = {}
+        indicadores = (
+            ('abertas', "Abertas", None),
+            ('em_andamento', "Em andamento", None),
+            ('atrasadas', "Atrasadas", '#c0392b'),
+            ('entradas_hoje', "Entradas hoje", None),
+        )
+        for coluna, (chave, titulo, cor) in enumerate(indicadores):
+            ttk.Label(numeros_frame, text=titulo, font=("Arial", 9)).grid(row=0, column=coluna, padx=15)
+            label = ttk.Label(numeros_frame, text="—", font=("Arial", 18, "bold"))
+            if cor:
+                label.config(foreground=cor)
+            label.grid(row=1, column=coluna, padx=15)
+            self.painel_labels[chave] = label
+        
+        ttk.Label(painel_frame, text="Entradas nos últimos 30 dias", font=("Arial", 8)).pack(pady=(10, 0))
+        self.painel_canvas = tk.Canvas(
+            painel_frame,
+            width=self.LARGURA_SERIE,
+            height=self.ALTURA_SERIE,
+            highlightthickness=0
+        )
+        self.painel_canvas.pack()
+        
+        self.painel_atrasadas_label = ttk.Label(
+            painel_frame,
+            text="",
+            foreground='#c0392b',
+            font=("Arial", 9)
+        )
+        self.painel_atrasadas_label.pack(pady=(5, 0))
+        
+        painel = preload_service.obter_painel()
+        if painel is not None:
+            self._exibir_painel(painel)
+            self.master.after(self.INTERVALO_PAINEL, self._atualizar_painel)
+        else:
+            self._atualizar_painel()
+    
+    def _atualizar_painel(self):
+        """Busca os números do painel fora da thread da interface"""
+        if self.painel_thread is not None or not self.painel_canvas.winfo_exists():
+            return
+        
+        self.painel_resultado = None
+        self.painel_thread = threading.Thread(
+            target=self._carregar_painel,
+            name='Painel',
+            daemon=True
+        )
+        self.painel_thread.start()
+        self.master.after(self.INTERVALO_VERIFICACAO, self._verificar_painel)
+    
+    def _carregar_painel(self):
+        """Consulta os números do painel (executado em segundo plano)"""
+        from services.analytics_service import analytics_service
+        
+        try:
+            self.painel_resultado = ('ok', analytics_service.painel())
+        except Exception as e:
+            self.painel_resultado = ('erro', e)
+    
+    def _verificar_painel(self):
+        """Acompanha a carga do painel e agenda a próxima atualização"""
+        if self.painel_thread is None:
+            return  # Nenhuma carga em andamento
+        if self.painel_thread.is_alive():
+            self.master.after(self.INTERVALO_VERIFICACAO, self._verificar_painel)
+            return
+        
+        self.painel_thread = None
+        if not self.painel_canvas.winfo_exists():
+            return  # A tela inicial foi substituída
+        
+        tipo, valor = self.painel_resultado
+        if tipo == 'ok':
+            self._exibir_painel(valor)
+        else:
+            # Mantém os últimos números; o painel não interrompe o uso do sistema
+            logger.warning(f"Erro ao atualizar painel: {valor}")
+        
+        self.master.after(self.INTERVALO_PAINEL, self._atualizar_painel)
+    
+    def _exibir_painel(self, painel):
+        """
+        Mostra os números do painel
+        
+        Args:
+            painel: Dicionário retornado por AnalyticsService.painel
+        """
+        from services.prazo_service import prazo_service
+        
+        for chave, label in self.painel_labels.items():
+            label.config(text=str(painel.get(chave, 0)))
+        
+        self._desenhar_serie(painel.get('serie', []))
+        
+        # OS de prazo mais antigo, da última verificação periódica
+        atrasadas = prazo_service.obter_atrasadas() or []
+        hoje = date.today()
+        texto = ", ".join(
+            f"{ordem['numero_os']} ({(hoje - ordem['prazo_previsto']).days} d)"
+            for ordem in atrasadas[:self.ATRASADAS_PAINEL]
+        )
+        self.painel_atrasadas_label.config(text=f"⚠️ Prazo vencido: {texto}" if texto else "")
+    
+    def _desenhar_serie(self, serie):
+        """
+        Desenha o gráfico de linha das entradas por dia
+        
+        Args:
+            serie: Quantidade de OS criadas por dia, do mais antigo para hoje
+        """
+        canvas = self.painel_canvas
+        canvas.delete('all')
+        if len(serie) < 2:
+            return
+        
+        margem = 4
+        largura = self.LARGURA_SERIE - 2 * margem
+        altura = self.ALTURA_SERIE - 2 * margem
+        maximo = max(serie) or 1
+        passo = largura / (len(serie) - 1)
+        
+        pontos = []
+        for i, valor in enumerate(serie):
+            pontos.append(margem + i * passo)
+            pontos.append(margem + altura - (valor / maximo) * altura)
+        
+        canvas.create_line(*pontos, fill='#2e86c1', width=2)
+        
+        # Destaca o dia de hoje
+        x, y = pontos[-2], pontos[-1]
+        canvas.create_oval(x - 3, y - 3, x + 3, y + 3, fill='#2e86c1', outline='')
+    
     def _abrir_clientes(self):
         """Abre janela de gerenciamento de clientes"""
+        if not self._sessao_ativa():
+            return
+        from ui.cliente_window import ClienteWindow
         ClienteWindow(self.master)
         self.status_bar.config(text="Gerenciamento de Clientes aberto")
     
     def _nova_os(self):
         """Abre janela para criar nova OS"""
+        if not self._sessao_ativa():
+            return
+        from ui.os_window import OSWindow
         OSWindow(self.master, self.usuario, modo='criar')
         self.status_bar.config(text="Nova OS aberta")
     
     def _consultar_os(self):
         """Abre janela de consulta de OS"""
+        if not self._sessao_ativa():
+            return
+        from ui.os_window import OSWindow
         OSWindow(self.master, self.usuario, modo='consultar')
         self.status_bar.config(text="Consulta de OS aberta")
     
+    def _fila_impressao(self):
+        """Abre janela da fila de impressão"""
+        if not self._sessao_ativa():
+            return
+        from ui.print_queue_window import PrintQueueWindow
+        PrintQueueWindow(self.master)
+        self.status_bar.config(text="Fila de impressão aberta")
+    
+    def _relatorio_periodo(self):
+        """Abre janela do relatório de OS por período"""
+        if not self._sessao_ativa():
+            return
+        from ui.relatorio_window import RelatorioWindow
+        RelatorioWindow(self.master)
+        self.status_bar.config(text="Relatório por período aberto")
+    
+    def _sessao_ativa(self) -> bool:
+        """
+        Confere a sessão do usuário antes de abrir uma janela
+        
+        Se a sessão expirou (inatividade), pede o login novamente.
+        
+        Returns:
+            True se a sessão está ativa (ou foi renovada)
+        """
+        if auth_service.validar_sessao(self.usuario.get('sessao')):
+            return True
+        
+        logger.info(f"Sessão do usuário {self.usuario['username']} expirada")
+        messagebox.showwarning(
+            "Sessão expirada",
+            "Sua sessão expirou por inatividade.\nEntre novamente para continuar."
+        )
+        
+        from ui.login_window import LoginWindow
+        usuario = LoginWindow(self.master, on_login_success=lambda usuario: None).show()
+        if not usuario:
+            return False
+        
+        self.usuario = usuario
+        event_log.definir_usuario(usuario['id'])
+        self.master.title(f"GF Informática - {usuario['nome_completo']}")
+        self.usuario_label.config(text=f"👤 {usuario['nome_completo']}")
+        return True
+    
+    def _alternar_perfil(self):
+        """Liga a captura de perfil das próximas ações ou encerra a captura em andamento"""
+        if profiler.ativo:
+            resumo = profiler.finalizar()
+            self.status_bar.config(text=f"Perfil gravado em {resumo}")
+            return
+        
+        acoes = int(os.getenv('PROFILE_ACTIONS', '0')) or 10
+        profiler.ativar(acoes)
+        self.status_bar.config(text=f"Perfil ativo para as próximas {acoes} ações (Ctrl+Shift+P encerra)")
+    
     def _sobre(self):
         """Exibe informações sobre o sistema"""
         messagebox.showinfo(
@@ -236,4 +505,7 @@ class MainWindow:
         """Sai do sistema"""
         if messagebox.askokcancel("Sair", "Deseja realmente sair do sistema?"):
             logger.info(f"Usuário {self.usuario['username']} saiu do sistema")
+            auth_service.encerrar_sessao(self.usuario.get('sessao'))
+            from services.prazo_service import prazo_service
+            prazo_service.parar()
             self.master.quit()
\ No newline at end of file
@@ -10,6 +10,7 @@ import logging
 from services.os_service import os_service
 from services.cliente_service import cliente_service
 from utils.validators import validators
+from utils.event_log import acao_ui
 
 logger = logging.getLogger(__name__)
 
@@ -304,6 +305,7 @@ class OSWindow:
         except:
             self.prazo_data_label.config(text="")
     
+    @acao_ui()
     def _buscar_cliente(self):
         """Busca clientes por nome ou CPF"""
         termo = self.cliente_search_entry.get().strip()
@@ -411,6 +413,7 @@ class OSWindow:
         if current > 0:
             self.notebook.select(current - 1)
     
+    @acao_ui()
     def _gerar_os(self):
         """Gera a Ordem de Serviço"""
         # Validação básica de cliente
@@ -582,7 +585,7 @@ class OSWindow:
         ttk.Label(filter_frame, text="Status:").grid(row=0, column=2, sticky=tk.W, padx=5)
         self.filtro_status_combo = ttk.Combobox(
             filter_frame,
-            values=["Todos", "Aberta", "Em Andamento", "Concluída", "Cancelada"],
+            values=["Todos", "Aberta", "Em Andamento", "Atrasadas", "Concluída", "Cancelada"],
             state="readonly",
             width=15
         )
@@ -656,6 +659,7 @@ class OSWindow:
         self.os_context_menu = tk.Menu(self.os_tree, tearoff=0)
         self.os_context_menu.add_command(label="👁️ Visualizar Detalhes", command=self._visualizar_os_detalhes)
         self.os_context_menu.add_command(label="📄 Gerar PDF", command=self._gerar_pdf_os_selecionada)
+        self.os_context_menu.add_command(label="🖨️ Imprimir", command=self._imprimir_os_selecionadas)
         self.os_context_menu.add_separator()
         self.os_context_menu.add_command(label="🔄 Atualizar Status", command=self._atualizar_status_os)
         self.os_context_menu.add_command(label="📝 Adicionar Observação", command=self._adicionar_observacao_os)
@@ -690,6 +694,7 @@ class OSWindow:
         # Carrega OS inicialmente
         self._carregar_todas_os()
     
+    @acao_ui()
     def _buscar_os(self):
         """Busca OS com base nos filtros"""
         numero = self.filtro_numero_entry.get().strip().upper()
@@ -713,6 +718,22 @@ class OSWindow:
                     )
                 return
             
+            # OS com prazo vencido (índice parcial das OS em aberto)
+            if status_texto == "Atrasadas":
+                limite = 100
+                os_list = os_service.listar_atrasadas(limite=limite)
+                for os in os_list:
+                    self._adicionar_os_na_tabela(os)
+                logger.info(f"{len(os_list)} OS atrasadas encontradas")
+                if len(os_list) == limite:
+                    messagebox.showinfo(
+                        "OS atrasadas",
+                        f"Exibindo as {limite} OS com prazo mais antigo.\n"
+                        "Pode haver outras atrasadas além destas.",
+                        parent=self.window
+                    )
+                return
+            
             # Busca por status
             status_map = {
                 "Todos": None,
@@ -738,6 +759,7 @@ class OSWindow:
                 parent=self.window
             )
     
+    @acao_ui()
     def _carregar_todas_os(self):
         """Carrega todas as OS"""
         try:
@@ -745,8 +767,11 @@ class OSWindow:
             for item in self.os_tree.get_children():
                 self.os_tree.delete(item)
             
-            # Busca todas as OS
-            os_list = os_service.listar_todas(limite=200)
+            # Busca todas as OS (a primeira carga pode vir do pré-carregamento do login)
+            from services.preload_service import preload_service
+            os_list = preload_service.obter_os_recentes()
+            if os_list is None:
+                os_list = os_service.listar_todas(limite=200)
             
             for os in os_list:
                 self._adicionar_os_na_tabela(os)
@@ -780,6 +805,12 @@ class OSWindow:
         elif os['status'] == 'cancelada':
             tags = ('cancelada',)
         
+        # Destaca as OS em aberto com prazo vencido
+        if (os['status'] in ('aberta', 'em_andamento')
+                and os['prazo_previsto'] and os['prazo_previsto'] < date.today()):
+            tags += ('atrasada',)
+            prazo = f"⚠️ {prazo}"
+        
         self.os_tree.insert(
             "",
             tk.END,
@@ -800,6 +831,7 @@ class OSWindow:
         self.os_tree.tag_configure('em_andamento', background='#fff4e6')
         self.os_tree.tag_configure('concluida', background='#e6ffe6')
         self.os_tree.tag_configure('cancelada', background='#f0f0f0')
+        self.os_tree.tag_configure('atrasada', foreground='#c0392b')
     
     def _limpar_filtros(self):
         """Limpa os filtros e recarrega todas as OS"""
@@ -807,6 +839,7 @@ class OSWindow:
         self.filtro_status_combo.set("Todos")
         self._carregar_todas_os()
     
+    @acao_ui()
     def _visualizar_os_detalhes(self, event=None):
         """Visualiza detalhes completos de uma OS"""
         selection = self.os_tree.selection()
@@ -969,6 +1002,14 @@ class OSWindow:
                 messagebox.showerror("Erro", "OS não encontrada!", parent=self.window)
                 return
             
+            if os.get('arquivada'):
+                messagebox.showinfo(
+                    "OS arquivada",
+                    f"A OS {numero_os} está arquivada e não pode ser alterada.",
+                    parent=self.window
+                )
+                return
+            
             # Janela de atualização de status
             status_window = tk.Toplevel(self.window)
             status_window.title(f"Atualizar Status - {numero_os}")
@@ -1066,6 +1107,14 @@ class OSWindow:
                 messagebox.showerror("Erro", "OS não encontrada!", parent=self.window)
                 return
             
+            if os.get('arquivada'):
+                messagebox.showinfo(
+                    "OS arquivada",
+                    f"A OS {numero_os} está arquivada e não pode ser alterada.",
+                    parent=self.window
+                )
+                return
+            
             # Janela para adicionar observação
             obs_window = tk.Toplevel(self.window)
             obs_window.title(f"Adicionar Observação - {numero_os}")
@@ -1143,6 +1192,7 @@ class OSWindow:
             logger.error(f"Erro ao gerar PDF: {e}")
             messagebox.showerror("Erro", str(e), parent=self.window)
     
+    @acao_ui()
     def _gerar_pdf_os(self, os_id):
         """Gera PDF de uma OS (será implementado com pdf_preview_window)"""
         try:
@@ -1155,6 +1205,40 @@ class OSWindow:
                 parent=self.window
             )
     
+    @acao_ui()
+    def _imprimir_os_selecionadas(self):
+        """Envia as OS selecionadas para a fila de impressão"""
+        selection = self.os_tree.selection()
+        
+        if not selection:
+            messagebox.showwarning(
+                "Nenhuma OS selecionada",
+                "Selecione uma OS na lista!",
+                parent=self.window
+            )
+            return
+        
+        try:
+            from utils.print_spool import print_spool
+            
+            for item_id in selection:
+                numero_os = self.os_tree.item(item_id)['values'][0]
+                os = os_service.buscar_por_numero(numero_os)
+                
+                if os:
+                    # O PDF é gerado pela própria fila, fora da thread da interface
+                    print_spool.enviar_os(os['id'], f"OS {numero_os}")
+            
+            messagebox.showinfo(
+                "Imprimindo",
+                f"{len(selection)} OS enviada(s) para a fila de impressão!",
+                parent=self.window
+            )
+            
+        except Exception as e:
+            logger.error(f"Erro ao enviar OS para impressão: {e}")
+            messagebox.showerror("Erro", str(e), parent=self.window)
+    
     def _mostrar_os_context_menu(self, event):
         """Mostra menu de contexto"""
         item = self.os_tree.identify_row(event.y)
@@ -6,10 +6,11 @@ Exibe preview do PDF e permite salvar ou imprimir
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os as os_module
-import tempfile
 import logging
 from utils.pdf_generator import pdf_generator
 from services.os_service import os_service
+from utils.print_spool import print_spool
+from utils.event_log import acao_ui
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +30,7 @@ class PDFPreviewWindow:
         """
         self.master = master
         self.os_id = os_id
-        self.pdf_path = None
+        self.pdf_bytes = None
         self.os_data = None
         
         # Cria janela primeiro
@@ -38,8 +39,8 @@ class PDFPreviewWindow:
         self.window.geometry("600x400")
         self.window.transient(master)
         
-        # Tenta gerar PDF
-        if not self._gerar_pdf_temp():
+        # Tenta gerar PDF (ou obter do cache)
+        if not self._gerar_pdf():
             # Se falhou, fecha a janela
             self.window.destroy()
             return
@@ -49,9 +50,10 @@ class PDFPreviewWindow:
         
         logger.info(f"Janela de preview aberta para OS ID {os_id}")
     
-    def _gerar_pdf_temp(self):
+    @acao_ui()
+    def _gerar_pdf(self):
         """
-        Gera PDF temporário
+        Gera o PDF da OS em memória (reaproveitando o cache se a OS não mudou)
         
         Returns:
             bool: True se sucesso, False se falhou
@@ -66,14 +68,10 @@ class PDFPreviewWindow:
             # Armazena dados da OS
             self.os_data = ordem_servico
             
-            # Cria arquivo temporário
-            temp_dir = tempfile.gettempdir()
-            self.pdf_path = os_module.path.join(temp_dir, f"OS_{ordem_servico['numero_os']}_temp.pdf")
+            # Gera PDF (reaproveita os dados já carregados)
+            self.pdf_bytes = pdf_generator.gerar_pdf_os_bytes(self.os_id, ordem_servico)
             
-            # Gera PDF
-            pdf_generator.gerar_pdf_os(self.os_id, self.pdf_path)
-            
-            logger.info(f"PDF temporário gerado: {self.pdf_path}")
+            logger.info(f"PDF pronto para preview: OS {ordem_servico['numero_os']}")
             return True
             
         except Exception as e:
@@ -177,6 +175,7 @@ class PDFPreviewWindow:
             foreground="blue"
         ).pack(side=tk.BOTTOM, pady=10)
     
+    @acao_ui()
     def _salvar_pdf(self):
         """Salva o PDF em local escolhido pelo usuário"""
         try:
@@ -195,9 +194,9 @@ class PDFPreviewWindow:
             if not arquivo_destino:
                 return  # Usuário cancelou
             
-            # Copia o arquivo temporário para o destino
-            import shutil
-            shutil.copy2(self.pdf_path, arquivo_destino)
+            # Grava o PDF em memória direto no destino
+            with open(arquivo_destino, 'wb') as arquivo:
+                arquivo.write(self.pdf_bytes)
             
             logger.info(f"PDF salvo em: {arquivo_destino}")
             
@@ -220,62 +219,24 @@ class PDFPreviewWindow:
                 parent=self.window
             )
     
+    @acao_ui()
     def _imprimir_pdf(self):
-        """Envia o PDF para impressão"""
+        """Envia o PDF para a fila de impressão (não espera o spooler)"""
         try:
-            import platform
-            sistema = platform.system()
+            print_spool.enviar_pdf(
+                self.pdf_bytes,
+                f"OS {self.os_data['numero_os']}",
+                os_id=self.os_id
+            )
             
-            if sistema == "Windows":
-                # Windows: usa o comando padrão de impressão
-                os_module.startfile(self.pdf_path, "print")
-                messagebox.showinfo(
-                    "Imprimindo",
-                    "PDF enviado para impressão!\n\n"
-                    "Verifique a fila de impressão do sistema.",
-                    parent=self.window
-                )
-                
-            elif sistema == "Darwin":  # macOS
-                # macOS: abre o Preview para impressão
-                import subprocess
-                subprocess.run(["open", "-a", "Preview", self.pdf_path])
-                messagebox.showinfo(
-                    "Imprimindo",
-                    "PDF aberto no Preview.\n\n"
-                    "Use Cmd+P para imprimir.",
-                    parent=self.window
-                )
-                
-            elif sistema == "Linux":
-                # Linux: tenta usar lpr ou abre com o leitor padrão
-                import subprocess
-                try:
-                    subprocess.run(["lpr", self.pdf_path], check=True)
-                    messagebox.showinfo(
-                        "Imprimindo",
-                        "PDF enviado para impressão!",
-                        parent=self.window
-                    )
-                except:
-                    # Se lpr não funcionar, abre com xdg-open
-                    subprocess.run(["xdg-open", self.pdf_path])
-                    messagebox.showinfo(
-                        "PDF Aberto",
-                        "PDF aberto no leitor padrão.\n\n"
-                        "Use a opção de impressão do aplicativo.",
-                        parent=self.window
-                    )
-            else:
-                # Sistema desconhecido
-                messagebox.showwarning(
-                    "Sistema não suportado",
-                    "Impressão direta não disponível neste sistema.\n\n"
-                    "Salve o PDF e imprima manualmente.",
-                    parent=self.window
-                )
+            messagebox.showinfo(
+                "Imprimindo",
+                "PDF enviado para a fila de impressão!\n\n"
+                "Acompanhe em Ordem de Serviço > Fila de Impressão.",
+                parent=self.window
+            )
             
-            logger.info("PDF enviado para impressão")
+            logger.info("PDF enviado para a fila de impressão")
             
         except Exception as e:
             logger.error(f"Erro ao imprimir PDF: {e}")
@@ -311,13 +272,6 @@ class PDFPreviewWindow:
             )
     
     def _fechar(self):
-        """Fecha a janela e limpa arquivos temporários"""
-        try:
-            # Remove arquivo temporário
-            if self.pdf_path and os_module.path.exists(self.pdf_path):
-                os_module.remove(self.pdf_path)
-                logger.info(f"Arquivo temporário removido: {self.pdf_path}")
-        except Exception as e:
-            logger.warning(f"Erro ao remover arquivo temporário: {e}")
-        
-        self.window.destroy()
\ No newline at end of file
+        """Fecha a janela e libera o PDF em memória"""
+        self.pdf_bytes = None
+        self.window.destroy()
@@ -0,0 +1,163 @@
+"""
+Janela da Fila de Impressão
+Mostra o andamento dos trabalhos e permite repetir ou cancelar
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+import logging
+from utils.print_spool import print_spool, PrintJob
+
+logger = logging.getLogger(__name__)
+
+
+class PrintQueueWindow:
+    """
+    Janela de acompanhamento da fila de impressão
+    """
+
+    # Intervalo de atualização da lista (ms)
+    INTERVALO_ATUALIZACAO = 500
+
+    def __init__(self, master):
+        """
+        Inicializa a janela da fila
+
+        Args:
+            master: Janela pai
+        """
+        self.master = master
+
+        self.window = tk.Toplevel(master)
+        self.window.title("Fila de Impressão")
+        self.window.geometry("760x360")
+        self.window.transient(master)
+
+        self._criar_interface()
+        self.window.protocol("WM_DELETE_WINDOW", self._fechar)
+
+        self._agendamento = None
+        self._atualizar()
+
+        logger.info("Janela da fila de impressão aberta")
+
+    def _criar_interface(self):
+        """Cria a interface da janela"""
+        main_frame = ttk.Frame(self.window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        colunas = ('id', 'documento', 'status', 'tentativas', 'horario', 'erro')
+        self.tree = ttk.Treeview(main_frame, columns=colunas, show='headings', height=10)
+
+        self.tree.heading('id', text='#')
+        self.tree.heading('documento', text='Documento')
+        self.tree.heading('status', text='Status')
+        self.tree.heading('tentativas', text='Tentativas')
+        self.tree.heading('horario', text='Horário')
+        self.tree.heading('erro', text='Erro')
+
+        self.tree.column('id', width=40, anchor=tk.CENTER)
+        self.tree.column('documento', width=160)
+        self.tree.column('status', width=100)
+        self.tree.column('tentativas', width=80, anchor=tk.CENTER)
+        self.tree.column('horario', width=80, anchor=tk.CENTER)
+        self.tree.column('erro', width=280)
+
+        self.tree.tag_configure('erro', foreground='red')
+        self.tree.tag_configure('concluido', foreground='green')
+
+        scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        button_frame = ttk.Frame(self.window, padding=(10, 0, 10, 10))
+        button_frame.pack(fill=tk.X)
+
+        ttk.Button(button_frame, text="🔁 Tentar Novamente", command=self._tentar_novamente, width=18).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="⛔ Cancelar", command=self._cancelar, width=12).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="🧹 Limpar Concluídos", command=self._limpar, width=18).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Fechar", command=self._fechar, width=10).pack(side=tk.RIGHT, padx=5)
+
+    def _atualizar(self):
+        """Atualiza a lista com o estado atual da fila e agenda a próxima atualização"""
+        trabalhos = print_spool.listar_trabalhos()
+        ids = set()
+
+        for trabalho in trabalhos:
+            iid = str(trabalho.id)
+            ids.add(iid)
+
+            tag = ()
+            if trabalho.status == PrintJob.ERRO:
+                tag = ('erro',)
+            elif trabalho.status == PrintJob.CONCLUIDO:
+                tag = ('concluido',)
+
+            valores = (
+                trabalho.id,
+                trabalho.descricao,
+                PrintJob.ROTULOS[trabalho.status],
+                trabalho.tentativas,
+                trabalho.criado_em.strftime('%H:%M:%S'),
+                trabalho.erro or ''
+            )
+
+            if self.tree.exists(iid):
+                self.tree.item(iid, values=valores, tags=tag)
+            else:
+                self.tree.insert('', tk.END, iid=iid, values=valores, tags=tag)
+
+        # Remove da lista os trabalhos que saíram da fila
+        for iid in self.tree.get_children():
+            if iid not in ids:
+                self.tree.delete(iid)
+
+        self._agendamento = self.window.after(self.INTERVALO_ATUALIZACAO, self._atualizar)
+
+    def _trabalho_selecionado(self):
+        """Retorna o ID do trabalho selecionado ou None"""
+        selection = self.tree.selection()
+
+        if not selection:
+            messagebox.showwarning("Nenhum trabalho selecionado", "Selecione um trabalho na lista!", parent=self.window)
+            return None
+
+        return int(selection[0])
+
+    def _tentar_novamente(self):
+        """Recoloca na fila o trabalho selecionado"""
+        job_id = self._trabalho_selecionado()
+        if job_id is None:
+            return
+
+        if not print_spool.tentar_novamente(job_id):
+            messagebox.showinfo(
+                "Fila de Impressão",
+                "Só é possível repetir trabalhos com erro ou cancelados.",
+                parent=self.window
+            )
+
+    def _cancelar(self):
+        """Cancela o trabalho selecionado"""
+        job_id = self._trabalho_selecionado()
+        if job_id is None:
+            return
+
+        if not print_spool.cancelar(job_id):
+            messagebox.showinfo(
+                "Fila de Impressão",
+                "Só é possível cancelar trabalhos que ainda estão na fila.",
+                parent=self.window
+            )
+
+    def _limpar(self):
+        """Remove os trabalhos concluídos e cancelados da lista"""
+        print_spool.limpar_finalizados()
+
+    def _fechar(self):
+        """Fecha a janela (a fila continua funcionando)"""
+        if self._agendamento:
+            self.window.after_cancel(self._agendamento)
+        self.window.destroy()
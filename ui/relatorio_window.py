@@ -0,0 +1,147 @@
+"""
+Janela do Relatório por Período
+Gera o relatório gerencial de OS em PDF sem travar a interface
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+import threading
+import logging
+from datetime import date, datetime
+from utils.pdf_generator import pdf_generator
+
+logger = logging.getLogger(__name__)
+
+
+class RelatorioWindow:
+    """
+    Janela para escolher o período e gerar o relatório de OS
+    """
+
+    # Intervalo de verificação da geração em segundo plano (ms)
+    INTERVALO_VERIFICACAO = 200
+
+    def __init__(self, master):
+        """
+        Inicializa a janela do relatório
+
+        Args:
+            master: Janela pai
+        """
+        self.master = master
+        self.thread = None
+        self.resultado = None
+
+        self.window = tk.Toplevel(master)
+        self.window.title("Relatório de OS por Período")
+        self.window.geometry("420x260")
+        self.window.transient(master)
+        self.window.grab_set()
+
+        self._criar_interface()
+        self.window.protocol("WM_DELETE_WINDOW", self._fechar)
+
+        logger.info("Janela de relatório por período aberta")
+
+    def _criar_interface(self):
+        """Cria a interface da janela"""
+        frame = ttk.Frame(self.window, padding="20")
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(frame, text="Relatório de Ordens de Serviço", font=("Arial", 12, "bold")).pack(pady=(0, 15))
+
+        hoje = date.today()
+
+        datas_frame = ttk.Frame(frame)
+        datas_frame.pack(pady=5)
+
+        ttk.Label(datas_frame, text="Data inicial:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
+        self.inicio_entry = ttk.Entry(datas_frame, width=15)
+        self.inicio_entry.grid(row=0, column=1, padx=5, pady=5)
+        self.inicio_entry.insert(0, hoje.replace(day=1).strftime('%d/%m/%Y'))
+
+        ttk.Label(datas_frame, text="Data final:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
+        self.fim_entry = ttk.Entry(datas_frame, width=15)
+        self.fim_entry.grid(row=1, column=1, padx=5, pady=5)
+        self.fim_entry.insert(0, hoje.strftime('%d/%m/%Y'))
+
+        ttk.Label(frame, text="Formato: dd/mm/aaaa", foreground="gray", font=("Arial", 8)).pack()
+
+        self.status_label = ttk.Label(frame, text="", foreground="blue")
+        self.status_label.pack(pady=10)
+
+        button_frame = ttk.Frame(frame)
+        button_frame.pack(pady=10)
+
+        self.btn_gerar = ttk.Button(button_frame, text="📄 Gerar PDF", command=self._gerar, width=15)
+        self.btn_gerar.pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Fechar", command=self._fechar, width=12).pack(side=tk.LEFT, padx=5)
+
+    def _gerar(self):
+        """Valida o período, pede o destino e inicia a geração"""
+        try:
+            inicio = datetime.strptime(self.inicio_entry.get().strip(), '%d/%m/%Y').date()
+            fim = datetime.strptime(self.fim_entry.get().strip(), '%d/%m/%Y').date()
+        except ValueError:
+            messagebox.showerror("Erro", "Informe as datas no formato dd/mm/aaaa!", parent=self.window)
+            return
+
+        if fim < inicio:
+            messagebox.showerror("Erro", "A data final deve ser igual ou posterior à inicial!", parent=self.window)
+            return
+
+        arquivo_destino = filedialog.asksaveasfilename(
+            parent=self.window,
+            title="Salvar Relatório",
+            defaultextension=".pdf",
+            filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")],
+            initialfile=f"Relatorio_OS_{inicio.strftime('%Y%m%d')}_{fim.strftime('%Y%m%d')}.pdf"
+        )
+
+        if not arquivo_destino:
+            return  # Usuário cancelou
+
+        self.btn_gerar.config(state=tk.DISABLED)
+        self.status_label.config(text="⏳ Gerando relatório...")
+
+        # Períodos longos podem ter dezenas de milhares de OS: gera fora da thread da interface
+        self.resultado = None
+        self.thread = threading.Thread(
+            target=self._executar,
+            args=(inicio, fim, arquivo_destino),
+            daemon=True
+        )
+        self.thread.start()
+        self.window.after(self.INTERVALO_VERIFICACAO, self._verificar)
+
+    def _executar(self, inicio, fim, arquivo_destino):
+        """Gera o relatório (executado em segundo plano)"""
+        try:
+            self.resultado = ('ok', pdf_generator.gerar_relatorio_periodo(inicio, fim, arquivo_destino))
+        except Exception as e:
+            self.resultado = ('erro', e)
+
+    def _verificar(self):
+        """Acompanha a geração e mostra o resultado quando terminar"""
+        if self.thread is None:
+            return
+
+        if self.thread.is_alive():
+            self.window.after(self.INTERVALO_VERIFICACAO, self._verificar)
+            return
+
+        self.thread = None
+        self.btn_gerar.config(state=tk.NORMAL)
+        self.status_label.config(text="")
+
+        tipo, valor = self.resultado
+        if tipo == 'ok':
+            messagebox.showinfo("Relatório Gerado! ✅", f"Relatório salvo em:\n{valor}", parent=self.window)
+        else:
+            logger.error(f"Erro ao gerar relatório: {valor}")
+            messagebox.showerror("Erro", f"Erro ao gerar relatório:\n{valor}", parent=self.window)
+
+    def _fechar(self):
+        """Fecha a janela (uma geração em andamento termina em segundo plano)"""
+        self.thread = None
+        self.window.destroy()
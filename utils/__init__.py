@@ -3,12 +3,28 @@ Módulo de utilitários
 Funções auxiliares: validações, PDF, logs, etc.
 """
 
-from .validators import Validators, validators
-from .logger import setup_logger, app_logger
-from .pdf_generator import OSPDFGenerator, pdf_generator
+from .importacao import exportar_sob_demanda
+
+# Os submódulos só são importados quando o nome é usado: importar o pacote
+# não carrega todas as janelas/serviços (e suas dependências)
+exportar_sob_demanda(__name__, {
+    'Validators': '.validators',
+    'validators': '.validators',
+    'setup_logger': '.logger',
+    'app_logger': '.logger',
+    'PDFCache': '.pdf_cache',
+    'pdf_cache': '.pdf_cache',
+    'OSPDFGenerator': '.pdf_generator',
+    'pdf_generator': '.pdf_generator',
+    'PrintSpool': '.print_spool',
+    'PrintJob': '.print_spool',
+    'print_spool': '.print_spool',
+})
 
 __all__ = [
     'Validators', 'validators',
     'setup_logger', 'app_logger',
-    'OSPDFGenerator', 'pdf_generator'
+    'PDFCache', 'pdf_cache',
+    'OSPDFGenerator', 'pdf_generator',
+    'PrintSpool', 'PrintJob', 'print_spool'
 ]
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""
+Estatísticas de latência
+Percentil usado pelos scripts de diagnóstico e pelos benchmarks
+"""
+
+import math
+from typing import List
+
+
+def percentil(valores_ordenados: List[float], p: float) -> float:
+    """
+    Percentil pelo método do posto mais próximo
+
+    Args:
+        valores_ordenados: Lista em ordem crescente (não vazia)
+        p: Percentil (0-100)
+
+    Returns:
+        Valor do percentil
+    """
+    posto = max(1, math.ceil(p / 100 * len(valores_ordenados)))
+    return valores_ordenados[posto - 1]
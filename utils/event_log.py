@@ -0,0 +1,262 @@
+"""
+Log estruturado de eventos (JSON por linha)
+Registra duração, linhas retornadas, usuário e id de correlação de cada
+chamada de serviço e ação da interface, para análise de latência
+(analisar_eventos.py)
+
+Desligado por padrão: ative com EVENT_LOG=true no .env. Os eventos vão
+para logs/eventos_AAAAMMDD.jsonl, gravados por uma thread própria.
+"""
+
+import atexit
+import contextvars
+import functools
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from utils.tracing import tracer
+from utils.profiler import profiler
+
+# Id de correlação da ação da interface em andamento: as chamadas de serviço
+# feitas durante a ação herdam o mesmo id
+_correlacao: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('correlacao', default=None)
+
+
+class EventLog:
+    """
+    Gravador de eventos em JSON Lines
+
+    Cada evento tem: ts, operacao, tipo ('ui' ou 'servico'), duracao_ms,
+    status ('ok' ou 'erro'), linhas, usuario_id, correlacao e thread.
+    """
+
+    def __init__(self):
+        """Inicializa o log (a thread só é criada no primeiro evento)"""
+        self.ativo = os.getenv('EVENT_LOG', 'false').lower() in ('1', 'true', 'sim')
+        self.pasta = Path(os.getenv('EVENT_LOG_DIR', 'logs'))
+        self.usuario_id = None
+        self._fila = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def definir_usuario(self, usuario_id: Optional[int]):
+        """
+        Define o usuário registrado nos eventos (um usuário por processo)
+
+        Args:
+            usuario_id: ID do usuário logado (None após o logout)
+        """
+        self.usuario_id = usuario_id
+
+    def correlacao_atual(self) -> Optional[str]:
+        """Retorna o id de correlação do contexto atual"""
+        return _correlacao.get()
+
+    @contextmanager
+    def correlacao(self, correlacao_id: Optional[str] = None):
+        """
+        Define um id de correlação durante o bloco
+
+        Args:
+            correlacao_id: Id a usar (padrão: um novo id aleatório)
+        """
+        token = _correlacao.set(correlacao_id or uuid.uuid4().hex[:12])
+        try:
+            yield _correlacao.get()
+        finally:
+            _correlacao.reset(token)
+
+    @contextmanager
+    def medir(self, operacao: str, tipo: str = 'servico'):
+        """
+        Mede o bloco e registra um evento ao final
+
+        O dicionário entregue pelo bloco aceita campos extras
+        (ex.: medicao['linhas'] = 10).
+
+        Args:
+            operacao: Nome da operação (ex.: OSService.criar_os)
+            tipo: 'servico' ou 'ui'
+        """
+        campos = {}
+        if not self.ativo:
+            yield campos
+            return
+
+        inicio = time.perf_counter()
+        status = 'ok'
+        try:
+            yield campos
+        except Exception as e:
+            status = 'erro'
+            campos['erro'] = type(e).__name__
+            raise
+        finally:
+            self.registrar(operacao, (time.perf_counter() - inicio) * 1000, tipo, status, **campos)
+
+    def registrar(self, operacao: str, duracao_ms: float, tipo: str = 'servico', status: str = 'ok', **campos):
+        """
+        Enfileira um evento para gravação
+
+        Args:
+            operacao: Nome da operação
+            duracao_ms: Duração em milissegundos
+            tipo: 'servico' ou 'ui'
+            status: 'ok' ou 'erro'
+            **campos: Campos extras do evento (linhas, erro...)
+        """
+        if not self.ativo:
+            return
+
+        evento = {
+            'ts': datetime.now().isoformat(timespec='milliseconds'),
+            'operacao': operacao,
+            'tipo': tipo,
+            'duracao_ms': round(duracao_ms, 3),
+            'status': status,
+            'usuario_id': self.usuario_id,
+            'correlacao': _correlacao.get(),
+            'thread': threading.current_thread().name,
+        }
+        evento.update(campos)
+
+        self._iniciar_thread()
+        self._fila.put(evento)
+
+    def encerrar(self):
+        """Grava os eventos pendentes e para a thread"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+
+        if thread is not None:
+            self._fila.put(None)
+            thread.join(timeout=5)
+
+    def _iniciar_thread(self):
+        """Cria a thread de gravação no primeiro evento"""
+        if self._thread is not None:
+            return
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._gravar, name='EventLog', daemon=True)
+                self._thread.start()
+                atexit.register(self.encerrar)
+
+    def _gravar(self):
+        """Grava os eventos da fila no arquivo do dia de cada evento"""
+        self.pasta.mkdir(exist_ok=True)
+        arquivo = None
+        data_arquivo = None
+
+        try:
+            while True:
+                evento = self._fila.get()
+                if evento is None:
+                    break
+
+                data = evento['ts'][:10].replace('-', '')
+                if data != data_arquivo:
+                    if arquivo:
+                        arquivo.close()
+                    arquivo = open(self.pasta / f"eventos_{data}.jsonl", 'a', encoding='utf-8')
+                    data_arquivo = data
+
+                arquivo.write(json.dumps(evento, ensure_ascii=False, default=str) + '\n')
+
+                # Descarrega quando a fila esvazia (rajadas viram uma escrita)
+                if self._fila.empty():
+                    arquivo.flush()
+        finally:
+            if arquivo:
+                arquivo.close()
+
+
+def contar_linhas(resultado) -> Optional[int]:
+    """
+    Quantidade de registros de um retorno de serviço
+
+    Args:
+        resultado: Retorno do método
+
+    Returns:
+        Tamanho de listas, 1 para um registro, 0 para None; None se não se aplica
+    """
+    if isinstance(resultado, (list, tuple)):
+        return len(resultado)
+    if isinstance(resultado, dict):
+        return 1
+    if resultado is None:
+        return 0
+    return None
+
+
+def medir_operacao(nome: Optional[str] = None):
+    """
+    Decorator que registra a duração e as linhas de um método de serviço
+    (evento no log e span no rastreamento, se ativos)
+
+    Args:
+        nome: Nome da operação (padrão: Classe.metodo)
+
+    Uso:
+        @staticmethod
+        @medir_operacao()
+        def listar_todas(...):
+    """
+    def decorator(funcao):
+        operacao = nome or funcao.__qualname__
+
+        @functools.wraps(funcao)
+        def wrapper(*args, **kwargs):
+            if not event_log.ativo and not tracer.ativo:
+                return funcao(*args, **kwargs)
+
+            with tracer.span(operacao, 'servico') as span, event_log.medir(operacao, 'servico') as medicao:
+                resultado = funcao(*args, **kwargs)
+                linhas = contar_linhas(resultado)
+                if linhas is not None:
+                    medicao['linhas'] = linhas
+                    if span:
+                        span.atributos['linhas'] = linhas
+                return resultado
+
+        return wrapper
+    return decorator
+
+
+def acao_ui(nome: Optional[str] = None):
+    """
+    Decorator para handlers da interface: mede a ação e abre um id de
+    correlação compartilhado pelas chamadas de serviço feitas nela
+
+    Args:
+        nome: Nome da ação (padrão: Classe.metodo)
+    """
+    def decorator(funcao):
+        operacao = nome or funcao.__qualname__
+
+        @functools.wraps(funcao)
+        def wrapper(*args, **kwargs):
+            if not event_log.ativo and not tracer.ativo and not profiler.ativo:
+                return funcao(*args, **kwargs)
+
+            # Ação disparada dentro de outra (ex.: diálogo modal) mantém o id
+            with event_log.correlacao(event_log.correlacao_atual()):
+                with tracer.span(operacao, 'ui'), event_log.medir(operacao, 'ui'):
+                    return profiler.executar(operacao, funcao, *args, **kwargs)
+
+        return wrapper
+    return decorator
+
+
+# Instância global
+event_log = EventLog()
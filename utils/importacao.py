@@ -0,0 +1,58 @@
+"""
+Importação sob demanda dos pacotes do sistema
+Os __init__ dos pacotes exportam nomes sem importar os submódulos
+"""
+
+import sys
+import types
+import importlib
+from typing import Dict
+
+
+class _PacoteSobDemanda(types.ModuleType):
+    """
+    Módulo de pacote que importa o submódulo de um nome exportado no
+    primeiro acesso ao nome
+    """
+
+    def __getattr__(self, nome):
+        # Só é chamado quando o nome ainda não está no pacote
+        exportacoes = self.__dict__.get('_EXPORTACOES', {})
+        if nome in exportacoes:
+            modulo = importlib.import_module(exportacoes[nome], self.__name__)
+            valor = getattr(modulo, nome)
+            self.__dict__[nome] = valor
+            return valor
+        raise AttributeError(f"module {self.__name__!r} has no attribute {nome!r}")
+
+    def __setattr__(self, nome, valor):
+        # O import de um submódulo grava o módulo como atributo do pacote.
+        # Quando o submódulo exporta um objeto com o mesmo nome (os_service,
+        # pdf_generator...), o pacote mantém o objeto, como no import direto.
+        exportacoes = self.__dict__.get('_EXPORTACOES', {})
+        if (
+            isinstance(valor, types.ModuleType)
+            and exportacoes.get(nome) == f'.{nome}'
+            and hasattr(valor, nome)
+        ):
+            valor = getattr(valor, nome)
+        super().__setattr__(nome, valor)
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(self.__dict__.get('_EXPORTACOES', {})))
+
+
+def exportar_sob_demanda(nome_pacote: str, exportacoes: Dict[str, str]):
+    """
+    Configura um pacote para importar seus submódulos só quando usados
+
+    Args:
+        nome_pacote: __name__ do pacote
+        exportacoes: Nome exportado -> submódulo relativo ('.os_service')
+
+    Uso (no __init__.py):
+        exportar_sob_demanda(__name__, {'OSService': '.os_service'})
+    """
+    pacote = sys.modules[nome_pacote]
+    pacote.__dict__['_EXPORTACOES'] = dict(exportacoes)
+    pacote.__class__ = _PacoteSobDemanda
@@ -0,0 +1,39 @@
+"""
+Impressora de teste da fila de impressão
+Grava o PDF recebido pela entrada padrão em uma pasta, no lugar do spooler
+
+Uso no .env:
+    PRINT_COMMAND=python -m utils.impressora_teste --salvar-em logs/impressos
+Com --falhar, termina com erro (para testar as novas tentativas).
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Impressora de teste da fila de impressão")
+    parser.add_argument('--salvar-em', default='impressos', help="Pasta dos PDFs recebidos")
+    parser.add_argument('--falhar', action='store_true', help="Simula uma impressora com erro")
+    args = parser.parse_args()
+
+    conteudo = sys.stdin.buffer.read()
+
+    if args.falhar:
+        print("impressora de teste: falha simulada", file=sys.stderr)
+        sys.exit(1)
+
+    if not conteudo.startswith(b'%PDF'):
+        print("impressora de teste: entrada não é um PDF", file=sys.stderr)
+        sys.exit(2)
+
+    os.makedirs(args.salvar_em, exist_ok=True)
+    nome = f"impressao_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.pdf"
+    with open(os.path.join(args.salvar_em, nome), 'wb') as arquivo:
+        arquivo.write(conteudo)
+
+
+if __name__ == "__main__":
+    main()
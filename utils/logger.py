@@ -1,66 +1,224 @@
 """
 Configuração de logging para a aplicação
+
+Os registros de todos os módulos vão para uma fila (QueueHandler) e são
+gravados por uma thread própria (QueueListener): quem chama logger.info()
+não espera a escrita em disco. O arquivo gira por tamanho e a cada dia, os
+arquivos antigos são compactados (.gz) e só os últimos LOG_BACKUP_COUNT
+são mantidos.
 """
 
+import atexit
+import gzip
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import shutil
+import sys
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 
+# Pipeline compartilhado (configurado na primeira chamada de setup_logger)
+_listener = None
+
+# Nome do arquivo gravado pelo pipeline (log_file da primeira chamada)
+_arquivo_log = None
+
+# Níveis por módulo lidos de LOG_LEVELS (prevalecem sobre setup_logger)
+_niveis = {}
+
+
+class RotatingGzipFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Arquivo de log que gira por tamanho e na virada do dia
+
+    Os arquivos girados ficam como <arquivo>.1.gz, <arquivo>.2.gz... (o .1 é
+    o mais recente). A compactação roda na thread do QueueListener.
+    """
+
+    def __init__(self, filename, max_bytes=0, backup_count=0, diario=True):
+        """
+        Inicializa o handler
+
+        Args:
+            filename: Caminho do arquivo de log
+            max_bytes: Tamanho máximo antes de girar (0: sem limite)
+            backup_count: Quantidade de arquivos antigos mantidos
+            diario: Gira também na primeira gravação de um novo dia
+        """
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        self.diario = diario
+        self.namer = self._nomear
+        self.rotator = self._compactar
+
+        # Um arquivo de um dia anterior gira na primeira gravação de hoje
+        inicio = time.time()
+        if os.path.exists(self.baseFilename):
+            inicio = os.path.getmtime(self.baseFilename)
+        self.proxima_virada = self._proxima_meia_noite(inicio)
+
+    def shouldRollover(self, record):
+        if self.diario and record.created >= self.proxima_virada:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.proxima_virada = self._proxima_meia_noite(time.time())
+
+    @staticmethod
+    def _proxima_meia_noite(instante):
+        """Timestamp da meia-noite seguinte ao instante"""
+        dia = datetime.fromtimestamp(instante).date() + timedelta(days=1)
+        return datetime(dia.year, dia.month, dia.day).timestamp()
+
+    @staticmethod
+    def _nomear(nome):
+        return nome + '.gz'
+
+    @staticmethod
+    def _compactar(origem, destino):
+        """Compacta o arquivo girado e remove o original"""
+        with open(origem, 'rb') as entrada, gzip.open(destino, 'wb') as saida:
+            shutil.copyfileobj(entrada, saida)
+        os.remove(origem)
+
 
 def setup_logger(name: str, log_file: str = None, level=logging.INFO):
     """
     Configura um logger para a aplicação
-    
+
+    A primeira chamada configura o pipeline de logging de todo o processo
+    (fila, arquivo com rotação e console); as seguintes apenas ajustam o
+    nível do logger pedido.
+
     Args:
         name: Nome do logger
-        log_file: Nome do arquivo de log (opcional)
+        log_file: Nome do arquivo de log (opcional; só vale na primeira
+            chamada, que acontece ao importar este módulo: um arquivo
+            diferente pedido depois é ignorado com um aviso)
         level: Nível de log (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-    
+
     Returns:
         Logger configurado
     """
+    _configurar_pipeline(log_file, level)
+
+    # Configura o logger
+    logger = logging.getLogger(name)
+    logger.setLevel(_niveis.get(name, level))
+    return logger
+
+
+def parse_log_levels(valor: str) -> dict:
+    """
+    Lê os níveis por módulo no formato de LOG_LEVELS
+
+    Args:
+        valor: Ex.: "database.connection=WARNING,services=DEBUG"
+
+    Returns:
+        Dicionário nome do logger -> nível (int)
+
+    Raises:
+        ValueError: Se algum item estiver em formato inválido
+    """
+    niveis = {}
+    for item in (valor or '').split(','):
+        item = item.strip()
+        if not item:
+            continue
+
+        nome, _, nivel = item.partition('=')
+        nivel_numerico = logging.getLevelName(nivel.strip().upper())
+        if not nome.strip() or not isinstance(nivel_numerico, int):
+            raise ValueError(f"Nível de log inválido: '{item}'")
+        niveis[nome.strip()] = nivel_numerico
+    return niveis
+
+
+def parar_logging():
+    """Grava o que ainda está na fila e para a thread de logging"""
+    global _listener
+
+    if _listener is None:
+        return
+
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+def _configurar_pipeline(log_file: str, level):
+    """Instala a fila no logger raiz e inicia a thread de gravação (uma vez)"""
+    global _listener, _niveis, _arquivo_log
+
+    if _listener is not None:
+        if log_file and log_file != _arquivo_log:
+            logging.getLogger(__name__).warning(
+                f"Arquivo de log '{log_file}' ignorado: o log já é gravado em logs/{_arquivo_log}"
+            )
+        return
+
     # Cria pasta de logs se não existir
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
-    
+
     # Define nome do arquivo de log
     if not log_file:
-        log_file = f"gf_informatica_{datetime.now().strftime('%Y%m%d')}.log"
-    
+        log_file = "gf_informatica.log"
+    _arquivo_log = log_file
+
     log_path = log_dir / log_file
-    
-    # Configura o logger
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
-    
-    # Evita duplicação de handlers
-    if logger.handlers:
-        return logger
-    
-    # Handler para arquivo
-    file_handler = logging.FileHandler(log_path, encoding='utf-8')
-    file_handler.setLevel(level)
-    
+
+    # Handler para arquivo (com rotação e compactação)
+    file_handler = RotatingGzipFileHandler(
+        log_path,
+        max_bytes=int(float(os.getenv('LOG_MAX_MB', '10')) * 1024 * 1024),
+        backup_count=max(1, int(os.getenv('LOG_BACKUP_COUNT', '14'))),
+        diario=os.getenv('LOG_ROTATE_DAILY', 'true').lower() in ('1', 'true', 'sim')
+    )
+
     # Handler para console
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.WARNING)  # Apenas warnings e erros no console
-    
+
     # Formato do log
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    
+
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
-    
-    # Adiciona handlers ao logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger
+
+    # Os módulos só colocam o registro na fila; a thread do listener grava
+    fila = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(
+        fila,
+        file_handler,
+        console_handler,
+        respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(parar_logging)
+
+    raiz = logging.getLogger()
+    raiz.addHandler(logging.handlers.QueueHandler(fila))
+    raiz.setLevel(level)
+
+    # Níveis por módulo (ex.: silenciar o log de cada query)
+    try:
+        _niveis = parse_log_levels(os.getenv('LOG_LEVELS', ''))
+    except ValueError as e:
+        print(f"LOG_LEVELS ignorado: {e}", file=sys.stderr)
+
+    for nome, nivel in _niveis.items():
+        logging.getLogger(nome).setLevel(nivel)
 
 
 # Logger padrão da aplicação
-app_logger = setup_logger('gf_informatica')
\ No newline at end of file
+app_logger = setup_logger('gf_informatica')
@@ -0,0 +1,211 @@
+"""
+Cache em disco dos PDFs de Ordens de Serviço
+Os arquivos são endereçados pelo conteúdo da OS + versão do template
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+class PDFCache:
+    """
+    Cache de PDFs gerados, limitado por tamanho (LRU)
+
+    Cada arquivo é salvo como <os_id>_<hash>.pdf, onde o hash é calculado
+    sobre todos os campos da OS e a versão do template. Qualquer alteração
+    na OS (incluindo o atualizado_em mantido pelo banco) gera outra chave.
+    """
+
+    def __init__(self, diretorio: str = None, tamanho_max_mb: float = None):
+        """
+        Inicializa o cache
+
+        Args:
+            diretorio: Pasta dos arquivos (padrão: PDF_CACHE_DIR ou pasta temporária)
+            tamanho_max_mb: Tamanho máximo em MB (padrão: PDF_CACHE_MAX_MB ou 100)
+        """
+        if diretorio is None:
+            diretorio = os.getenv(
+                'PDF_CACHE_DIR',
+                os.path.join(tempfile.gettempdir(), 'gf_informatica_pdf_cache')
+            )
+
+        if tamanho_max_mb is None:
+            tamanho_max_mb = float(os.getenv('PDF_CACHE_MAX_MB', '100'))
+
+        self.diretorio = Path(diretorio)
+        self.tamanho_max = int(tamanho_max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def gerar_chave(ordem_servico: Dict[str, Any], versao_template: str) -> str:
+        """
+        Calcula a chave (hash) de uma OS
+
+        Args:
+            ordem_servico: Dicionário com os dados completos da OS
+            versao_template: Versão do layout do PDF
+
+        Returns:
+            Hash SHA-256 em hexadecimal
+        """
+        conteudo = json.dumps(ordem_servico, sort_keys=True, default=str)
+        hash_obj = hashlib.sha256(versao_template.encode('utf-8'))
+        hash_obj.update(conteudo.encode('utf-8'))
+        return hash_obj.hexdigest()
+
+    def _caminho(self, os_id: int, chave: str) -> Path:
+        """Retorna o caminho do arquivo de uma entrada"""
+        return self.diretorio / f"{os_id}_{chave}.pdf"
+
+    def obter(self, os_id: int, chave: str) -> Optional[str]:
+        """
+        Busca um PDF no cache
+
+        Args:
+            os_id: ID da OS
+            chave: Chave gerada por gerar_chave()
+
+        Returns:
+            Caminho do arquivo ou None se não estiver no cache
+        """
+        caminho = self._caminho(os_id, chave)
+
+        with self._lock:
+            if not caminho.exists():
+                return None
+
+            # Atualiza o mtime para a política LRU
+            try:
+                os.utime(caminho)
+            except OSError:
+                return None
+
+        logger.debug(f"PDF encontrado no cache: {caminho}")
+        return str(caminho)
+
+    def armazenar(self, os_id: int, chave: str, conteudo: bytes) -> str:
+        """
+        Salva um PDF no cache, removendo versões antigas da mesma OS
+
+        Args:
+            os_id: ID da OS
+            chave: Chave gerada por gerar_chave()
+            conteudo: Bytes do PDF
+
+        Returns:
+            Caminho do arquivo salvo
+        """
+        caminho = self._caminho(os_id, chave)
+
+        with self._lock:
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+            self._remover_entradas(os_id, manter=caminho.name)
+
+            # Escrita atômica: arquivo temporário na mesma pasta + replace
+            fd, temp_path = tempfile.mkstemp(dir=self.diretorio, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as arquivo:
+                    arquivo.write(conteudo)
+                os.replace(temp_path, caminho)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+            self._aplicar_limite()
+
+        logger.debug(f"PDF armazenado no cache: {caminho}")
+        return str(caminho)
+
+    def invalidar(self, os_id: int) -> int:
+        """
+        Remove todas as entradas de uma OS
+
+        Args:
+            os_id: ID da OS
+
+        Returns:
+            Quantidade de arquivos removidos
+        """
+        with self._lock:
+            removidos = self._remover_entradas(os_id)
+
+        if removidos:
+            logger.info(f"Cache de PDF invalidado para OS ID {os_id}")
+        return removidos
+
+    def limpar(self) -> int:
+        """
+        Remove todos os PDFs do cache
+
+        Returns:
+            Quantidade de arquivos removidos
+        """
+        removidos = 0
+        with self._lock:
+            if not self.diretorio.exists():
+                return 0
+            for caminho in self.diretorio.glob('*.pdf'):
+                try:
+                    caminho.unlink()
+                    removidos += 1
+                except OSError as e:
+                    logger.warning(f"Erro ao remover {caminho}: {e}")
+        return removidos
+
+    def _remover_entradas(self, os_id: int, manter: str = None) -> int:
+        """Remove os arquivos de uma OS (deve ser chamado com o lock)"""
+        if not self.diretorio.exists():
+            return 0
+
+        removidos = 0
+        for caminho in self.diretorio.glob(f"{os_id}_*.pdf"):
+            if caminho.name == manter:
+                continue
+            try:
+                caminho.unlink()
+                removidos += 1
+            except OSError as e:
+                logger.warning(f"Erro ao remover {caminho}: {e}")
+        return removidos
+
+    def _aplicar_limite(self):
+        """Remove os arquivos menos usados até caber no limite (com o lock)"""
+        entradas = []
+        total = 0
+        for caminho in self.diretorio.glob('*.pdf'):
+            try:
+                stat = caminho.stat()
+            except OSError:
+                continue
+            entradas.append((stat.st_mtime, stat.st_size, caminho))
+            total += stat.st_size
+
+        if total <= self.tamanho_max:
+            return
+
+        # Mais antigos (menos usados) primeiro
+        entradas.sort(key=lambda entrada: entrada[0])
+
+        for _, tamanho, caminho in entradas:
+            if total <= self.tamanho_max:
+                break
+            try:
+                caminho.unlink()
+                total -= tamanho
+                logger.debug(f"PDF removido do cache (LRU): {caminho}")
+            except OSError as e:
+                logger.warning(f"Erro ao remover {caminho}: {e}")
+
+
+# Instância global
+pdf_cache = PDFCache()
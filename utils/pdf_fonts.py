@@ -0,0 +1,236 @@
+"""
+Fontes Unicode dos PDFs
+Registra a fonte TTF embutida (DejaVu Sans) uma única vez por processo
+"""
+
+import io
+import os
+import copy
+import hashlib
+import tempfile
+import threading
+import logging
+from pathlib import Path
+from typing import Iterable, Dict, Tuple
+from fontTools import ttLib, subset as ftsubset
+import fpdf
+from fpdf import FPDF
+
+logger = logging.getLogger(__name__)
+
+DIRETORIO_FONTES = Path(__file__).parent / 'fonts'
+
+# Família usada pelo template e arquivos por estilo
+FAMILIA = 'dejavu'
+ARQUIVOS = {
+    '': 'DejaVuSans.ttf',
+    'B': 'DejaVuSans-Bold.ttf',
+}
+
+# Fonte completa, registrada como fallback só quando o texto precisa
+FAMILIA_COMPLETA = 'dejavu-completa'
+
+# Subconjunto pré-calculado: ASCII, Latin-1, Latin Extended-A e pontuação
+# tipográfica (aspas curvas, travessões, reticências, euro...)
+REPERTORIO = frozenset(
+    list(range(0x20, 0x7F))
+    + list(range(0xA0, 0x180))
+    + [0x2013, 0x2014, 0x2018, 0x2019, 0x201A, 0x201C, 0x201D,
+       0x201E, 0x2022, 0x2026, 0x20AC, 0x2122]
+)
+
+# Caracteres que o fpdf sempre inclui em cada fonte
+_CARACTERES_RESERVADOS = "\x00 \r\n"
+
+# Versão do fpdf2 cujos campos internos do TTFFont a cópia do protótipo
+# conhece (requirements.txt). Em outra versão, as fontes são registradas
+# com FPDF.add_font.
+VERSAO_FPDF_TESTADA = '2.7.9'
+
+
+class FontesPDF:
+    """
+    Cache das fontes TTF por processo
+
+    Ler e analisar um TTF com o fontTools custa dezenas de milissegundos.
+    Aqui isso acontece uma vez por estilo: o subconjunto latino da fonte é
+    calculado em memória, analisado pelo fpdf e guardado como protótipo.
+    Cada documento recebe uma cópia leve do protótipo, que compartilha as
+    tabelas de larguras e glifos e só tem o mapa de subconjunto próprio.
+
+    A cópia depende de campos internos do fpdf2: só é usada na
+    VERSAO_FPDF_TESTADA. Em outra versão (ou se a cópia falhar), cada
+    documento registra a fonte pela API pública (FPDF.add_font), a partir
+    do subconjunto gravado uma vez em disco.
+    """
+
+    def __init__(self):
+        """Inicializa o cache vazio (as fontes são carregadas no primeiro uso)"""
+        self._lock = threading.Lock()
+        # (família, estilo) -> (protótipo TTFFont, bytes do TTF)
+        self._prototipos: Dict[Tuple[str, str], tuple] = {}
+        # (família, estilo) -> arquivo TTF para FPDF.add_font
+        self._arquivos: Dict[Tuple[str, str], Path] = {}
+        self.copiar_prototipo = fpdf.__version__ == VERSAO_FPDF_TESTADA
+        if not self.copiar_prototipo:
+            logger.warning(
+                f"fpdf2 {fpdf.__version__} (testado: {VERSAO_FPDF_TESTADA}): "
+                f"fontes dos PDFs registradas com add_font, sem cópia do protótipo"
+            )
+
+    def registrar(self, pdf: FPDF, textos: Iterable[str] = None):
+        """
+        Registra as fontes da família FAMILIA em um documento
+
+        Args:
+            pdf: Documento FPDF
+            textos: Textos dinâmicos que serão impressos. Se algum caractere
+                estiver fora do REPERTORIO, a fonte completa é registrada como
+                fallback. None registra o fallback sempre (lotes).
+        """
+        for estilo in ARQUIVOS:
+            self._adicionar(pdf, FAMILIA, estilo)
+
+        if textos is None or not self.cabe_no_repertorio(textos):
+            for estilo in ARQUIVOS:
+                self._adicionar(pdf, FAMILIA_COMPLETA, estilo)
+            pdf.set_fallback_fonts([FAMILIA_COMPLETA], exact_match=False)
+
+    @staticmethod
+    def cabe_no_repertorio(textos: Iterable[str]) -> bool:
+        """
+        Verifica se todos os caracteres estão no subconjunto pré-calculado
+
+        Args:
+            textos: Textos a verificar
+
+        Returns:
+            True se a fonte reduzida basta
+        """
+        for texto in textos:
+            for caractere in texto:
+                if ord(caractere) not in REPERTORIO and caractere not in '\r\n\t':
+                    return False
+        return True
+
+    def _adicionar(self, pdf: FPDF, familia: str, estilo: str):
+        """Adiciona a fonte ao documento (cópia do protótipo ou add_font)"""
+        if self.copiar_prototipo:
+            try:
+                self._clonar(pdf, familia, estilo)
+                return
+            except Exception as e:
+                # Campos internos diferentes do esperado: segue pela API pública
+                logger.warning(f"Cópia da fonte {familia}{estilo} falhou, usando add_font: {e}")
+                self.copiar_prototipo = False
+                pdf.fonts.pop(f"{familia}{estilo}", None)
+
+        pdf.add_font(familia, estilo, str(self._obter_arquivo(familia, estilo)))
+
+    def _clonar(self, pdf: FPDF, familia: str, estilo: str):
+        """Adiciona ao documento uma cópia do protótipo da fonte"""
+        from fpdf.fonts import SubsetMap
+
+        prototipo, dados = self._obter_prototipo(familia, estilo)
+
+        fonte = copy.copy(prototipo)
+        fonte.i = len(pdf.fonts) + 1
+        fonte.fontkey = f"{familia}{estilo}"
+        # O fpdf recorta o TTFont na geração do PDF: cada documento precisa do seu
+        fonte.ttfont = ttLib.TTFont(
+            io.BytesIO(dados), recalcTimestamp=False, fontNumber=0, lazy=True
+        )
+        # O descritor recebe o ID do objeto PDF na saída
+        fonte.desc = copy.copy(prototipo.desc)
+        fonte.missing_glyphs = []
+        fonte.hbfont = None
+        fonte.subset = SubsetMap(fonte, [ord(c) for c in _CARACTERES_RESERVADOS])
+
+        pdf.fonts[fonte.fontkey] = fonte
+
+    def _obter_arquivo(self, familia: str, estilo: str) -> Path:
+        """
+        Retorna o arquivo TTF da fonte para FPDF.add_font
+
+        A fonte completa é o próprio arquivo em DIRETORIO_FONTES; o
+        subconjunto é gravado uma vez na pasta temporária (nome pelo hash do
+        conteúdo, reaproveitado entre processos).
+        """
+        chave = (familia, estilo)
+        arquivo = self._arquivos.get(chave)
+        if arquivo:
+            return arquivo
+
+        with self._lock:
+            if chave not in self._arquivos:
+                caminho = DIRETORIO_FONTES / ARQUIVOS[estilo]
+                if familia != FAMILIA:
+                    self._arquivos[chave] = caminho
+                else:
+                    dados = self._gerar_subconjunto(caminho.read_bytes())
+                    pasta = Path(tempfile.gettempdir()) / 'gf_informatica_fontes'
+                    pasta.mkdir(exist_ok=True)
+                    arquivo = pasta / f"{caminho.stem}-{hashlib.sha256(dados).hexdigest()[:16]}.ttf"
+
+                    if not arquivo.exists():
+                        # Escrita atômica: outro processo pode estar lendo
+                        fd, temporario = tempfile.mkstemp(dir=pasta, suffix='.tmp')
+                        try:
+                            with os.fdopen(fd, 'wb') as f:
+                                f.write(dados)
+                            os.replace(temporario, arquivo)
+                        finally:
+                            if os.path.exists(temporario):
+                                os.remove(temporario)
+
+                    self._arquivos[chave] = arquivo
+
+            return self._arquivos[chave]
+
+    def _obter_prototipo(self, familia: str, estilo: str) -> tuple:
+        """Retorna o protótipo da fonte (TTFFont, bytes), carregando no primeiro uso"""
+        from fpdf.fonts import TTFFont
+
+        chave = (familia, estilo)
+        prototipo = self._prototipos.get(chave)
+        if prototipo:
+            return prototipo
+
+        with self._lock:
+            if chave not in self._prototipos:
+                caminho = DIRETORIO_FONTES / ARQUIVOS[estilo]
+                dados = caminho.read_bytes()
+
+                if familia == FAMILIA:
+                    dados = self._gerar_subconjunto(dados)
+
+                documento = FPDF()
+                fonte = TTFFont(documento, io.BytesIO(dados), f"{familia}{estilo}", estilo)
+                self._prototipos[chave] = (fonte, dados)
+
+                logger.info(f"Fonte carregada: {caminho.name} ({familia}, {len(dados)} bytes)")
+
+            return self._prototipos[chave]
+
+    @staticmethod
+    def _gerar_subconjunto(dados: bytes) -> bytes:
+        """Recorta o TTF para o REPERTORIO (de ~6000 para ~400 glifos)"""
+        fonte = ttLib.TTFont(io.BytesIO(dados), recalcTimestamp=False)
+
+        options = ftsubset.Options(notdef_outline=True, recommended_glyphs=True)
+        # Tabelas de layout avançado não são usadas pelo fpdf
+        options.layout_features = []
+        options.drop_tables += ['FFTM', 'GDEF', 'GPOS', 'GSUB', 'MATH', 'hdmx', 'meta']
+        options.ignore_missing_unicodes = True
+
+        subsetter = ftsubset.Subsetter(options)
+        subsetter.populate(unicodes=REPERTORIO)
+        subsetter.subset(fonte)
+
+        saida = io.BytesIO()
+        fonte.save(saida)
+        return saida.getvalue()
+
+
+# Instância global
+fontes_pdf = FontesPDF()
@@ -4,11 +4,15 @@ Utiliza fpdf2 para criar PDFs formatados
 """
 
 import os as os_module  # ← RENOMEADO AQUI
-from datetime import datetime
+from datetime import datetime, date
+from typing import BinaryIO
+from typing import List
 from fpdf import FPDF
 import logging
 from services.os_service import os_service
-from utils.validators import validators
+from utils.pdf_cache import pdf_cache
+from utils.pdf_template import OSPDFTemplate, VERSAO_TEMPLATE
+from utils.pdf_relatorio import RelatorioPeriodoTemplate
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +25,10 @@ class OSPDFGenerator:
     def __init__(self):
         """Inicializa o gerador de PDF"""
         self.app_name = os_module.getenv('APP_NAME', 'GF Informática')  # ← ATUALIZADO
+        
+        # Layout compilado uma única vez e reaproveitado em todas as gerações
+        self.template = OSPDFTemplate(self.app_name)
+        self.relatorio = RelatorioPeriodoTemplate(self.app_name)
     
     def gerar_pdf_os(self, os_id: int, output_path: str = None) -> str:
         """
@@ -34,26 +42,8 @@ class OSPDFGenerator:
             Caminho do arquivo PDF gerado
         """
         try:
-            # Busca dados da OS
-            ordem_servico = os_service.buscar_por_id(os_id)  # ← RENOMEADO
-            
-            if not ordem_servico:
-                raise ValueError(f"OS ID {os_id} não encontrada")
-            
-            # Cria nova instância do PDF para cada geração
-            pdf = FPDF()
-            pdf.add_page()
-            
-            # Configura fonte padrão
-            pdf.set_auto_page_break(auto=True, margin=15)
-            
-            # Gera conteúdo
-            self._adicionar_cabecalho(pdf, ordem_servico)
-            self._adicionar_dados_cliente(pdf, ordem_servico)
-            self._adicionar_configuracao_hardware(pdf, ordem_servico)
-            self._adicionar_defeito_relatado(pdf, ordem_servico)
-            self._adicionar_informacoes_adicionais(pdf, ordem_servico)
-            self._adicionar_rodape(pdf, ordem_servico)
+            ordem_servico = self._buscar_os(os_id)
+            pdf = self._montar_pdf(ordem_servico)
             
             # Define nome do arquivo se não informado
             if not output_path:
@@ -69,203 +59,235 @@ class OSPDFGenerator:
             logger.error(f"Erro ao gerar PDF: {e}")
             raise
     
-    def _adicionar_cabecalho(self, pdf, ordem_servico):
-        """Adiciona cabeçalho com logo e informações da empresa"""
-        # Nome da empresa
-        pdf.set_font('Arial', 'B', 20)
-        pdf.cell(0, 10, self.app_name, 0, 1, 'C')
-        
-        # Subtítulo
-        pdf.set_font('Arial', 'I', 10)
-        pdf.cell(0, 5, 'Sistema de Gerenciamento de Ordem de Servico', 0, 1, 'C')
-        
-        # Linha separadora
-        pdf.ln(5)
-        pdf.set_draw_color(0, 0, 0)
-        pdf.line(10, pdf.get_y(), 200, pdf.get_y())
-        pdf.ln(10)
-        
-        # Título da OS
-        pdf.set_font('Arial', 'B', 16)
-        pdf.cell(0, 10, f'ORDEM DE SERVICO - {ordem_servico["numero_os"]}', 0, 1, 'C')
-        pdf.ln(5)
-        
-        # Informações da OS (caixa)
-        y_start = pdf.get_y()
-        
-        pdf.set_fill_color(240, 240, 240)
-        pdf.rect(10, y_start, 190, 25, 'F')
-        
-        pdf.set_font('Arial', '', 10)
-        
-        # Primeira linha
-        pdf.set_xy(15, y_start + 5)
-        pdf.cell(60, 5, f'Data de Abertura: {ordem_servico["criado_em"].strftime("%d/%m/%Y %H:%M")}')
-        
-        pdf.set_xy(100, y_start + 5)
-        pdf.cell(60, 5, f'Status: {ordem_servico["status"].replace("_", " ").title()}')
-        
-        # Segunda linha
-        pdf.set_xy(15, y_start + 12)
-        pdf.cell(60, 5, f'Responsavel: {ordem_servico["usuario_nome"]}')
-        
-        if ordem_servico['valor_estimado']:
-            pdf.set_xy(100, y_start + 12)
-            pdf.cell(60, 5, f'Valor Estimado: {validators.formatar_valor(ordem_servico["valor_estimado"])}')
-        
-        # Terceira linha
-        if ordem_servico['prazo_previsto']:
-            pdf.set_xy(15, y_start + 19)
-            pdf.cell(60, 5, f'Prazo Previsto: {ordem_servico["prazo_previsto"].strftime("%d/%m/%Y")}')
+    def gerar_pdf_os_cache(self, os_id: int, ordem_servico: dict = None) -> str:
+        """
+        Retorna o PDF de uma OS a partir do cache, gerando apenas se necessário
         
-        if ordem_servico['concluido_em']:
-            pdf.set_xy(100, y_start + 19)
-            pdf.cell(60, 5, f'Concluido em: {ordem_servico["concluido_em"].strftime("%d/%m/%Y %H:%M")}')
+        Args:
+            os_id: ID da OS
+            ordem_servico: Dados da OS já carregados (opcional, evita nova consulta)
         
-        pdf.set_y(y_start + 30)
+        Returns:
+            Caminho do arquivo PDF no cache
+        """
+        try:
+            if ordem_servico is None:
+                ordem_servico = self._buscar_os(os_id)
+            
+            chave = self._chave_cache(ordem_servico)
+            
+            caminho = pdf_cache.obter(os_id, chave)
+            if caminho:
+                logger.info(f"PDF obtido do cache: {caminho}")
+                return caminho
+            
+            pdf = self._montar_pdf(ordem_servico)
+            caminho = pdf_cache.armazenar(os_id, chave, pdf.output())
+            
+            logger.info(f"PDF gerado no cache: {caminho}")
+            return caminho
+            
+        except Exception as e:
+            logger.error(f"Erro ao gerar PDF: {e}")
+            raise
     
-    def _adicionar_dados_cliente(self, pdf, ordem_servico):
-        """Adiciona dados do cliente"""
-        pdf.ln(5)
-        
-        # Título da seção
-        pdf.set_font('Arial', 'B', 12)
-        pdf.set_fill_color(200, 200, 200)
-        pdf.cell(0, 8, 'DADOS DO CLIENTE', 0, 1, 'L', True)
-        pdf.ln(2)
-        
-        # Conteúdo
-        pdf.set_font('Arial', '', 10)
-        
-        pdf.cell(40, 6, 'Nome Completo:', 0, 0, 'L')
-        pdf.set_font('Arial', 'B', 10)
-        pdf.cell(0, 6, f'{ordem_servico["cliente_nome"]} {ordem_servico["cliente_sobrenome"]}', 0, 1, 'L')
+    def gerar_pdf_os_bytes(
+        self,
+        os_id: int,
+        ordem_servico: dict = None,
+        usar_cache: bool = True
+    ) -> bytes:
+        """
+        Gera o PDF de uma OS em memória, sem arquivo temporário
         
-        pdf.set_font('Arial', '', 10)
-        pdf.cell(40, 6, 'CPF:', 0, 0, 'L')
-        pdf.cell(60, 6, ordem_servico['cliente_cpf'], 0, 0, 'L')
-        pdf.cell(20, 6, 'Telefone:', 0, 0, 'L')
-        pdf.cell(0, 6, ordem_servico['cliente_telefone'], 0, 1, 'L')
+        Args:
+            os_id: ID da OS
+            ordem_servico: Dados da OS já carregados (opcional)
+            usar_cache: Se True, consulta e alimenta o cache em disco
         
-        if ordem_servico['cliente_email']:
-            pdf.cell(40, 6, 'Email:', 0, 0, 'L')
-            pdf.cell(0, 6, ordem_servico['cliente_email'], 0, 1, 'L')
+        Returns:
+            Conteúdo do PDF
+        """
+        try:
+            if ordem_servico is None:
+                ordem_servico = self._buscar_os(os_id)
+            
+            if usar_cache:
+                chave = self._chave_cache(ordem_servico)
+                caminho = pdf_cache.obter(os_id, chave)
+                if caminho:
+                    try:
+                        with open(caminho, 'rb') as arquivo:
+                            return arquivo.read()
+                    except OSError as e:
+                        # Removido do cache por outra geração: gera de novo
+                        logger.debug(f"PDF em cache indisponível, gerando: {e}")
+            
+            buffer = self._montar_pdf(ordem_servico).output()
+            
+            if usar_cache:
+                pdf_cache.armazenar(os_id, chave, buffer)
+            
+            logger.info(f"PDF gerado em memória: OS {ordem_servico['numero_os']}")
+            return buffer
+            
+        except Exception as e:
+            logger.error(f"Erro ao gerar PDF: {e}")
+            raise
     
-    def _adicionar_configuracao_hardware(self, pdf, ordem_servico):
-        """Adiciona configuração do hardware"""
-        # Verifica se tem alguma informação de hardware
-        tem_hardware = any([
-            ordem_servico['processador'],
-            ordem_servico['placa_mae'],
-            ordem_servico['memoria_ram'],
-            ordem_servico['armazenamento'],
-            ordem_servico['placa_video'],
-            ordem_servico['outros_componentes']
-        ])
-        
-        if not tem_hardware:
-            return
-        
-        pdf.ln(5)
-        
-        # Título da seção
-        pdf.set_font('Arial', 'B', 12)
-        pdf.set_fill_color(200, 200, 200)
-        pdf.cell(0, 8, 'CONFIGURACAO DO HARDWARE', 0, 1, 'L', True)
-        pdf.ln(2)
-        
-        # Conteúdo
-        pdf.set_font('Arial', '', 10)
-        
-        if ordem_servico['processador']:
-            pdf.cell(0, 6, f"Processador: {ordem_servico['processador']}", 0, 1, 'L')
-        
-        if ordem_servico['placa_mae']:
-            pdf.cell(0, 6, f"Placa-mae: {ordem_servico['placa_mae']}", 0, 1, 'L')
-        
-        if ordem_servico['memoria_ram']:
-            pdf.cell(0, 6, f"Memoria RAM: {ordem_servico['memoria_ram']}", 0, 1, 'L')
-        
-        if ordem_servico['armazenamento']:
-            pdf.cell(0, 6, f"Armazenamento: {ordem_servico['armazenamento']}", 0, 1, 'L')
-        
-        if ordem_servico['placa_video']:
-            pdf.cell(0, 6, f"Placa de Video: {ordem_servico['placa_video']}", 0, 1, 'L')
+    def escrever_pdf_os(
+        self,
+        os_id: int,
+        destino: BinaryIO,
+        ordem_servico: dict = None,
+        usar_cache: bool = True
+    ) -> int:
+        """
+        Escreve o PDF de uma OS em um objeto de arquivo (arquivo, socket, resposta HTTP)
         
-        if ordem_servico['outros_componentes']:
-            # Usa multi_cell apenas aqui, começando em nova linha
-            pdf.cell(0, 6, "Outros Componentes:", 0, 1, 'L')
-            pdf.multi_cell(0, 6, ordem_servico['outros_componentes'])
-
-    def _adicionar_defeito_relatado(self, pdf, ordem_servico):
-        """Adiciona defeito relatado pelo cliente"""
-        pdf.ln(5)
+        O PDF vindo do cache é copiado em blocos; um PDF recém-gerado é escrito
+        direto do buffer do fpdf, sem cópias intermediárias.
         
-        # Título da seção
-        pdf.set_font('Arial', 'B', 12)
-        pdf.set_fill_color(200, 200, 200)
-        pdf.cell(0, 8, 'DEFEITO RELATADO PELO CLIENTE', 0, 1, 'L', True)
-        pdf.ln(2)
+        Args:
+            os_id: ID da OS
+            destino: Objeto com método write() em modo binário
+            ordem_servico: Dados da OS já carregados (opcional)
+            usar_cache: Se True, consulta e alimenta o cache em disco
         
-        # Conteúdo
-        pdf.set_font('Arial', '', 10)
-        pdf.multi_cell(0, 6, ordem_servico['defeito_relatado'])
+        Returns:
+            Quantidade de bytes escritos
+        """
+        try:
+            if ordem_servico is None:
+                ordem_servico = self._buscar_os(os_id)
+            
+            if usar_cache:
+                chave = self._chave_cache(ordem_servico)
+                caminho = pdf_cache.obter(os_id, chave)
+                if caminho:
+                    try:
+                        origem = open(caminho, 'rb')
+                    except OSError as e:
+                        # Removido do cache por outra geração: gera de novo
+                        logger.debug(f"PDF em cache indisponível, gerando: {e}")
+                    else:
+                        escritos = 0
+                        with origem:
+                            for bloco in iter(lambda: origem.read(64 * 1024), b''):
+                                destino.write(bloco)
+                                escritos += len(bloco)
+                        return escritos
+            
+            buffer = self._montar_pdf(ordem_servico).output()
+            
+            if usar_cache:
+                pdf_cache.armazenar(os_id, chave, buffer)
+            
+            destino.write(buffer)
+            return len(buffer)
+            
+        except Exception as e:
+            logger.error(f"Erro ao escrever PDF: {e}")
+            raise
     
-    def _adicionar_informacoes_adicionais(self, pdf, ordem_servico):
-        """Adiciona observações técnicas se houver"""
-        if not ordem_servico['observacoes']:
-            return
-        
-        pdf.ln(5)
+    def gerar_pdf_lote(self, os_ids: List[int], output_path: str = None) -> str:
+        """
+        Gera um único PDF com várias OS, uma por página
         
-        # Título da seção
-        pdf.set_font('Arial', 'B', 12)
-        pdf.set_fill_color(200, 200, 200)
-        pdf.cell(0, 8, 'OBSERVACOES TECNICAS', 0, 1, 'L', True)
-        pdf.ln(2)
+        Args:
+            os_ids: IDs das OS, na ordem de impressão
+            output_path: Caminho do arquivo de saída (opcional)
         
-        # Conteúdo
-        pdf.set_font('Arial', '', 10)
-        pdf.multi_cell(0, 6, ordem_servico['observacoes'])
+        Returns:
+            Caminho do arquivo PDF gerado
+        """
+        try:
+            ordens = (self._buscar_os(os_id) for os_id in os_ids)
+            pdf = self.template.renderizar_lote(ordens)
+            
+            if not output_path:
+                output_path = f"OS_lote_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            
+            pdf.output(output_path)
+            
+            logger.info(f"PDF em lote gerado: {output_path} ({len(os_ids)} OS)")
+            return output_path
+            
+        except Exception as e:
+            logger.error(f"Erro ao gerar PDF em lote: {e}")
+            raise
     
-    def _adicionar_rodape(self, pdf, ordem_servico):
-        """Adiciona rodapé com assinaturas"""
-        # Posiciona no final da página
-        pdf.ln(15)
+    def gerar_relatorio_periodo(self, inicio: date, fim: date, output_path: str = None) -> str:
+        """
+        Gera o relatório gerencial das OS abertas em um período
         
-        # Linha separadora
-        pdf.line(10, pdf.get_y(), 200, pdf.get_y())
-        pdf.ln(10)
+        As OS são lidas do banco em streaming e cada página é gravada no
+        arquivo assim que fica pronta; os totais são calculados no banco.
         
-        # Campos de assinatura
-        y_pos = pdf.get_y()
+        Args:
+            inicio: Primeiro dia do período
+            fim: Último dia do período (inclusive)
+            output_path: Caminho do arquivo de saída (opcional)
         
-        # Assinatura do cliente
-        pdf.set_xy(20, y_pos)
-        pdf.cell(70, 6, '_' * 35, 0, 0, 'C')
+        Returns:
+            Caminho do arquivo PDF gerado
+        """
+        if not output_path:
+            output_path = f"Relatorio_OS_{inicio.strftime('%Y%m%d')}_{fim.strftime('%Y%m%d')}.pdf"
         
-        # Assinatura do técnico
-        pdf.set_xy(110, y_pos)
-        pdf.cell(70, 6, '_' * 35, 0, 0, 'C')
+        try:
+            with open(output_path, 'wb') as arquivo:
+                quantidade = self.escrever_relatorio_periodo(inicio, fim, arquivo)
+            
+            logger.info(f"Relatório do período gerado: {output_path} ({quantidade} OS)")
+            return output_path
+            
+        except Exception as e:
+            logger.error(f"Erro ao gerar relatório do período: {e}")
+            # Não deixa um PDF incompleto para trás
+            if os_module.path.exists(output_path):
+                os_module.remove(output_path)
+            raise
+    
+    def escrever_relatorio_periodo(self, inicio: date, fim: date, destino: BinaryIO) -> int:
+        """
+        Escreve o relatório do período em um objeto de arquivo
         
-        # Legendas
-        pdf.set_xy(20, y_pos + 8)
-        pdf.set_font('Arial', '', 9)
-        pdf.cell(70, 5, 'Assinatura do Cliente', 0, 0, 'C')
+        Args:
+            inicio: Primeiro dia do período
+            fim: Último dia do período (inclusive)
+            destino: Objeto com método write() em modo binário
         
-        pdf.set_xy(110, y_pos + 8)
-        pdf.cell(70, 5, 'Assinatura do Tecnico', 0, 0, 'C')
+        Returns:
+            Quantidade de OS no relatório
+        """
+        if fim < inicio:
+            raise ValueError("A data final deve ser igual ou posterior à data inicial")
+        
+        return self.relatorio.renderizar(
+            destino,
+            inicio,
+            fim,
+            os_service.iterar_por_periodo(inicio, fim),
+            lambda: os_service.totais_por_periodo(inicio, fim)
+        )
+    
+    def _chave_cache(self, ordem_servico: dict) -> str:
+        """Calcula a chave de cache da OS (o nome da empresa também aparece no PDF)"""
+        return pdf_cache.gerar_chave(ordem_servico, f"{VERSAO_TEMPLATE}:{self.app_name}")
+    
+    def _buscar_os(self, os_id: int) -> dict:
+        """Busca os dados completos da OS"""
+        ordem_servico = os_service.buscar_por_id(os_id)
         
-        # Data de emissão
-        pdf.ln(15)
-        pdf.set_font('Arial', 'I', 8)
-        pdf.cell(0, 5, f'Documento gerado em: {datetime.now().strftime("%d/%m/%Y as %H:%M")}', 0, 1, 'C')
+        if not ordem_servico:
+            raise ValueError(f"OS ID {os_id} não encontrada")
         
-        # Informação do sistema
-        pdf.set_font('Arial', 'I', 7)
-        pdf.set_text_color(128, 128, 128)
-        pdf.cell(0, 5, f'{self.app_name} - Sistema de Ordem de Servico v1.0.0', 0, 1, 'C')
-
+        return ordem_servico
+    
+    def _montar_pdf(self, ordem_servico) -> FPDF:
+        """Monta o documento FPDF de uma OS a partir do template"""
+        return self.template.renderizar(ordem_servico)
 
 # Instância global
 pdf_generator = OSPDFGenerator()
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Template do Relatório de Ordens de Serviço por Período
+Tabela com uma linha por OS e totais por status, escrita página a página
+"""
+
+from datetime import datetime, date
+from typing import Iterable, Dict, Any, List, BinaryIO
+from utils.validators import validators
+from utils.pdf_stream import PDFStreamWriter
+
+STATUS_ROTULOS = {
+    'aberta': 'Aberta',
+    'em_andamento': 'Em Andamento',
+    'concluida': 'Concluída',
+    'cancelada': 'Cancelada',
+}
+
+
+class RelatorioPeriodoTemplate:
+    """
+    Layout do relatório gerencial de OS (A4 paisagem)
+
+    As linhas chegam de um iterador (cursor no servidor) e cada página é
+    gravada no destino assim que fica cheia: a memória usada não depende
+    da quantidade de OS do período.
+    """
+
+    # Colunas da tabela: (título, largura em mm, alinhamento, campo)
+    COLUNAS = (
+        ('Nº OS', 22, 'L', 'numero_os'),
+        ('Abertura', 26, 'L', 'criado_em'),
+        ('Cliente', 70, 'L', 'cliente'),
+        ('Técnico', 55, 'L', 'usuario_nome'),
+        ('Status', 26, 'L', 'status'),
+        ('Prazo', 20, 'L', 'prazo_previsto'),
+        ('Concluída em', 24, 'L', 'concluido_em'),
+        ('Valor', 34, 'R', 'valor_estimado'),
+    )
+
+    MARGEM = 10
+    ALTURA_LINHA = 5.5
+    TAMANHO_FONTE = 8
+
+    def __init__(self, app_name: str):
+        """
+        Compila o template
+
+        Args:
+            app_name: Nome da empresa exibido no cabeçalho
+        """
+        self.app_name = app_name
+
+        # Posição x de cada coluna calculada uma única vez
+        self._colunas = []
+        x = self.MARGEM
+        for titulo, largura, align, campo in self.COLUNAS:
+            self._colunas.append((x, largura, align, campo, titulo))
+            x += largura
+        self._largura_tabela = x - self.MARGEM
+
+    def renderizar(
+        self,
+        destino: BinaryIO,
+        inicio: date,
+        fim: date,
+        ordens: Iterable[Dict[str, Any]],
+        obter_totais
+    ) -> int:
+        """
+        Escreve o relatório no destino
+
+        Args:
+            destino: Objeto com método write() em modo binário
+            inicio: Primeiro dia do período
+            fim: Último dia do período
+            ordens: Iterador de OS (consumido uma única vez)
+            obter_totais: Função sem argumentos que retorna os totais por
+                status, chamada depois das linhas (ver OSService.totais_por_periodo)
+
+        Returns:
+            Quantidade de OS impressas
+        """
+        periodo = f"{inicio.strftime('%d/%m/%Y')} a {fim.strftime('%d/%m/%Y')}"
+        emitido_em = datetime.now().strftime("%d/%m/%Y às %H:%M")
+
+        pdf = PDFStreamWriter(destino, titulo=f'Relatório de Ordens de Serviço - {periodo}')
+        limite_y = pdf.altura - self.MARGEM - 8
+
+        y = self._nova_pagina(pdf, periodo, emitido_em)
+        quantidade = 0
+
+        for ordem_servico in ordens:
+            if y + self.ALTURA_LINHA > limite_y:
+                y = self._nova_pagina(pdf, periodo, emitido_em)
+
+            if quantidade % 2:
+                pdf.retangulo(self.MARGEM, y, self._largura_tabela, self.ALTURA_LINHA, 245)
+            self._linha_os(pdf, y, ordem_servico)
+
+            y += self.ALTURA_LINHA
+            quantidade += 1
+
+        if quantidade == 0:
+            pdf.texto(self.MARGEM, y + 4, 'Nenhuma OS aberta no período.', 'I', 9)
+            y += self.ALTURA_LINHA
+
+        self._totais(pdf, y, limite_y, periodo, emitido_em, obter_totais())
+        pdf.fechar()
+        return quantidade
+
+    # ========================================================================
+    # ELEMENTOS DO LAYOUT
+    # ========================================================================
+
+    def _nova_pagina(self, pdf, periodo, emitido_em) -> float:
+        """Inicia uma página com cabeçalho, rodapé e títulos das colunas"""
+        pdf.nova_pagina()
+        direita = pdf.largura - self.MARGEM
+
+        pdf.texto(self.MARGEM, 16, self.app_name, 'B', 14)
+        pdf.texto(self.MARGEM, 22, f'Relatório de Ordens de Serviço - {periodo}', '', 10)
+        pdf.texto(direita - 60, 16, f'Página {pdf.paginas}', '', 9, largura=60, align='R')
+        pdf.linha(self.MARGEM, 25, direita, 25)
+
+        # Rodapé (o total de páginas não é conhecido durante o streaming)
+        rodape_y = pdf.altura - self.MARGEM
+        pdf.texto(self.MARGEM, rodape_y, f'Documento gerado em: {emitido_em}', 'I', 7)
+
+        y = 29
+        pdf.retangulo(self.MARGEM, y, self._largura_tabela, self.ALTURA_LINHA + 1, 200)
+        for x, largura, align, _, titulo in self._colunas:
+            pdf.texto(x + 1, y + 4.3, titulo, 'B', self.TAMANHO_FONTE, largura - 2, align)
+
+        return y + self.ALTURA_LINHA + 2
+
+    def _linha_os(self, pdf, y, ordem_servico):
+        """Imprime uma OS na tabela"""
+        valores = self._formatar_linha(ordem_servico)
+        base = y + 3.9
+
+        for x, largura, align, campo, _ in self._colunas:
+            texto = valores[campo]
+            if not texto:
+                continue
+            texto = pdf.ajustar_texto(texto, largura - 2, '', self.TAMANHO_FONTE)
+            pdf.texto(x + 1, base, texto, '', self.TAMANHO_FONTE, largura - 2, align)
+
+    @staticmethod
+    def _formatar_linha(ordem_servico) -> Dict[str, str]:
+        """Converte os campos de uma OS para texto"""
+        prazo = ordem_servico['prazo_previsto']
+        concluido = ordem_servico['concluido_em']
+        valor = ordem_servico['valor_estimado']
+
+        return {
+            'numero_os': ordem_servico['numero_os'],
+            'criado_em': ordem_servico['criado_em'].strftime('%d/%m/%Y %H:%M'),
+            'cliente': f"{ordem_servico['cliente_nome']} {ordem_servico['cliente_sobrenome']}",
+            'usuario_nome': ordem_servico['usuario_nome'],
+            'status': STATUS_ROTULOS.get(ordem_servico['status'], ordem_servico['status']),
+            'prazo_previsto': prazo.strftime('%d/%m/%Y') if prazo else '',
+            'concluido_em': concluido.strftime('%d/%m/%Y') if concluido else '',
+            'valor_estimado': validators.formatar_valor(valor) if valor is not None else '',
+        }
+
+    def _totais(self, pdf, y, limite_y, periodo, emitido_em, totais: List[Dict[str, Any]]):
+        """Quadro de totais por status (calculados no banco)"""
+        altura_quadro = 12 + self.ALTURA_LINHA * len(totais)
+        if y + altura_quadro > limite_y:
+            y = self._nova_pagina(pdf, periodo, emitido_em)
+
+        y += 4
+        pdf.linha(self.MARGEM, y, self.MARGEM + self._largura_tabela, y)
+        y += 6
+        pdf.texto(self.MARGEM, y, 'TOTAIS DO PERÍODO', 'B', 10)
+
+        x_quantidade = self.MARGEM + 60
+        x_valor = x_quantidade + 30
+        for linha in totais:
+            y += self.ALTURA_LINHA
+            geral = linha['status'] is None
+            estilo = 'B' if geral else ''
+            rotulo = 'Total geral' if geral else STATUS_ROTULOS.get(linha['status'], linha['status'])
+
+            pdf.texto(self.MARGEM, y, rotulo, estilo, 9)
+            pdf.texto(x_quantidade, y, f"{linha['quantidade']} OS", estilo, 9, 25, 'R')
+            pdf.texto(x_valor, y, validators.formatar_valor(linha['valor_total']), estilo, 9, 40, 'R')
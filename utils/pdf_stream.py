@@ -0,0 +1,288 @@
+"""
+Escritor de PDF em streaming
+Grava cada página no destino assim que ela é concluída (relatórios grandes)
+"""
+
+import zlib
+from datetime import datetime
+from typing import BinaryIO, List, Dict
+from fpdf.fonts import CORE_FONTS, CORE_FONTS_CHARWIDTHS
+
+# Conversão de milímetros para pontos PDF
+PT_POR_MM = 72 / 25.4
+
+# Fontes padrão do PDF (não precisam ser embutidas): estilo -> chave do fpdf
+FONTES = {
+    '': 'helvetica',
+    'B': 'helveticaB',
+    'I': 'helveticaI',
+}
+
+
+class PDFStreamWriter:
+    """
+    Gerador de PDF que não guarda o documento em memória
+
+    O fpdf mantém todas as páginas até o output(), o que faz a memória
+    crescer com o número de linhas de um relatório. Aqui cada página é
+    comprimida e escrita no destino ao ser fechada; só os offsets dos
+    objetos (para a tabela xref) ficam em memória.
+
+    Usa apenas as fontes padrão Helvetica (codificação WinAnsi), com as
+    métricas do fpdf. Coordenadas em milímetros, origem no canto superior
+    esquerdo, como no fpdf.
+    """
+
+    # Objetos com número fixo, escritos no fechamento
+    _OBJ_CATALOGO = 1
+    _OBJ_PAGINAS = 2
+
+    def __init__(self, destino: BinaryIO, largura: float = 297, altura: float = 210,
+                 titulo: str = None):
+        """
+        Inicia o documento e grava o cabeçalho
+
+        Args:
+            destino: Objeto com método write() em modo binário
+            largura: Largura da página em mm (padrão: A4 paisagem)
+            altura: Altura da página em mm
+            titulo: Título gravado nas propriedades do documento (opcional)
+        """
+        self.destino = destino
+        self.largura = largura
+        self.altura = altura
+        self.titulo = titulo
+
+        self._posicao = 0
+        self._offsets: Dict[int, int] = {}
+        self._proximo_objeto = 3
+        self._paginas: List[int] = []
+        self._conteudo: List[str] = []
+        self._fonte_atual = None
+
+        self._escrever(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+        # Fontes: um objeto por estilo, referenciado por todas as páginas
+        self._fontes = {}
+        for indice, (estilo, chave) in enumerate(FONTES.items(), start=1):
+            numero = self._novo_objeto(
+                f'<< /Type /Font /Subtype /Type1 /BaseFont /{CORE_FONTS[chave]} '
+                f'/Encoding /WinAnsiEncoding >>'.encode('latin-1')
+            )
+            self._fontes[estilo] = (f'F{indice}', numero)
+
+        self._recursos = '<< /Font << {} >> >>'.format(
+            ' '.join(f'/{nome} {numero} 0 R' for nome, numero in self._fontes.values())
+        )
+
+    @property
+    def paginas(self) -> int:
+        """Quantidade de páginas já iniciadas"""
+        return len(self._paginas) + (1 if self._conteudo else 0)
+
+    # ========================================================================
+    # PÁGINAS
+    # ========================================================================
+
+    def nova_pagina(self):
+        """Fecha a página atual (se houver) e inicia outra"""
+        self._fechar_pagina()
+        # Conteúdo vazio marca a página como iniciada
+        self._conteudo = ['']
+        self._fonte_atual = None
+
+    def fechar(self):
+        """Grava a última página, a árvore de páginas, a xref e o trailer"""
+        if not self._conteudo and not self._paginas:
+            self.nova_pagina()
+        self._fechar_pagina()
+
+        largura_pt = self.largura * PT_POR_MM
+        altura_pt = self.altura * PT_POR_MM
+        kids = ' '.join(f'{numero} 0 R' for numero in self._paginas)
+        self._gravar_objeto(
+            self._OBJ_PAGINAS,
+            f'<< /Type /Pages /Kids [{kids}] /Count {len(self._paginas)} '
+            f'/MediaBox [0 0 {largura_pt:.2f} {altura_pt:.2f}] >>'.encode('latin-1')
+        )
+        self._gravar_objeto(
+            self._OBJ_CATALOGO,
+            f'<< /Type /Catalog /Pages {self._OBJ_PAGINAS} 0 R >>'.encode('latin-1')
+        )
+
+        info = f'/Producer {self._texto_pdf("GF Informática")} '
+        info += f'/CreationDate {self._texto_pdf(datetime.now().strftime("D:%Y%m%d%H%M%S"))}'
+        if self.titulo:
+            info += f' /Title {self._texto_pdf(self.titulo)}'
+        obj_info = self._novo_objeto(f'<< {info} >>'.encode('latin-1'))
+
+        inicio_xref = self._posicao
+        total = self._proximo_objeto
+        linhas = [f'xref\n0 {total}\n', '0000000000 65535 f \n']
+        for numero in range(1, total):
+            linhas.append(f'{self._offsets[numero]:010d} 00000 n \n')
+        linhas.append(
+            f'trailer\n<< /Size {total} /Root {self._OBJ_CATALOGO} 0 R /Info {obj_info} 0 R >>\n'
+            f'startxref\n{inicio_xref}\n%%EOF\n'
+        )
+        self._escrever(''.join(linhas).encode('latin-1'))
+
+    def _fechar_pagina(self):
+        """Comprime e grava o conteúdo da página atual"""
+        if not self._conteudo:
+            return
+
+        dados = zlib.compress('\n'.join(self._conteudo).encode('latin-1'))
+        obj_conteudo = self._novo_objeto(
+            f'<< /Length {len(dados)} /Filter /FlateDecode >>\nstream\n'.encode('latin-1')
+            + dados + b'\nendstream'
+        )
+        obj_pagina = self._novo_objeto(
+            f'<< /Type /Page /Parent {self._OBJ_PAGINAS} 0 R '
+            f'/Resources {self._recursos} /Contents {obj_conteudo} 0 R >>'.encode('latin-1')
+        )
+        self._paginas.append(obj_pagina)
+        self._conteudo = []
+
+    # ========================================================================
+    # DESENHO
+    # ========================================================================
+
+    def largura_texto(self, texto: str, estilo: str = '', tamanho: float = 10) -> float:
+        """
+        Calcula a largura de um texto em mm
+
+        Args:
+            texto: Texto a medir
+            estilo: '', 'B' ou 'I'
+            tamanho: Tamanho da fonte em pontos
+
+        Returns:
+            Largura em mm
+        """
+        larguras = CORE_FONTS_CHARWIDTHS[FONTES[estilo]]
+        # As tabelas do fpdf são indexadas pelo código WinAnsi do caractere
+        texto = texto.encode('cp1252', errors='replace').decode('latin-1')
+        total = sum(larguras[caractere] for caractere in texto)
+        return total * tamanho / 1000 / PT_POR_MM
+
+    def ajustar_texto(self, texto: str, largura: float, estilo: str = '',
+                      tamanho: float = 10) -> str:
+        """
+        Corta o texto com reticências para caber na largura
+
+        Args:
+            texto: Texto original
+            largura: Largura disponível em mm
+            estilo: '', 'B' ou 'I'
+            tamanho: Tamanho da fonte em pontos
+
+        Returns:
+            Texto que cabe na largura
+        """
+        if self.largura_texto(texto, estilo, tamanho) <= largura:
+            return texto
+
+        # Acumula a largura caractere a caractere até esgotar o espaço
+        larguras = CORE_FONTS_CHARWIDTHS[FONTES[estilo]]
+        escala = tamanho / 1000 / PT_POR_MM
+        disponivel = largura - self.largura_texto('...', estilo, tamanho)
+        codificado = texto.encode('cp1252', errors='replace').decode('latin-1')
+
+        usado = 0
+        for indice, caractere in enumerate(codificado):
+            usado += larguras[caractere] * escala
+            if usado > disponivel:
+                return texto[:indice].rstrip() + '...'
+        return texto
+
+    def texto(self, x: float, y: float, texto: str, estilo: str = '',
+              tamanho: float = 10, largura: float = None, align: str = 'L'):
+        """
+        Escreve um texto em uma linha
+
+        Args:
+            x: Posição horizontal em mm
+            y: Linha de base do texto em mm (a partir do topo)
+            texto: Texto (caracteres fora do WinAnsi viram '?')
+            estilo: '', 'B' ou 'I'
+            tamanho: Tamanho da fonte em pontos
+            largura: Largura da caixa em mm (necessária para 'C' e 'R')
+            align: 'L', 'C' ou 'R'
+        """
+        if not texto:
+            return
+
+        if align != 'L' and largura:
+            sobra = largura - self.largura_texto(texto, estilo, tamanho)
+            x += sobra if align == 'R' else sobra / 2
+
+        fonte = (estilo, tamanho)
+        if fonte != self._fonte_atual:
+            nome, _ = self._fontes[estilo]
+            trocar_fonte = f'/{nome} {tamanho:.2f} Tf '
+            self._fonte_atual = fonte
+        else:
+            trocar_fonte = ''
+
+        self._conteudo.append(
+            f'BT {trocar_fonte}{x * PT_POR_MM:.2f} {(self.altura - y) * PT_POR_MM:.2f} Td '
+            f'{self._texto_pdf(texto)} Tj ET'
+        )
+
+    def retangulo(self, x: float, y: float, largura: float, altura: float, cinza: int = 240):
+        """
+        Desenha um retângulo preenchido
+
+        Args:
+            x, y: Canto superior esquerdo em mm
+            largura, altura: Dimensões em mm
+            cinza: Tom de cinza do preenchimento (0-255)
+        """
+        tom = cinza / 255
+        self._conteudo.append(
+            f'q {tom:.3f} g {x * PT_POR_MM:.2f} {(self.altura - y - altura) * PT_POR_MM:.2f} '
+            f'{largura * PT_POR_MM:.2f} {altura * PT_POR_MM:.2f} re f Q'
+        )
+
+    def linha(self, x1: float, y1: float, x2: float, y2: float, espessura: float = 0.2):
+        """
+        Desenha uma linha
+
+        Args:
+            x1, y1, x2, y2: Pontos inicial e final em mm
+            espessura: Espessura em mm
+        """
+        self._conteudo.append(
+            f'{espessura * PT_POR_MM:.2f} w {x1 * PT_POR_MM:.2f} {(self.altura - y1) * PT_POR_MM:.2f} m '
+            f'{x2 * PT_POR_MM:.2f} {(self.altura - y2) * PT_POR_MM:.2f} l S'
+        )
+
+    # ========================================================================
+    # GRAVAÇÃO
+    # ========================================================================
+
+    @staticmethod
+    def _texto_pdf(texto: str) -> str:
+        """Converte para string literal PDF (WinAnsi, com escapes)"""
+        texto = texto.encode('cp1252', errors='replace').decode('latin-1')
+        texto = texto.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+        texto = texto.replace('\r', ' ').replace('\n', ' ')
+        return f'({texto})'
+
+    def _novo_objeto(self, corpo: bytes) -> int:
+        """Grava um objeto com o próximo número livre"""
+        numero = self._proximo_objeto
+        self._proximo_objeto += 1
+        self._gravar_objeto(numero, corpo)
+        return numero
+
+    def _gravar_objeto(self, numero: int, corpo: bytes):
+        """Grava um objeto indireto e registra seu offset"""
+        self._offsets[numero] = self._posicao
+        self._escrever(f'{numero} 0 obj\n'.encode('latin-1') + corpo + b'\nendobj\n')
+
+    def _escrever(self, dados: bytes):
+        """Escreve no destino, contando os bytes (o destino pode não ter tell())"""
+        self.destino.write(dados)
+        self._posicao += len(dados)
@@ -0,0 +1,323 @@
+"""
+Template do PDF de Ordem de Serviço
+O layout é declarado uma única vez; cada renderização só preenche os campos da OS
+"""
+
+from datetime import datetime
+from typing import Iterable, Dict, Any
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+from utils.validators import validators
+from utils.pdf_fonts import fontes_pdf, FAMILIA
+
+# Versão do layout do PDF - altere sempre que o conteúdo gerado mudar,
+# para que os PDFs em cache sejam regenerados
+VERSAO_TEMPLATE = '3'
+
+
+def _formatar_data_hora(valor) -> str:
+    return valor.strftime("%d/%m/%Y %H:%M")
+
+
+def _formatar_data(valor) -> str:
+    return valor.strftime("%d/%m/%Y")
+
+
+def _formatar_status(valor) -> str:
+    return valor.replace("_", " ").title()
+
+
+class OSPDFTemplate:
+    """
+    Template compilado do documento de OS
+
+    A declaração do layout (textos fixos, posições e campos) é processada no
+    construtor: textos estáticos são montados e medidos uma vez só. Na
+    renderização, apenas os campos dinâmicos da OS são formatados.
+    """
+
+    # Caixa de informações: (x, deslocamento y, rótulo, campo, formatador, opcional)
+    # Campos opcionais vazios não são impressos; os obrigatórios vazios saem com '-'
+    CAMPOS_INFO = (
+        (15, 5, 'Data de Abertura', 'criado_em', _formatar_data_hora, False),
+        (100, 5, 'Status', 'status', _formatar_status, False),
+        (15, 12, 'Responsável', 'usuario_nome', str, False),
+        (100, 12, 'Valor Estimado', 'valor_estimado', validators.formatar_valor, True),
+        (15, 19, 'Prazo Previsto', 'prazo_previsto', _formatar_data, True),
+        (100, 19, 'Concluído em', 'concluido_em', _formatar_data_hora, True),
+    )
+
+    # Linhas da seção de hardware: (rótulo, campo)
+    CAMPOS_HARDWARE = (
+        ('Processador', 'processador'),
+        ('Placa-mãe', 'placa_mae'),
+        ('Memória RAM', 'memoria_ram'),
+        ('Armazenamento', 'armazenamento'),
+        ('Placa de Vídeo', 'placa_video'),
+    )
+
+    # Títulos das seções
+    SECAO_CLIENTE = 'DADOS DO CLIENTE'
+    SECAO_HARDWARE = 'CONFIGURAÇÃO DO HARDWARE'
+    SECAO_DEFEITO = 'DEFEITO RELATADO PELO CLIENTE'
+    SECAO_OBSERVACOES = 'OBSERVAÇÕES TÉCNICAS'
+
+    FONTE = FAMILIA
+
+    # Campos de texto livre verificados antes de escolher as fontes
+    CAMPOS_TEXTO = (
+        'numero_os', 'usuario_nome', 'cliente_nome', 'cliente_sobrenome',
+        'cliente_cpf', 'cliente_telefone', 'cliente_email',
+        'processador', 'placa_mae', 'memoria_ram', 'armazenamento',
+        'placa_video', 'outros_componentes', 'defeito_relatado', 'observacoes',
+    )
+
+    def __init__(self, app_name: str):
+        """
+        Compila o template
+
+        Args:
+            app_name: Nome da empresa exibido no cabeçalho e no rodapé
+        """
+        self.app_name = app_name
+
+        # Textos estáticos montados uma única vez
+        self._subtitulo = 'Sistema de Gerenciamento de Ordem de Serviço'
+        self._linha_assinatura = '_' * 35
+        self._rodape_sistema = f'{app_name} - Sistema de Ordem de Serviço v1.0.0'
+
+        # Nome da empresa fora do subconjunto (ex.: APP_NAME em cirílico): toda
+        # OS precisa da fonte completa, não só as com textos livres diferentes
+        self._fixos_no_repertorio = fontes_pdf.cabe_no_repertorio((app_name, self._rodape_sistema))
+
+        # A fonte embutida não tem itálico: textos fixos em itálico usam a
+        # Helvetica do PDF quando cabem no Latin-1, senão a fonte embutida normal
+        textos_italico = (self._subtitulo, self._rodape_sistema, 'Documento gerado em: às')
+        if all(fontes_pdf.cabe_no_repertorio([t]) and self._latin1(t) for t in textos_italico):
+            self._fonte_italico = ('Helvetica', 'I')
+        else:
+            self._fonte_italico = (self.FONTE, '')
+        self._campos_info = tuple(
+            (x, dy, f'{rotulo}: ', campo, formatador, opcional)
+            for x, dy, rotulo, campo, formatador, opcional in self.CAMPOS_INFO
+        )
+        self._campos_hardware = tuple(
+            (f'{rotulo}: ', campo) for rotulo, campo in self.CAMPOS_HARDWARE
+        )
+        self._campos_hardware_todos = (
+            tuple(campo for _, campo in self.CAMPOS_HARDWARE) + ('outros_componentes',)
+        )
+
+    # ========================================================================
+    # RENDERIZAÇÃO
+    # ========================================================================
+
+    def novo_documento(self, textos: Iterable[str] = None) -> FPDF:
+        """
+        Cria um documento vazio configurado para o template
+
+        Args:
+            textos: Textos dinâmicos do documento, usados para decidir se a
+                fonte completa é necessária (None: registra sempre)
+
+        Returns:
+            Instância de FPDF
+        """
+        pdf = FPDF()
+        pdf.set_auto_page_break(auto=True, margin=15)
+        fontes_pdf.registrar(pdf, textos)
+        return pdf
+
+    def renderizar(self, ordem_servico: Dict[str, Any]) -> FPDF:
+        """
+        Gera o documento de uma OS
+
+        Args:
+            ordem_servico: Dicionário com os dados completos da OS
+
+        Returns:
+            Documento FPDF pronto para output()
+        """
+        textos = self._textos(ordem_servico) if self._fixos_no_repertorio else None
+        pdf = self.novo_documento(textos)
+        self.adicionar_os(pdf, ordem_servico)
+        return pdf
+
+    def renderizar_lote(self, ordens: Iterable[Dict[str, Any]]) -> FPDF:
+        """
+        Gera um único documento com várias OS (uma por página)
+
+        Fontes e recursos do documento são compartilhados entre as OS,
+        o que reduz o custo por OS em impressões em lote.
+
+        Args:
+            ordens: Sequência de dicionários com os dados das OS
+
+        Returns:
+            Documento FPDF pronto para output()
+        """
+        pdf = self.novo_documento()
+        for ordem_servico in ordens:
+            self.adicionar_os(pdf, ordem_servico)
+        return pdf
+
+    def adicionar_os(self, pdf: FPDF, ordem_servico: Dict[str, Any]):
+        """
+        Adiciona uma OS em uma nova página do documento
+
+        Args:
+            pdf: Documento FPDF
+            ordem_servico: Dicionário com os dados completos da OS
+        """
+        emitido_em = datetime.now().strftime("%d/%m/%Y às %H:%M")
+
+        pdf.add_page()
+        self._cabecalho(pdf, ordem_servico)
+        self._dados_cliente(pdf, ordem_servico)
+        self._configuracao_hardware(pdf, ordem_servico)
+        self._texto_livre(pdf, self.SECAO_DEFEITO, ordem_servico['defeito_relatado'])
+
+        if ordem_servico['observacoes']:
+            self._texto_livre(pdf, self.SECAO_OBSERVACOES, ordem_servico['observacoes'])
+
+        self._rodape(pdf, emitido_em)
+
+    def _textos(self, ordem_servico):
+        """Textos livres da OS (para a escolha das fontes)"""
+        return [str(ordem_servico[campo]) for campo in self.CAMPOS_TEXTO if ordem_servico.get(campo)]
+
+    @staticmethod
+    def _latin1(texto):
+        """Verifica se o texto pode usar as fontes padrão do PDF"""
+        try:
+            texto.encode('latin-1')
+            return True
+        except UnicodeEncodeError:
+            return False
+
+    # ========================================================================
+    # ELEMENTOS DO LAYOUT
+    # ========================================================================
+
+    def _linha(self, pdf, h, texto, align='L'):
+        """Imprime uma linha de largura total e vai para a próxima"""
+        pdf.cell(0, h, texto, align=align, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    def _titulo_secao(self, pdf, titulo):
+        """Barra cinza com o título da seção"""
+        pdf.ln(5)
+        pdf.set_font(self.FONTE, 'B', 12)
+        pdf.set_fill_color(200, 200, 200)
+        pdf.cell(0, 8, titulo, fill=True, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.ln(2)
+        pdf.set_font(self.FONTE, '', 10)
+
+    def _cabecalho(self, pdf, ordem_servico):
+        """Cabeçalho da empresa, título e caixa de informações da OS"""
+        pdf.set_font(self.FONTE, 'B', 20)
+        self._linha(pdf, 10, self.app_name, 'C')
+
+        pdf.set_font(*self._fonte_italico, 10)
+        self._linha(pdf, 5, self._subtitulo, 'C')
+
+        pdf.ln(5)
+        pdf.set_draw_color(0, 0, 0)
+        pdf.line(10, pdf.get_y(), 200, pdf.get_y())
+        pdf.ln(10)
+
+        pdf.set_font(self.FONTE, 'B', 16)
+        self._linha(pdf, 10, f'ORDEM DE SERVIÇO - {ordem_servico["numero_os"]}', 'C')
+        pdf.ln(5)
+
+        y_start = pdf.get_y()
+        pdf.set_fill_color(240, 240, 240)
+        pdf.rect(10, y_start, 190, 25, 'F')
+
+        pdf.set_font(self.FONTE, '', 10)
+        for x, dy, rotulo, campo, formatador, opcional in self._campos_info:
+            valor = ordem_servico[campo]
+            if not valor and opcional:
+                continue
+            pdf.set_xy(x, y_start + dy)
+            pdf.cell(60, 5, rotulo + (formatador(valor) if valor else '-'))
+
+        pdf.set_y(y_start + 30)
+
+    def _dados_cliente(self, pdf, ordem_servico):
+        """Seção com os dados do cliente"""
+        self._titulo_secao(pdf, self.SECAO_CLIENTE)
+
+        pdf.cell(40, 6, 'Nome Completo:')
+        pdf.set_font(self.FONTE, 'B', 10)
+        self._linha(pdf, 6, f'{ordem_servico["cliente_nome"]} {ordem_servico["cliente_sobrenome"]}')
+
+        pdf.set_font(self.FONTE, '', 10)
+        pdf.cell(40, 6, 'CPF:')
+        pdf.cell(60, 6, ordem_servico['cliente_cpf'])
+        pdf.cell(20, 6, 'Telefone:')
+        self._linha(pdf, 6, ordem_servico['cliente_telefone'])
+
+        if ordem_servico['cliente_email']:
+            pdf.cell(40, 6, 'Email:')
+            self._linha(pdf, 6, ordem_servico['cliente_email'])
+
+    def _configuracao_hardware(self, pdf, ordem_servico):
+        """Seção de hardware (omitida se a OS não tiver nenhum componente)"""
+        if not any(ordem_servico[campo] for campo in self._campos_hardware_todos):
+            return
+
+        self._titulo_secao(pdf, self.SECAO_HARDWARE)
+
+        for rotulo, campo in self._campos_hardware:
+            if ordem_servico[campo]:
+                self._linha(pdf, 6, rotulo + ordem_servico[campo])
+
+        if ordem_servico['outros_componentes']:
+            self._linha(pdf, 6, 'Outros Componentes:')
+            self._paragrafo(pdf, ordem_servico['outros_componentes'])
+
+    def _texto_livre(self, pdf, titulo, texto):
+        """Seção com título e texto em várias linhas"""
+        self._titulo_secao(pdf, titulo)
+        self._paragrafo(pdf, texto)
+
+    def _paragrafo(self, pdf, texto):
+        """
+        Imprime um texto livre justificado
+
+        A quebra de linha do multi_cell é cara; textos curtos, que cabem em
+        uma linha, saem em um cell simples (o resultado visual é o mesmo).
+        """
+        largura_util = pdf.epw - 2 * pdf.c_margin
+        if '\n' not in texto and pdf.get_string_width(texto) <= largura_util:
+            self._linha(pdf, 6, texto)
+        else:
+            pdf.multi_cell(0, 6, texto, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    def _rodape(self, pdf, emitido_em):
+        """Bloco de assinaturas e rodapé"""
+        pdf.ln(15)
+        pdf.line(10, pdf.get_y(), 200, pdf.get_y())
+        pdf.ln(10)
+
+        y_pos = pdf.get_y()
+
+        pdf.set_xy(20, y_pos)
+        pdf.cell(70, 6, self._linha_assinatura, align='C')
+        pdf.set_xy(110, y_pos)
+        pdf.cell(70, 6, self._linha_assinatura, align='C')
+
+        pdf.set_font(self.FONTE, '', 9)
+        pdf.set_xy(20, y_pos + 8)
+        pdf.cell(70, 5, 'Assinatura do Cliente', align='C')
+        pdf.set_xy(110, y_pos + 8)
+        pdf.cell(70, 5, 'Assinatura do Técnico', align='C')
+
+        pdf.ln(15)
+        pdf.set_font(*self._fonte_italico, 8)
+        self._linha(pdf, 5, f'Documento gerado em: {emitido_em}', 'C')
+
+        pdf.set_font(*self._fonte_italico, 7)
+        pdf.set_text_color(128, 128, 128)
+        self._linha(pdf, 5, self._rodape_sistema, 'C')
+        pdf.set_text_color(0, 0, 0)
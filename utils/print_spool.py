@@ -0,0 +1,371 @@
+"""
+Fila de Impressão
+Gera e envia os PDFs para o spooler do sistema em segundo plano, em ordem
+"""
+
+import os
+import time
+import shlex
+import queue
+import platform
+import tempfile
+import threading
+import subprocess
+import logging
+from datetime import datetime
+from typing import Optional, List
+
+logger = logging.getLogger(__name__)
+
+
+class PrintJob:
+    """
+    Trabalho de impressão (uma OS ou um PDF já gerado)
+    """
+
+    PENDENTE = 'pendente'
+    GERANDO = 'gerando'
+    ENVIANDO = 'enviando'
+    CONCLUIDO = 'concluido'
+    ERRO = 'erro'
+    CANCELADO = 'cancelado'
+
+    ROTULOS = {
+        PENDENTE: 'Na fila',
+        GERANDO: 'Gerando PDF',
+        ENVIANDO: 'Enviando',
+        CONCLUIDO: 'Impresso',
+        ERRO: 'Erro',
+        CANCELADO: 'Cancelado',
+    }
+
+    def __init__(self, job_id: int, descricao: str, os_id: int = None, conteudo: bytes = None):
+        """
+        Cria o trabalho
+
+        Args:
+            job_id: Número sequencial do trabalho
+            descricao: Texto exibido na fila
+            os_id: OS a gerar e imprimir (se conteudo não for informado)
+            conteudo: PDF já gerado
+        """
+        self.id = job_id
+        self.descricao = descricao
+        self.os_id = os_id
+        self.conteudo = conteudo
+        self.status = self.PENDENTE
+        self.tentativas = 0
+        self.erro = None
+        self.criado_em = datetime.now()
+        self.concluido_em = None
+
+    @property
+    def finalizado(self) -> bool:
+        """True se o trabalho não será mais processado"""
+        return self.status in (self.CONCLUIDO, self.ERRO, self.CANCELADO)
+
+    def __repr__(self):
+        return f"PrintJob(id={self.id}, descricao={self.descricao!r}, status={self.status})"
+
+
+class PrintSpool:
+    """
+    Fila de impressão com uma thread de trabalho
+
+    Os trabalhos são processados um de cada vez, na ordem de chegada: o PDF
+    é gerado (se necessário) e entregue ao comando de impressão. A interface
+    só enfileira e consulta o estado dos trabalhos, sem esperar o spooler.
+
+    O comando vem de PRINT_COMMAND (padrão: lpr; no Windows, a impressão
+    do leitor de PDF padrão). O PDF é enviado pela entrada padrão, ou como
+    arquivo temporário se o comando tiver o marcador {arquivo}.
+    """
+
+    def __init__(self, comando: str = None, max_tentativas: int = None):
+        """
+        Inicializa a fila (a thread só é criada no primeiro trabalho)
+
+        Args:
+            comando: Comando de impressão (padrão: PRINT_COMMAND)
+            max_tentativas: Tentativas por trabalho (padrão: PRINT_MAX_TENTATIVAS ou 3)
+        """
+        if comando is None:
+            comando = os.getenv('PRINT_COMMAND', '')
+
+        if max_tentativas is None:
+            max_tentativas = int(os.getenv('PRINT_MAX_TENTATIVAS', '3'))
+
+        self.comando = comando
+        self.max_tentativas = max(1, max_tentativas)
+        self.timeout = int(os.getenv('PRINT_TIMEOUT', '60'))
+
+        self._fila = queue.Queue()
+        self._trabalhos: List[PrintJob] = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._proximo_id = 1
+
+    # ========================================================================
+    # ENFILEIRAMENTO
+    # ========================================================================
+
+    def enviar_os(self, os_id: int, descricao: str = None) -> PrintJob:
+        """
+        Enfileira a impressão de uma OS (o PDF é gerado pela fila)
+
+        Args:
+            os_id: ID da OS
+            descricao: Texto exibido na fila (padrão: "OS ID <id>")
+
+        Returns:
+            Trabalho criado
+        """
+        return self._enfileirar(descricao or f"OS ID {os_id}", os_id=os_id)
+
+    def enviar_pdf(self, conteudo: bytes, descricao: str, os_id: int = None) -> PrintJob:
+        """
+        Enfileira a impressão de um PDF já gerado
+
+        Args:
+            conteudo: Bytes do PDF
+            descricao: Texto exibido na fila
+            os_id: OS de origem (opcional, informativo)
+
+        Returns:
+            Trabalho criado
+        """
+        return self._enfileirar(descricao, os_id=os_id, conteudo=bytes(conteudo))
+
+    def tentar_novamente(self, job_id: int) -> bool:
+        """
+        Recoloca na fila um trabalho que falhou ou foi cancelado
+
+        Args:
+            job_id: ID do trabalho
+
+        Returns:
+            True se o trabalho voltou para a fila
+        """
+        with self._lock:
+            trabalho = self._buscar(job_id)
+            if not trabalho or trabalho.status not in (PrintJob.ERRO, PrintJob.CANCELADO):
+                return False
+            trabalho.status = PrintJob.PENDENTE
+            trabalho.tentativas = 0
+            trabalho.erro = None
+            trabalho.concluido_em = None
+
+        self._iniciar()
+        self._fila.put(trabalho)
+        logger.info(f"Trabalho de impressão {job_id} recolocado na fila")
+        return True
+
+    def cancelar(self, job_id: int) -> bool:
+        """
+        Cancela um trabalho que ainda não começou
+
+        Args:
+            job_id: ID do trabalho
+
+        Returns:
+            True se foi cancelado
+        """
+        with self._lock:
+            trabalho = self._buscar(job_id)
+            if not trabalho or trabalho.status != PrintJob.PENDENTE:
+                return False
+            trabalho.status = PrintJob.CANCELADO
+            trabalho.concluido_em = datetime.now()
+
+        logger.info(f"Trabalho de impressão {job_id} cancelado")
+        return True
+
+    # ========================================================================
+    # CONSULTA
+    # ========================================================================
+
+    def listar_trabalhos(self) -> List[PrintJob]:
+        """
+        Retorna os trabalhos da sessão, do mais antigo para o mais recente
+
+        Returns:
+            Cópia da lista de trabalhos
+        """
+        with self._lock:
+            return list(self._trabalhos)
+
+    def limpar_finalizados(self) -> int:
+        """
+        Remove da lista os trabalhos concluídos e cancelados
+
+        Returns:
+            Quantidade removida
+        """
+        with self._lock:
+            antes = len(self._trabalhos)
+            self._trabalhos = [
+                t for t in self._trabalhos
+                if t.status not in (PrintJob.CONCLUIDO, PrintJob.CANCELADO)
+            ]
+            return antes - len(self._trabalhos)
+
+    def aguardar(self, timeout: float = None) -> bool:
+        """
+        Espera a fila esvaziar (scripts e testes)
+
+        Args:
+            timeout: Tempo máximo em segundos (None: sem limite)
+
+        Returns:
+            True se todos os trabalhos terminaram
+        """
+        inicio = time.monotonic()
+        while True:
+            with self._lock:
+                pendentes = [t for t in self._trabalhos if not t.finalizado]
+            if not pendentes:
+                return True
+            if timeout is not None and time.monotonic() - inicio > timeout:
+                return False
+            time.sleep(0.05)
+
+    # ========================================================================
+    # PROCESSAMENTO
+    # ========================================================================
+
+    def _enfileirar(self, descricao, os_id=None, conteudo=None) -> PrintJob:
+        """Cria o trabalho e coloca na fila"""
+        with self._lock:
+            trabalho = PrintJob(self._proximo_id, descricao, os_id=os_id, conteudo=conteudo)
+            self._proximo_id += 1
+            self._trabalhos.append(trabalho)
+
+        self._iniciar()
+        self._fila.put(trabalho)
+        logger.info(f"Trabalho de impressão {trabalho.id} enfileirado: {descricao}")
+        return trabalho
+
+    def _buscar(self, job_id) -> Optional[PrintJob]:
+        """Busca um trabalho pelo ID (deve ser chamado com o lock)"""
+        for trabalho in self._trabalhos:
+            if trabalho.id == job_id:
+                return trabalho
+        return None
+
+    def _iniciar(self):
+        """Cria a thread de trabalho, se ainda não existir"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._executar,
+                    name='PrintSpool',
+                    daemon=True
+                )
+                self._thread.start()
+
+    def _executar(self):
+        """Laço da thread: processa um trabalho de cada vez, em ordem"""
+        while True:
+            trabalho = self._fila.get()
+            try:
+                self._processar(trabalho)
+            except Exception as e:
+                logger.error(f"Erro inesperado na fila de impressão: {e}")
+            finally:
+                self._fila.task_done()
+
+    def _processar(self, trabalho: PrintJob):
+        """Gera e envia um trabalho, com novas tentativas em caso de falha"""
+        with self._lock:
+            if trabalho.status != PrintJob.PENDENTE:
+                return  # Cancelado enquanto esperava
+            trabalho.status = PrintJob.GERANDO
+
+        while True:
+            trabalho.tentativas += 1
+            try:
+                conteudo = trabalho.conteudo
+                if conteudo is None:
+                    from utils.pdf_generator import pdf_generator
+                    conteudo = pdf_generator.gerar_pdf_os_bytes(trabalho.os_id)
+
+                trabalho.status = PrintJob.ENVIANDO
+                self._enviar_spooler(conteudo)
+
+                trabalho.status = PrintJob.CONCLUIDO
+                trabalho.erro = None
+                trabalho.concluido_em = datetime.now()
+                # O PDF não é mais necessário depois de impresso
+                trabalho.conteudo = None
+                logger.info(f"Trabalho de impressão {trabalho.id} enviado: {trabalho.descricao}")
+                return
+
+            except Exception as e:
+                trabalho.erro = str(e)
+                logger.warning(
+                    f"Falha no trabalho de impressão {trabalho.id} "
+                    f"(tentativa {trabalho.tentativas}/{self.max_tentativas}): {e}"
+                )
+
+                if trabalho.tentativas >= self.max_tentativas:
+                    trabalho.status = PrintJob.ERRO
+                    trabalho.concluido_em = datetime.now()
+                    logger.error(f"Trabalho de impressão {trabalho.id} falhou: {e}")
+                    return
+
+                # Espera um pouco antes de tentar de novo (impressora ocupada, rede)
+                trabalho.status = PrintJob.GERANDO
+                time.sleep(min(2 ** trabalho.tentativas, 10))
+
+    def _enviar_spooler(self, conteudo: bytes):
+        """Entrega o PDF ao comando de impressão configurado"""
+        if not self.comando and platform.system() == "Windows":
+            self._imprimir_windows(conteudo)
+            return
+
+        argumentos = shlex.split(self.comando or 'lpr')
+
+        if any('{arquivo}' in argumento for argumento in argumentos):
+            # Comando que precisa de um caminho em vez da entrada padrão
+            fd, caminho = tempfile.mkstemp(suffix='.pdf')
+            try:
+                with os.fdopen(fd, 'wb') as arquivo:
+                    arquivo.write(conteudo)
+                argumentos = [argumento.replace('{arquivo}', caminho) for argumento in argumentos]
+                self._rodar(argumentos, None)
+            finally:
+                os.remove(caminho)
+        else:
+            self._rodar(argumentos, conteudo)
+
+    def _rodar(self, argumentos, entrada):
+        """Executa o comando de impressão e transforma falhas em exceção"""
+        resultado = subprocess.run(
+            argumentos,
+            input=entrada,
+            capture_output=True,
+            timeout=self.timeout
+        )
+        if resultado.returncode != 0:
+            # Última linha do erro (a mensagem da impressora, sem avisos anteriores)
+            linhas = resultado.stderr.decode(errors='replace').strip().splitlines()
+            mensagem = linhas[-1] if linhas else ''
+            raise RuntimeError(
+                f"{argumentos[0]} terminou com código {resultado.returncode}"
+                + (f": {mensagem}" if mensagem else "")
+            )
+
+    @staticmethod
+    def _imprimir_windows(conteudo: bytes):
+        """Windows: imprime com o leitor de PDF padrão (precisa de um arquivo)"""
+        fd, caminho = tempfile.mkstemp(suffix='.pdf', prefix='gf_impressao_')
+        with os.fdopen(fd, 'wb') as arquivo:
+            arquivo.write(conteudo)
+        # O leitor abre o arquivo de forma assíncrona: o temporário fica para
+        # a limpeza da pasta temporária do sistema
+        os.startfile(caminho, "print")
+
+
+# Instância global
+print_spool = PrintSpool()
+
@@ -0,0 +1,185 @@
+"""
+Captura de perfil (cProfile + tracemalloc) sob demanda
+Perfila as próximas N ações da interface de uma estação em uso e grava em
+logs/:
+    perfil_AAAAMMDD_HHMMSS.prof       (abrir com snakeviz ou pstats)
+    perfil_AAAAMMDD_HHMMSS.snapshot   (tracemalloc.Snapshot.load)
+    perfil_AAAAMMDD_HHMMSS.txt        (resumo: funções e alocações no topo)
+
+Ative com Ctrl+Shift+P na janela principal ou com PROFILE_ACTIONS=N no .env.
+"""
+
+import io
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilerAcoes:
+    """
+    Perfila as próximas ações da interface (decorator acao_ui)
+
+    O cProfile mede apenas a thread principal (a das ações); o tracemalloc
+    registra as alocações de todas as threads durante a captura.
+    """
+
+    # Linhas de cada ranking no resumo
+    TOP = 25
+
+    def __init__(self):
+        """Inicializa o profiler (desligado)"""
+        self.ativo = False
+        self.pasta = Path(os.getenv('PROFILE_DIR', 'logs'))
+        self._restantes = 0
+        self._profile = None
+        self._snapshot_inicial = None
+        self._iniciado_em = None
+        self._acoes = []
+        self._profundidade = 0
+        self._parar_tracemalloc = False
+        self._lock = threading.Lock()
+
+    def ativar(self, acoes: int = 10) -> bool:
+        """
+        Inicia a captura das próximas ações
+
+        Args:
+            acoes: Quantidade de ações da interface a perfilar
+
+        Returns:
+            True se a captura começou (False se já havia uma em andamento)
+        """
+        import cProfile
+        import tracemalloc
+
+        with self._lock:
+            if self.ativo:
+                return False
+
+            self._restantes = max(1, acoes)
+            self._profile = cProfile.Profile()
+            self._acoes = []
+            self._profundidade = 0
+            self._iniciado_em = time.perf_counter()
+
+            # 10 frames por alocação: o suficiente para chegar ao código do sistema
+            self._parar_tracemalloc = not tracemalloc.is_tracing()
+            if self._parar_tracemalloc:
+                tracemalloc.start(10)
+            tracemalloc.reset_peak()
+            self._snapshot_inicial = tracemalloc.take_snapshot()
+            self.ativo = True
+
+        logger.info(f"Perfil ativado para as próximas {self._restantes} ações")
+        return True
+
+    def executar(self, nome: str, funcao, *args, **kwargs):
+        """
+        Executa uma ação da interface sob o profiler
+
+        Args:
+            nome: Nome da ação
+            funcao: Handler a executar
+        """
+        if not self.ativo or threading.current_thread() is not threading.main_thread():
+            return funcao(*args, **kwargs)
+
+        # Ação aninhada (ex.: diálogo aberto por outra ação) conta como parte da externa
+        self._profundidade += 1
+        if self._profundidade == 1:
+            self._acoes.append(nome)
+            self._profile.enable()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            self._profundidade -= 1
+            if self._profundidade == 0:
+                self._profile.disable()
+                self._restantes -= 1
+                if self._restantes <= 0:
+                    # Falha ao gravar o perfil não pode mascarar o resultado da ação
+                    try:
+                        self.finalizar()
+                    except Exception as e:
+                        logger.error(f"Perfil de '{nome}' não gravado: {e}")
+
+    def finalizar(self) -> Optional[Path]:
+        """
+        Encerra a captura e grava os arquivos
+
+        Returns:
+            Caminho do resumo (.txt) ou None se não havia captura
+        """
+        import pstats
+        import tracemalloc
+
+        with self._lock:
+            if not self.ativo:
+                return None
+            self.ativo = False
+            profile = self._profile
+            snapshot_inicial = self._snapshot_inicial
+            acoes = self._acoes
+            self._profile = None
+            self._snapshot_inicial = None
+
+        profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, pico = tracemalloc.get_traced_memory()
+        if self._parar_tracemalloc:
+            tracemalloc.stop()
+        duracao = time.perf_counter() - self._iniciado_em
+
+        self.pasta.mkdir(exist_ok=True)
+        base = self.pasta / f"perfil_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        arquivo_prof = base.with_suffix('.prof')
+        arquivo_snapshot = base.with_suffix('.snapshot')
+        arquivo_resumo = base.with_suffix('.txt')
+
+        try:
+            profile.dump_stats(str(arquivo_prof))
+            snapshot.dump(str(arquivo_snapshot))
+
+            saida = io.StringIO()
+            saida.write(f"Perfil de {len(acoes)} ações em {duracao:.1f} s\n")
+            saida.write(f"Ações: {', '.join(acoes) or '-'}\n")
+
+            estatisticas = pstats.Stats(profile, stream=saida)
+            estatisticas.strip_dirs()
+            for ordem, titulo in (('cumulative', 'tempo acumulado'), ('tottime', 'tempo próprio')):
+                saida.write(f"\n{'=' * 60}\nFunções com maior {titulo}\n{'=' * 60}\n")
+                estatisticas.sort_stats(ordem).print_stats(self.TOP)
+
+            saida.write(f"\n{'=' * 60}\nAlocações que mais cresceram durante a captura\n{'=' * 60}\n")
+            filtros = [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+            ]
+            diferencas = snapshot.filter_traces(filtros).compare_to(
+                snapshot_inicial.filter_traces(filtros), 'lineno'
+            )
+            for diferenca in diferencas[:self.TOP]:
+                saida.write(f"{diferenca}\n")
+
+            total = sum(estatistica.size for estatistica in snapshot.statistics('filename'))
+            saida.write(f"\nMemória rastreada ao final: {total / 1024 / 1024:.1f} MB")
+            saida.write(f" (pico durante a captura: {pico / 1024 / 1024:.1f} MB)\n")
+
+            arquivo_resumo.write_text(saida.getvalue(), encoding='utf-8')
+            logger.info(f"Perfil gravado: {arquivo_resumo} (+ .prof e .snapshot)")
+            return arquivo_resumo
+
+        except Exception as e:
+            logger.error(f"Erro ao gravar perfil: {e}")
+            raise
+
+
+# Instância global
+profiler = ProfilerAcoes()
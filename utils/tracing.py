@@ -0,0 +1,212 @@
+"""
+Rastreamento (tracing) de ações da interface até o SQL
+Spans com relação pai/filho: ação da interface -> método de serviço ->
+conexão/consulta no banco. Exporta no formato Trace Event do Chrome, que
+abre offline em chrome://tracing, no Perfetto (ui.perfetto.dev) ou no
+speedscope.
+
+Desligado por padrão: ative com TRACE=true no .env. Os spans ficam em
+memória (últimos TRACE_MAX_SPANS) e são exportados para
+logs/trace_AAAAMMDD_HHMMSS.json ao fechar o sistema.
+"""
+
+import atexit
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# Span aberto no contexto atual (pai dos próximos spans)
+_span_atual: contextvars.ContextVar[Optional['Span']] = contextvars.ContextVar('span_atual', default=None)
+
+
+class Span:
+    """
+    Trecho medido de uma operação
+
+    Atributos:
+        nome: Nome da operação (ex.: OSWindow._gerar_os)
+        categoria: 'ui', 'servico' ou 'db'
+        span_id / pai_id / trace_id: Identificação e hierarquia
+        inicio_ns / fim_ns: Instantes em time.perf_counter_ns()
+        atributos: Dados extras (sql, linhas, erro...)
+    """
+
+    __slots__ = (
+        'nome', 'categoria', 'span_id', 'pai_id', 'trace_id',
+        'inicio_ns', 'fim_ns', 'thread_id', 'thread_nome', 'atributos'
+    )
+
+    def __init__(self, nome, categoria, span_id, pai: Optional['Span'], atributos):
+        self.nome = nome
+        self.categoria = categoria
+        self.span_id = span_id
+        self.pai_id = pai.span_id if pai else None
+        self.trace_id = pai.trace_id if pai else span_id
+        self.inicio_ns = time.perf_counter_ns()
+        self.fim_ns = None
+        thread = threading.current_thread()
+        self.thread_id = thread.ident
+        self.thread_nome = thread.name
+        self.atributos = atributos
+
+    @property
+    def duracao_ms(self) -> float:
+        """Duração em milissegundos (até agora, se ainda aberto)"""
+        fim = self.fim_ns if self.fim_ns is not None else time.perf_counter_ns()
+        return (fim - self.inicio_ns) / 1_000_000
+
+
+class Tracer:
+    """
+    Coletor de spans
+
+    Uso:
+        with tracer.span('OSService.criar_os', 'servico') as span:
+            ...
+            span.atributos['linhas'] = 1
+    """
+
+    def __init__(self):
+        """Inicializa o coletor (lê TRACE e TRACE_MAX_SPANS)"""
+        self.ativo = os.getenv('TRACE', 'false').lower() in ('1', 'true', 'sim')
+        self.pasta = Path(os.getenv('TRACE_DIR', 'logs'))
+        self._spans = deque(maxlen=int(os.getenv('TRACE_MAX_SPANS', '50000')))
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._exportar_ao_sair = False
+
+    @contextmanager
+    def span(self, nome: str, categoria: str = 'servico', **atributos):
+        """
+        Abre um span filho do span atual durante o bloco
+
+        Args:
+            nome: Nome da operação
+            categoria: 'ui', 'servico' ou 'db'
+            **atributos: Dados extras do span
+
+        Yields:
+            Span (None se o rastreamento estiver desligado)
+        """
+        if not self.ativo:
+            yield None
+            return
+
+        span = Span(nome, categoria, next(self._ids), _span_atual.get(), atributos)
+        token = _span_atual.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.atributos['erro'] = type(e).__name__
+            raise
+        finally:
+            _span_atual.reset(token)
+            self._finalizar(span)
+
+    def registrar(self, nome: str, categoria: str, inicio_ns: int, fim_ns: int, **atributos):
+        """
+        Registra um span já concluído, filho do span atual
+        (para trechos que não cabem em um bloco with, como geradores)
+
+        Args:
+            nome: Nome da operação
+            categoria: 'ui', 'servico' ou 'db'
+            inicio_ns: Início em time.perf_counter_ns()
+            fim_ns: Fim em time.perf_counter_ns()
+            **atributos: Dados extras do span
+        """
+        if not self.ativo:
+            return
+
+        span = Span(nome, categoria, next(self._ids), _span_atual.get(), atributos)
+        span.inicio_ns = inicio_ns
+        span.fim_ns = fim_ns
+        self._finalizar(span)
+
+    def span_atual(self) -> Optional[Span]:
+        """Retorna o span aberto no contexto atual"""
+        return _span_atual.get()
+
+    def exportar(self, caminho=None) -> Optional[Path]:
+        """
+        Grava os spans coletados no formato Trace Event (JSON)
+
+        Args:
+            caminho: Arquivo de destino (padrão: logs/trace_AAAAMMDD_HHMMSS.json)
+
+        Returns:
+            Caminho do arquivo gravado ou None se não houver spans
+        """
+        with self._lock:
+            spans = list(self._spans)
+
+        if not spans:
+            return None
+
+        if caminho is None:
+            self.pasta.mkdir(exist_ok=True)
+            caminho = self.pasta / f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+
+        pid = os.getpid()
+        eventos = []
+        threads = {}
+        for span in spans:
+            threads[span.thread_id] = span.thread_nome
+            args = {'span_id': span.span_id, 'trace_id': span.trace_id}
+            if span.pai_id is not None:
+                args['pai_id'] = span.pai_id
+            args.update(span.atributos)
+
+            # Evento completo ("X"): início e duração em microssegundos
+            eventos.append({
+                'name': span.nome,
+                'cat': span.categoria,
+                'ph': 'X',
+                'ts': span.inicio_ns / 1000,
+                'dur': (span.fim_ns - span.inicio_ns) / 1000,
+                'pid': pid,
+                'tid': span.thread_id,
+                'args': args,
+            })
+
+        for thread_id, thread_nome in threads.items():
+            eventos.append({
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': pid,
+                'tid': thread_id,
+                'args': {'name': thread_nome},
+            })
+
+        caminho = Path(caminho)
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False, default=str)
+        return caminho
+
+    def limpar(self):
+        """Descarta os spans coletados"""
+        with self._lock:
+            self._spans.clear()
+
+    def _finalizar(self, span: Span):
+        """Guarda o span concluído"""
+        if span.fim_ns is None:
+            span.fim_ns = time.perf_counter_ns()
+
+        with self._lock:
+            self._spans.append(span)
+            if not self._exportar_ao_sair:
+                self._exportar_ao_sair = True
+                atexit.register(self.exportar)
+
+
+# Instância global
+tracer = Tracer()
@@ -0,0 +1,204 @@
+"""
+Detector de travamentos da interface (Tk)
+Agenda um tick com after() a cada intervalo e mede o atraso: se o loop de
+eventos fica ocupado além do limite, uma thread de monitoramento captura a
+pilha da thread principal e registra qual handler causou o travamento
+(ex.: ClienteWindow._carregar_clientes).
+
+Limite em STALL_THRESHOLD_MS (padrão: 500 ms; 0 desliga).
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+RAIZ_PROJETO = Path(__file__).resolve().parent.parent
+
+# Decorators que envolvem os handlers (o handler é o frame chamado por eles)
+MODULOS_INTERMEDIARIOS = ('utils/event_log.py', 'utils/tracing.py')
+
+
+class TkStallDetector:
+    """
+    Watchdog do loop de eventos do Tk
+
+    Uso:
+        detector = TkStallDetector(root)
+        detector.iniciar()
+    """
+
+    def __init__(self, root, limite_ms: Optional[float] = None, intervalo_ms: int = 100):
+        """
+        Inicializa o detector
+
+        Args:
+            root: Janela root do tkinter
+            limite_ms: Tempo sem ticks considerado travamento (padrão: STALL_THRESHOLD_MS)
+            intervalo_ms: Intervalo entre os ticks
+        """
+        if limite_ms is None:
+            limite_ms = float(os.getenv('STALL_THRESHOLD_MS', '500'))
+
+        self.root = root
+        self.limite = limite_ms / 1000
+        self.intervalo_ms = intervalo_ms
+        self.travamentos = 0
+
+        self._ultimo_tick = time.monotonic()
+        self._pilha = None  # Pilha capturada durante o travamento atual
+        self._thread_principal = threading.main_thread().ident
+        self._parar = threading.Event()
+        self._monitor = None
+        self._after_id = None
+
+    def iniciar(self) -> bool:
+        """
+        Inicia os ticks e a thread de monitoramento
+
+        Returns:
+            True se o detector foi iniciado (False se desligado pelo limite 0)
+        """
+        if self.limite <= 0 or self._monitor is not None:
+            return False
+
+        self._ultimo_tick = time.monotonic()
+        self._after_id = self.root.after(self.intervalo_ms, self._tick)
+        self._monitor = threading.Thread(target=self._monitorar, name='TkWatchdog', daemon=True)
+        self._monitor.start()
+        logger.debug(f"Detector de travamentos iniciado (limite: {self.limite * 1000:.0f} ms)")
+        return True
+
+    def parar(self):
+        """Para o detector"""
+        self._parar.set()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass  # Janela já destruída
+            self._after_id = None
+
+    def _tick(self):
+        """Executado pelo loop do Tk: mede o atraso desde o tick anterior"""
+        agora = time.monotonic()
+        atraso = agora - self._ultimo_tick - self.intervalo_ms / 1000
+        pilha = self._pilha
+        self._pilha = None
+        self._ultimo_tick = agora
+
+        if atraso > self.limite:
+            self._registrar(atraso, pilha)
+
+        if not self._parar.is_set():
+            self._after_id = self.root.after(self.intervalo_ms, self._tick)
+
+    def _monitorar(self):
+        """Thread que captura a pilha da thread principal quando ela trava"""
+        espera = min(self.intervalo_ms / 1000, self.limite / 2)
+        while not self._parar.wait(espera):
+            parado = time.monotonic() - self._ultimo_tick - self.intervalo_ms / 1000
+            if parado > self.limite and self._pilha is None:
+                frame = sys._current_frames().get(self._thread_principal)
+                if frame is not None:
+                    self._pilha = self._capturar_pilha(frame)
+
+    def _registrar(self, atraso: float, pilha):
+        """Registra o travamento no log (e no log de eventos, se ativo)"""
+        self.travamentos += 1
+        atraso_ms = atraso * 1000
+
+        handler = self.identificar_handler(pilha) if pilha else None
+        if pilha:
+            logger.warning(
+                f"Interface travada por {atraso_ms:.0f} ms em {handler or 'código fora do sistema'}\n"
+                f"Pilha da thread principal:\n{''.join(traceback.format_list(pilha))}"
+            )
+        else:
+            # Travamento curto (entre duas verificações do monitor)
+            logger.warning(f"Interface travada por {atraso_ms:.0f} ms (pilha não capturada)")
+
+        from utils.event_log import event_log
+        event_log.registrar('TkStallDetector.travamento', atraso_ms, 'ui', handler=handler)
+
+    @staticmethod
+    def _capturar_pilha(frame):
+        """
+        Pilha de um frame, do mais externo ao mais interno
+
+        Returns:
+            Lista de traceback.FrameSummary com o nome qualificado
+            (Classe.metodo) em .name
+        """
+        quadros = []
+        while frame is not None:
+            codigo = frame.f_code
+            quadros.append(traceback.FrameSummary(
+                codigo.co_filename, frame.f_lineno, TkStallDetector._nome_qualificado(frame), lookup_line=True
+            ))
+            frame = frame.f_back
+        quadros.reverse()
+        return quadros
+
+    @staticmethod
+    def _nome_qualificado(frame) -> str:
+        """
+        Nome qualificado da função do frame (Classe.metodo)
+
+        co_qualname só existe a partir do Python 3.11; antes, a classe vem do
+        self (ou cls) do frame.
+        """
+        codigo = frame.f_code
+        nome = getattr(codigo, 'co_qualname', None)
+        if nome:
+            return nome
+
+        if codigo.co_argcount and codigo.co_varnames[0] in ('self', 'cls'):
+            instancia = frame.f_locals.get(codigo.co_varnames[0])
+            if instancia is not None:
+                classe = instancia if isinstance(instancia, type) else type(instancia)
+                return f"{classe.__name__}.{codigo.co_name}"
+        return codigo.co_name
+
+    @staticmethod
+    def identificar_handler(pilha) -> Optional[str]:
+        """
+        Encontra o handler do sistema responsável pela pilha
+
+        O handler é o primeiro frame do projeto chamado pelo tkinter (um
+        callback de botão, after ou bind); sem ele, o frame do projeto mais
+        interno.
+
+        Args:
+            pilha: Lista de FrameSummary (do mais externo ao mais interno)
+
+        Returns:
+            "Classe.metodo (arquivo:linha)" ou None
+        """
+        chamado_pelo_tk = False
+        mais_interno = None
+        for frame in pilha:
+            caminho = Path(frame.filename).resolve()
+            if 'tkinter' in caminho.parts:
+                chamado_pelo_tk = True
+                continue
+
+            if RAIZ_PROJETO not in caminho.parents:
+                continue
+
+            relativo = caminho.relative_to(RAIZ_PROJETO).as_posix()
+            if relativo in MODULOS_INTERMEDIARIOS:
+                continue
+
+            descricao = f"{frame.name} ({relativo}:{frame.lineno})"
+            if chamado_pelo_tk:
+                return descricao
+            mais_interno = descricao
+
+        return mais_interno